@@ -1,22 +1,34 @@
 import os
 import sys
+import atexit
+import queue
+import threading
+import itertools
+import bisect
+import unicodedata
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache, wraps
 from pathlib import Path
 import sqlite3
 from tkinter import *
 from tkinter import ttk, filedialog, messagebox
-from datetime import datetime, date
-from docx import Document
-import matplotlib.pyplot as plt
-from PIL import Image, ImageTk
+from datetime import datetime, date, timedelta
 import calendar
-from tkcalendar import DateEntry
+import math
+import time
 import webbrowser
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import docx
-from docx.shared import Pt, RGBColor
-from docx.enum.style import WD_STYLE_TYPE
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import zlib
+import hashlib
+import json
+import tempfile
+from xml.sax.saxutils import escape
+# docx, matplotlib, PIL e tkcalendar são importados nas funções que os usam,
+# para que a janela principal abra sem esperar por eles
 # =============================================
 # CONFIGURAÇÕES INICIAIS
 # =============================================
@@ -30,6 +42,9 @@ COR_CARD = "#ffffff"
 COR_ALERTA = "#e74c3c"
 COR_SUCESSO = "#2ecc71"
 
+# Valor fixo cobrado por imóvel atendido no período, em centavos
+VALOR_GESTAO_POR_IMOVEL = 5000
+
 # Configurar diretórios
 def get_app_data_dir():
     """Retorna o diretório correto para cada sistema operacional"""
@@ -58,13 +73,124 @@ except Exception as e:
     print(f"Erro ao criar pastas: {e}")
 
 # =============================================
-# BANCO DE DADOS - ESTRUTURA SIMPLIFICADA
+# BANCO DE DADOS - CONEXÃO COMPARTILHADA
 # =============================================
 
-def inicializar_banco_dados():
-    conn = sqlite3.connect("sistema.db")
-    cursor = conn.cursor()
-    
+ARQUIVO_BANCO = "sistema.db"
+
+# Pragmas aplicados a toda conexão aberta pelo sistema
+PRAGMAS_CONEXAO = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-65536",    # 64 MB
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_conexoes_thread = threading.local()
+_conexoes_abertas = []
+_trava_conexoes = threading.Lock()
+
+# Incrementado a cada transacao() concluída com sucesso neste processo
+_versao_escritas = 0
+
+
+def obter_conexao():
+    """Retorna a conexão da thread atual, abrindo-a e configurando na primeira chamada"""
+    conn = getattr(_conexoes_thread, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(ARQUIVO_BANCO, timeout=5.0, check_same_thread=False)
+        for pragma in PRAGMAS_CONEXAO:
+            conn.execute(pragma)
+        _conexoes_thread.conn = conn
+        with _trava_conexoes:
+            _conexoes_abertas.append(conn)
+    return conn
+
+
+@contextmanager
+def transacao():
+    """Executa um bloco de escrita na conexão compartilhada com commit ou rollback"""
+    global _versao_escritas
+    conn = obter_conexao()
+    try:
+        yield conn.cursor()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    with _trava_conexoes:
+        _versao_escritas += 1
+
+
+@contextmanager
+def leitura():
+    """Bloco de consultas que enxergam um mesmo retrato do banco (uma transação só de leitura).
+
+    Dentro de uma transação já aberta na conexão da thread, apenas a reaproveita.
+    """
+    conn = obter_conexao()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.commit()
+
+
+def em_leitura(funcao):
+    """Decorador que executa a função inteira dentro de leitura(), num único retrato do banco"""
+    @wraps(funcao)
+    def executar(*args, **kwargs):
+        with leitura():
+            return funcao(*args, **kwargs)
+    return executar
+
+
+def versao_do_banco():
+    """Identifica o estado atual dos dados, sem consultar tabelas.
+
+    Combina o contador de escritas deste processo com o PRAGMA data_version da
+    conexão da thread atual, que muda quando outra conexão ou processo grava no banco.
+    """
+    data_version = obter_conexao().execute("PRAGMA data_version").fetchone()[0]
+    return (_versao_escritas, data_version)
+
+
+def fechar_conexoes():
+    """Fecha todas as conexões abertas pelo processo"""
+    with _trava_conexoes:
+        while _conexoes_abertas:
+            conn = _conexoes_abertas.pop()
+            try:
+                conn.execute("PRAGMA optimize")
+                conn.close()
+            except sqlite3.Error:
+                pass
+    _conexoes_thread.__dict__.pop("conn", None)
+
+
+atexit.register(fechar_conexoes)
+
+# =============================================
+# BANCO DE DADOS - ESTRUTURA E MIGRAÇÕES
+# =============================================
+
+# Colunas de data gravadas como texto ISO (AAAA-MM-DD)
+COLUNAS_DATA = (
+    ("limpezas", "data"),
+    ("consumo_enxoval", "data"),
+    ("reposicao_suprimentos", "data"),
+    ("fechamentos", "data_inicio"),
+    ("fechamentos", "data_fim"),
+)
+
+
+def _migracao_esquema_inicial(cursor):
+    """Cria as tabelas base e completa colunas ausentes em bancos antigos"""
     # Tabela de clientes (proprietários)
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS clientes (
@@ -170,6 +296,10 @@ def inicializar_banco_dados():
     );  
     """)
 
+    # Colunas adicionadas depois da primeira versão do sistema
+    _adicionar_coluna_se_ausente(cursor, "imoveis", "plataforma", "TEXT")
+    _adicionar_coluna_se_ausente(cursor, "tipos_enxoval", "unidade_medida", "TEXT DEFAULT 'unidade'")
+
     # Inserir dados básicos se as tabelas estiverem vazias
     cursor.execute("SELECT COUNT(*) FROM tipos_enxoval")
     if cursor.fetchone()[0] == 0:
@@ -200,10 +330,833 @@ def inicializar_banco_dados():
             ('Amaciante', 10.0, 'litro')
         ]
         cursor.executemany("INSERT INTO suprimentos (nome, preco_unitario, unidade_medida) VALUES (?, ?, ?)", suprimentos)
+
+
+def _migracao_datas_e_indices(cursor):
+    """Normaliza as datas gravadas e cria os índices por imóvel e data"""
+    # Normalizar datas para texto ISO (AAAA-MM-DD), permitindo comparações diretas por faixa
+    for tabela, coluna in COLUNAS_DATA:
+        cursor.execute(f"""
+            UPDATE {tabela}
+            SET {coluna} = substr({coluna}, 7, 4) || '-' || substr({coluna}, 4, 2) || '-' || substr({coluna}, 1, 2)
+            WHERE {coluna} LIKE '__/__/____'
+        """)
+        cursor.execute(f"""
+            UPDATE {tabela}
+            SET {coluna} = date({coluna})
+            WHERE date({coluna}) IS NOT NULL AND {coluna} <> date({coluna})
+        """)
+
+    # Índices compostos (imóvel, data) que cobrem as consultas de totais e fechamentos
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_limpezas_imovel_data ON limpezas (imovel_id, data, valor_total)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_limpezas_data ON limpezas (data)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_consumo_enxoval_imovel_data ON consumo_enxoval (imovel_id, data, item_id, quantidade)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_consumo_enxoval_data ON consumo_enxoval (data)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reposicao_suprimentos_imovel_data ON reposicao_suprimentos (imovel_id, data, valor_gasto)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reposicao_suprimentos_data ON reposicao_suprimentos (data)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fechamentos_referencia ON fechamentos (tipo, referencia_id, data_inicio, data_fim)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_imoveis_cliente ON imoveis (cliente_id)")
+
+
+# Como cada lançamento contribui para daily_totals:
+# (tabela, categoria, item, quantidade, valor), com {r} sendo NEW, OLD ou a própria linha
+ORIGENS_TOTAIS_DIARIOS = (
+    ("limpezas", "limpeza", "0",
+     "COALESCE({r}.horas_trabalhadas, 0)", "COALESCE({r}.valor_total_centavos, 0)"),
+    ("consumo_enxoval", "enxoval", "{r}.item_id",
+     "{r}.quantidade",
+     "{r}.quantidade * COALESCE((SELECT preco_unitario_centavos FROM tipos_enxoval WHERE id = {r}.item_id), 0)"),
+    ("reposicao_suprimentos", "suprimento", "COALESCE({r}.suprimento_id, 0)",
+     "COALESCE({r}.quantidade, 0)", "COALESCE({r}.valor_gasto_centavos, 0)"),
+)
+
+# Mesma tabela com os valores ainda em reais (REAL), usada só pela migração 3
+ORIGENS_TOTAIS_DIARIOS_EM_REAIS = (
+    ("limpezas", "limpeza", "0",
+     "COALESCE({r}.horas_trabalhadas, 0)", "COALESCE({r}.valor_total, 0)"),
+    ("consumo_enxoval", "enxoval", "{r}.item_id",
+     "{r}.quantidade", "{r}.quantidade * COALESCE((SELECT preco_unitario FROM tipos_enxoval WHERE id = {r}.item_id), 0)"),
+    ("reposicao_suprimentos", "suprimento", "COALESCE({r}.suprimento_id, 0)",
+     "COALESCE({r}.quantidade, 0)", "COALESCE({r}.valor_gasto, 0)"),
+)
+
+
+def _migracao_totais_diarios(cursor):
+    """Cria a tabela daily_totals, os gatilhos que a mantêm e carrega o histórico"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_totals (
+        categoria TEXT NOT NULL,  -- 'limpeza', 'enxoval' ou 'suprimento'
+        dia DATE NOT NULL,
+        imovel_id INTEGER NOT NULL,
+        item_id INTEGER NOT NULL DEFAULT 0,  -- item de enxoval/suprimento (0 para limpezas)
+        registros INTEGER NOT NULL DEFAULT 0,
+        quantidade REAL NOT NULL DEFAULT 0,
+        valor REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (categoria, dia, imovel_id, item_id)
+    ) WITHOUT ROWID
+    """)
+
+    _criar_gatilhos_totais_diarios(cursor, ORIGENS_TOTAIS_DIARIOS_EM_REAIS, "valor", "preco_unitario")
+    _carregar_totais_diarios(cursor, ORIGENS_TOTAIS_DIARIOS_EM_REAIS, "valor")
+
+
+def _criar_gatilhos_totais_diarios(cursor, origens, coluna_valor, coluna_preco):
+    """Cria os gatilhos que somam e retiram cada lançamento de daily_totals"""
+    for tabela, categoria, item, quantidade, valor in origens:
+        somar = _sql_somar_total_diario(categoria, item, quantidade, valor, "NEW", coluna_valor)
+        subtrair = _sql_subtrair_total_diario(categoria, item, quantidade, valor, "OLD", coluna_valor)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tabela}_totais_ins AFTER INSERT ON {tabela}
+        BEGIN
+            {somar}
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tabela}_totais_del AFTER DELETE ON {tabela}
+        BEGIN
+            {subtrair}
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tabela}_totais_upd AFTER UPDATE ON {tabela}
+        BEGIN
+            {subtrair}
+            {somar}
+        END
+        """)
+
+    # O valor do enxoval acompanha o preço atual do item, como nas consultas originais
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tipos_enxoval_preco_totais AFTER UPDATE OF {coluna_preco} ON tipos_enxoval
+    BEGIN
+        UPDATE daily_totals
+        SET {coluna_valor} = quantidade * COALESCE(NEW.{coluna_preco}, 0)
+        WHERE categoria = 'enxoval' AND item_id = NEW.id;
+    END
+    """)
+
+
+def _carregar_totais_diarios(cursor, origens, coluna_valor):
+    """Preenche daily_totals com o histórico de lançamentos já gravados"""
+    for tabela, categoria, item, quantidade, valor in origens:
+        cursor.execute(f"""
+            INSERT INTO daily_totals (categoria, dia, imovel_id, item_id, registros, quantidade, {coluna_valor})
+            SELECT '{categoria}', r.data, COALESCE(r.imovel_id, 0), {item.format(r="r")},
+                   COUNT(*), SUM({quantidade.format(r="r")}), SUM({valor.format(r="r")})
+            FROM {tabela} r
+            GROUP BY 2, 3, 4
+        """)
+
+
+def _sql_somar_total_diario(categoria, item, quantidade, valor, r, coluna_valor):
+    """Monta o comando que soma um lançamento ao total diário"""
+    return f"""INSERT INTO daily_totals (categoria, dia, imovel_id, item_id, registros, quantidade, {coluna_valor})
+            VALUES ('{categoria}', {r}.data, COALESCE({r}.imovel_id, 0), {item.format(r=r)}, 1,
+                    {quantidade.format(r=r)}, {valor.format(r=r)})
+            ON CONFLICT (categoria, dia, imovel_id, item_id) DO UPDATE SET
+                registros = registros + excluded.registros,
+                quantidade = quantidade + excluded.quantidade,
+                {coluna_valor} = {coluna_valor} + excluded.{coluna_valor};"""
+
+
+def _sql_subtrair_total_diario(categoria, item, quantidade, valor, r, coluna_valor):
+    """Monta os comandos que retiram um lançamento do total diário"""
+    chave = (f"categoria = '{categoria}' AND dia = {r}.data "
+             f"AND imovel_id = COALESCE({r}.imovel_id, 0) AND item_id = {item.format(r=r)}")
+    return f"""UPDATE daily_totals
+            SET registros = registros - 1,
+                quantidade = quantidade - {quantidade.format(r=r)},
+                {coluna_valor} = {coluna_valor} - {valor.format(r=r)}
+            WHERE {chave};
+            DELETE FROM daily_totals WHERE {chave} AND registros <= 0;"""
+
+
+def _migracao_indice_faturamento(cursor):
+    """Índice de daily_totals por imóvel e dia, usado no cálculo de faturamento"""
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_daily_totals_imovel_dia
+    ON daily_totals (imovel_id, dia, categoria, valor)
+    """)
+
+
+# Tabelas lidas pelos relatórios; cada escrita nelas incrementa o contador em versoes_tabelas
+TABELAS_VERSIONADAS = ("clientes", "imoveis", "limpezas", "tipos_enxoval", "consumo_enxoval",
+                       "suprimentos", "reposicao_suprimentos")
+
+
+def _migracao_versoes_tabelas(cursor):
+    """Cria os contadores de modificação por tabela, mantidos por gatilhos"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS versoes_tabelas (
+        tabela TEXT PRIMARY KEY,
+        versao INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """)
+
+    for tabela in TABELAS_VERSIONADAS:
+        cursor.execute("INSERT OR IGNORE INTO versoes_tabelas (tabela) VALUES (?)", (tabela,))
+        for evento in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{tabela}_versao_{evento.lower()} AFTER {evento} ON {tabela}
+            BEGIN
+                UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = '{tabela}';
+            END
+            """)
+
+
+# Registros cobertos pela busca global:
+# (código, tabela, colunas vigiadas, título, detalhe, condição para indexar)
+# Na tabela busca_textual o rowid é id * 4 + código, para achar a entrada de cada registro pela chave.
+ORIGENS_BUSCA = (
+    (1, "clientes", "nome, telefone, email",
+     "{r}.nome", "COALESCE({r}.email, '') || ' ' || COALESCE({r}.telefone, '')", "1"),
+    (2, "imoveis", "endereco", "{r}.endereco", "''", "1"),
+    (3, "limpezas", "observacoes", "''", "{r}.observacoes", "COALESCE({r}.observacoes, '') != ''"),
+)
+
+
+def _migracao_busca_textual(cursor):
+    """Cria o índice FTS5 da busca global, os gatilhos que o mantêm e indexa os dados existentes"""
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS busca_textual USING fts5(
+        titulo, detalhe,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """)
+
+    for codigo, tabela, colunas, titulo, detalhe, condicao in ORIGENS_BUSCA:
+        inserir = _sql_inserir_busca(codigo, titulo, detalhe, condicao, "NEW")
+        remover = f"DELETE FROM busca_textual WHERE rowid = OLD.id * 4 + {codigo};"
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tabela}_busca_ins AFTER INSERT ON {tabela}
+        BEGIN
+            {inserir}
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tabela}_busca_del AFTER DELETE ON {tabela}
+        BEGIN
+            {remover}
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tabela}_busca_upd AFTER UPDATE OF {colunas} ON {tabela}
+        BEGIN
+            {remover}
+            {inserir}
+        END
+        """)
+
+        # Registros já existentes
+        cursor.execute(f"""
+            INSERT INTO busca_textual (rowid, titulo, detalhe)
+            SELECT r.id * 4 + {codigo}, {titulo.format(r="r")}, {detalhe.format(r="r")}
+            FROM {tabela} r
+            WHERE {condicao.format(r="r")}
+        """)
+
+
+def _sql_inserir_busca(codigo, titulo, detalhe, condicao, r):
+    """Monta o comando que indexa um registro na busca global"""
+    return f"""INSERT INTO busca_textual (rowid, titulo, detalhe)
+            SELECT {r}.id * 4 + {codigo}, {titulo.format(r=r)}, {detalhe.format(r=r)}
+            WHERE {condicao.format(r=r)};"""
+
+
+# Valores monetários em REAL (reais) convertidos para INTEGER (centavos):
+# (tabela, coluna em reais, coluna em centavos, definição da nova coluna)
+COLUNAS_MONETARIAS = (
+    ("limpezas", "valor_hora", "valor_hora_centavos", "INTEGER DEFAULT 3000"),
+    ("limpezas", "valor_total", "valor_total_centavos", "INTEGER"),
+    ("tipos_enxoval", "preco_unitario", "preco_unitario_centavos", "INTEGER DEFAULT 0"),
+    ("suprimentos", "preco_unitario", "preco_unitario_centavos", "INTEGER DEFAULT 0"),
+    ("reposicao_suprimentos", "valor_gasto", "valor_gasto_centavos", "INTEGER"),
+    ("fechamentos", "valor_total", "valor_total_centavos", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+def _migracao_valores_em_centavos(cursor):
+    """Converte os valores monetários para centavos inteiros e refaz daily_totals sobre eles.
+
+    Gatilhos e índices que citam as colunas antigas são removidos antes de tirá-las
+    das tabelas e recriados sobre as novas colunas.
+    """
+    for tabela, _, _, _, _ in ORIGENS_TOTAIS_DIARIOS:
+        for evento in ("ins", "del", "upd"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{tabela}_totais_{evento}")
+    cursor.execute("DROP TRIGGER IF EXISTS trg_tipos_enxoval_preco_totais")
+    for indice in ("idx_limpezas_imovel_data", "idx_reposicao_suprimentos_imovel_data", "idx_daily_totals_imovel_dia"):
+        cursor.execute(f"DROP INDEX IF EXISTS {indice}")
+
+    for tabela, em_reais, em_centavos, definicao in COLUNAS_MONETARIAS:
+        cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {em_centavos} {definicao}")
+        cursor.execute(f"""
+            UPDATE {tabela}
+            SET {em_centavos} = CAST(ROUND({em_reais} * 100) AS INTEGER)
+            WHERE {em_reais} IS NOT NULL
+        """)
+        _remover_coluna(cursor, tabela, em_reais)
+
+    # Totais diários recalculados a partir dos centavos, sem somar arredondamentos de REAL
+    cursor.execute("DELETE FROM daily_totals")
+    cursor.execute("ALTER TABLE daily_totals ADD COLUMN valor_centavos INTEGER NOT NULL DEFAULT 0")
+    _remover_coluna(cursor, "daily_totals", "valor")
+    _carregar_totais_diarios(cursor, ORIGENS_TOTAIS_DIARIOS, "valor_centavos")
+    _criar_gatilhos_totais_diarios(cursor, ORIGENS_TOTAIS_DIARIOS, "valor_centavos", "preco_unitario_centavos")
+
+    cursor.execute("CREATE INDEX idx_limpezas_imovel_data ON limpezas (imovel_id, data, valor_total_centavos)")
+    cursor.execute("""
+    CREATE INDEX idx_reposicao_suprimentos_imovel_data
+    ON reposicao_suprimentos (imovel_id, data, valor_gasto_centavos)
+    """)
+    cursor.execute("""
+    CREATE INDEX idx_daily_totals_imovel_dia
+    ON daily_totals (imovel_id, dia, categoria, valor_centavos)
+    """)
+
+
+def _remover_coluna(cursor, tabela, coluna):
+    """Remove uma coluna da tabela.
+
+    ALTER TABLE ... DROP COLUMN só existe a partir do SQLite 3.35; antes disso a tabela
+    é refeita: criada de novo sem a coluna, com os dados copiados, e com os índices e
+    gatilhos dela recriados.
+    """
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        cursor.execute(f"ALTER TABLE {tabela} DROP COLUMN {coluna}")
+        return
+    
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,))
+    criacao = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL
+    """, (tabela,))
+    dependentes = [sql for (sql,) in cursor.fetchall()]
+    cursor.execute(f"PRAGMA table_info({tabela})")
+    colunas = ", ".join(col[1] for col in cursor.fetchall() if col[1] != coluna)
+    
+    # Corpo do CREATE TABLE sem a definição da coluna; o que vem depois do ")" final
+    # (ex.: WITHOUT ROWID) é mantido
+    inicio, fim = criacao.index("("), criacao.rindex(")")
+    definicoes = [
+        definicao for definicao in _separar_definicoes(criacao[inicio + 1:fim])
+        if definicao.split()[0].strip('"`[]') != coluna
+    ]
+    cursor.execute(f"CREATE TABLE {tabela}_nova ({', '.join(definicoes)}{criacao[fim:]}")
+    cursor.execute(f"INSERT INTO {tabela}_nova ({colunas}) SELECT {colunas} FROM {tabela}")
+    cursor.execute(f"DROP TABLE {tabela}")
+    cursor.execute(f"ALTER TABLE {tabela}_nova RENAME TO {tabela}")
+    for sql in dependentes:
+        cursor.execute(sql)
+
+
+def _separar_definicoes(corpo):
+    """Separa as definições de um CREATE TABLE pelas vírgulas fora de parênteses e aspas,
+    descartando os comentários "--" """
+    definicoes, atual, profundidade, aspas = [], [], 0, None
+    posicao = 0
+    while posicao < len(corpo):
+        caractere = corpo[posicao]
+        posicao += 1
+        if aspas:
+            aspas = None if caractere == aspas else aspas
+        elif caractere == "-" and corpo.startswith("-", posicao):
+            fim_linha = corpo.find("\n", posicao)
+            posicao = len(corpo) if fim_linha < 0 else fim_linha
+            continue
+        elif caractere in "'\"`":
+            aspas = caractere
+        elif caractere == "(":
+            profundidade += 1
+        elif caractere == ")":
+            profundidade -= 1
+        elif caractere == "," and profundidade == 0:
+            definicoes.append("".join(atual).strip())
+            atual = []
+            continue
+        atual.append(caractere)
+    definicoes.append("".join(atual).strip())
+    return definicoes
+
+
+def _adicionar_coluna_se_ausente(cursor, tabela, coluna, definicao):
+    """Adiciona uma coluna à tabela caso ela ainda não exista"""
+    cursor.execute(f"PRAGMA table_info({tabela})")
+    if coluna not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+
+
+# Migrações em ordem; a versão aplicada fica gravada em PRAGMA user_version
+MIGRACOES = (
+    (1, _migracao_esquema_inicial),
+    (2, _migracao_datas_e_indices),
+    (3, _migracao_totais_diarios),
+    (4, _migracao_indice_faturamento),
+    (5, _migracao_versoes_tabelas),
+    (6, _migracao_busca_textual),
+    (7, _migracao_valores_em_centavos),
+)
+
+
+def migrar_banco_dados(conn=None):
+    """Aplica as migrações pendentes, cada uma em sua própria transação"""
+    conn = conn or obter_conexao()
+    versao_final = MIGRACOES[-1][0]
+    
+    # Banco já atualizado: nenhum DDL é executado
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= versao_final:
+        return versao_final
+    
+    for versao, migracao in MIGRACOES:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Relido dentro da transação caso outra instância tenha migrado antes
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= versao:
+                conn.rollback()
+                continue
+            migracao(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {versao}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
     
+    return versao_final
+
+
+def inicializar_banco_dados():
+    """Prepara o banco de dados na inicialização do sistema"""
+    migrar_banco_dados()
+
+# =============================================
+# DASHBOARD - RESUMO CONSOLIDADO
+# =============================================
 
-    conn.commit()
-    conn.close()
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Totais da semana e séries dos gráficos, lidos de daily_totals numa única consulta"""
+    hoje: str
+    inicio_semana: str
+    inicio_series: str
+    limpezas: tuple            # (registros, valor em centavos)
+    enxoval: tuple             # (registros, valor em centavos)
+    suprimentos: tuple         # (registros, valor em centavos)
+    imoveis_atendidos: int
+    limpezas_por_dia: tuple    # ((dia, quantidade), ...) em ordem de dia
+    enxoval_por_item: tuple    # ((nome, quantidade), ...) do mais ao menos usado
+
+    @property
+    def valor_gestao(self):
+        return VALOR_GESTAO_POR_IMOVEL * self.imoveis_atendidos
+
+    @property
+    def total_a_receber(self):
+        return self.limpezas[1] + self.enxoval[1] + self.valor_gestao
+
+    @property
+    def serie_limpezas(self):
+        """Limpezas de cada dia da janela dos gráficos, com zero nos dias sem limpeza"""
+        por_dia = dict(self.limpezas_por_dia)
+        inicio = date.fromisoformat(self.inicio_series)
+        total_dias = (date.fromisoformat(self.hoje) - inicio).days + 1
+        dias = [(inicio + timedelta(days=i)).isoformat() for i in range(total_dias)]
+        return tuple((dia, por_dia.get(dia, 0)) for dia in dias)
+
+
+SQL_DASHBOARD = """
+    WITH semana AS (
+        SELECT categoria, imovel_id, registros, valor_centavos
+        FROM daily_totals
+        WHERE categoria IN ('limpeza', 'enxoval', 'suprimento') AND dia >= :inicio_semana
+    )
+    SELECT 'total', categoria, SUM(registros), SUM(valor_centavos)
+    FROM semana
+    GROUP BY categoria
+    UNION ALL
+    SELECT 'imoveis', NULL, COUNT(DISTINCT NULLIF(imovel_id, 0)), NULL
+    FROM semana
+    WHERE categoria = 'limpeza'
+    UNION ALL
+    SELECT 'limpezas_dia', dia, SUM(registros), NULL
+    FROM daily_totals
+    WHERE categoria = 'limpeza' AND dia >= :inicio_series
+    GROUP BY dia
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'enxoval_item', t.nome, SUM(d.quantidade), NULL
+        FROM daily_totals d
+        JOIN tipos_enxoval t ON d.item_id = t.id
+        WHERE d.categoria = 'enxoval' AND d.dia >= :inicio_series
+        GROUP BY t.nome
+        ORDER BY 3 DESC
+        LIMIT :top_itens
+    )
+"""
+
+# Quantidade de itens exibidos no gráfico de enxoval do dashboard
+TOP_ITENS_ENXOVAL = 5
+
+
+def consultar_dashboard(hoje=None, dias_semana=7, dias_series=30):
+    """Monta o DashboardSnapshot com uma única passada sobre daily_totals"""
+    hoje = hoje or date.today()
+    inicio_semana = (hoje - timedelta(days=dias_semana)).isoformat()
+    inicio_series = (hoje - timedelta(days=dias_series)).isoformat()
+    
+    totais = {}
+    imoveis_atendidos = 0
+    limpezas_por_dia = []
+    enxoval_por_item = []
+    
+    linhas = obter_conexao().execute(SQL_DASHBOARD, {
+        'inicio_semana': inicio_semana,
+        'inicio_series': inicio_series,
+        'top_itens': TOP_ITENS_ENXOVAL,
+    })
+    for tipo, chave, quantidade, valor in linhas:
+        if tipo == 'total':
+            totais[chave] = (quantidade, valor or 0)
+        elif tipo == 'imoveis':
+            imoveis_atendidos = quantidade
+        elif tipo == 'limpezas_dia':
+            limpezas_por_dia.append((chave, quantidade))
+        else:
+            enxoval_por_item.append((chave, quantidade))
+    
+    # A ordem entre os ramos do UNION ALL não é garantida; ordena aqui
+    limpezas_por_dia.sort()
+    enxoval_por_item.sort(key=lambda item: item[1], reverse=True)
+    
+    return DashboardSnapshot(
+        hoje=hoje.isoformat(),
+        inicio_semana=inicio_semana,
+        inicio_series=inicio_series,
+        limpezas=totais.get('limpeza', (0, 0)),
+        enxoval=totais.get('enxoval', (0, 0)),
+        suprimentos=totais.get('suprimento', (0, 0)),
+        imoveis_atendidos=imoveis_atendidos,
+        limpezas_por_dia=tuple(limpezas_por_dia),
+        enxoval_por_item=tuple(enxoval_por_item),
+    )
+
+# =============================================
+# BUSCA GLOBAL
+# =============================================
+
+# código do tipo em busca_textual -> (tela aberta pelo resultado, rótulo)
+TELAS_BUSCA = {
+    1: ("clientes", "Cliente"),
+    2: ("imoveis", "Imóvel"),
+    3: ("limpeza", "Limpeza"),
+}
+LIMITE_RESULTADOS_BUSCA = 30
+MIN_CARACTERES_BUSCA = 2
+ATRASO_BUSCA_MS = 200  # espera após a última tecla antes de consultar
+
+# Registros mais recentes primeiro: em ordem de rowid o FTS5 para ao atingir o LIMIT,
+# enquanto ordenar por relevância (bm25) exigiria pontuar todas as ocorrências do termo.
+# Os JOINs ficam fora da subconsulta para descrever só as linhas exibidas.
+SQL_BUSCA = """
+    SELECT b.rowid % 4, b.rowid / 4,
+           COALESCE(c.nome, i.endereco, l.data || ' - ' || COALESCE(li.endereco, '')),
+           b.trecho
+    FROM (
+        SELECT rowid, snippet(busca_textual, 1, '', '', '...', 8) AS trecho
+        FROM busca_textual
+        WHERE busca_textual MATCH ?
+        ORDER BY rowid DESC
+        LIMIT ?
+    ) b
+    LEFT JOIN clientes c ON b.rowid % 4 = 1 AND c.id = b.rowid / 4
+    LEFT JOIN imoveis i ON b.rowid % 4 = 2 AND i.id = b.rowid / 4
+    LEFT JOIN limpezas l ON b.rowid % 4 = 3 AND l.id = b.rowid / 4
+    LEFT JOIN imoveis li ON li.id = l.imovel_id
+    ORDER BY b.rowid DESC
+"""
+
+
+def expressao_busca(texto):
+    """Converte o texto digitado numa consulta FTS5: cada palavra vira um prefixo entre aspas"""
+    return " ".join(f'"{termo}"*' for termo in texto.replace('"', " ").split())
+
+
+def buscar_registros(texto, limite=LIMITE_RESULTADOS_BUSCA):
+    """Busca clientes, imóveis e observações de limpezas.
+
+    Devolve (tela, rótulo do tipo, id, descrição, trecho), dos registros mais novos aos mais antigos.
+    """
+    expressao = expressao_busca(texto)
+    if not expressao:
+        return []
+    rows = obter_conexao().execute(SQL_BUSCA, (expressao, limite)).fetchall()
+    return [(*TELAS_BUSCA[codigo], registro_id, descricao or "", trecho or "")
+            for codigo, registro_id, descricao, trecho in rows]
+
+# =============================================
+# DADOS DE REFERÊNCIA
+# =============================================
+
+@dataclass(frozen=True)
+class Cliente:
+    id: int
+    nome: str
+    telefone: str
+    email: str
+
+
+@dataclass(frozen=True)
+class Imovel:
+    id: int
+    cliente_id: int
+    endereco: str
+    quartos: int
+    banheiros: int
+    plataforma: str
+
+
+@dataclass(frozen=True)
+class ItemCatalogo:
+    """Item de enxoval ou de suprimento"""
+    id: int
+    nome: str
+    preco_unitario_centavos: int
+    unidade_medida: str
+
+
+# catálogo -> (consulta, tipo do registro, campo usado na ordenação e nas sugestões)
+CATALOGOS = {
+    "clientes": ("SELECT id, nome, COALESCE(telefone, ''), COALESCE(email, '') FROM clientes ORDER BY id",
+                 Cliente, "nome"),
+    "imoveis": ("""SELECT id, cliente_id, endereco, quartos, banheiros, COALESCE(plataforma, '')
+                   FROM imoveis ORDER BY id""", Imovel, "endereco"),
+    "tipos_enxoval": ("""SELECT id, nome, COALESCE(preco_unitario_centavos, 0), COALESCE(unidade_medida, 'unidade')
+                         FROM tipos_enxoval ORDER BY id""", ItemCatalogo, "nome"),
+    "suprimentos": ("""SELECT id, nome, COALESCE(preco_unitario_centavos, 0), COALESCE(unidade_medida, 'unidade')
+                       FROM suprimentos ORDER BY id""", ItemCatalogo, "nome"),
+}
+
+
+def normalizar_texto(texto):
+    """Minúsculas e sem acentos, para comparar o que foi digitado com os cadastros"""
+    decomposto = unicodedata.normalize("NFKD", (texto or "").casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+class Catalogo:
+    """Registros de uma tabela de cadastro, indexados por id e pelo texto normalizado"""
+
+    def __init__(self, registros, campo):
+        self.por_id = {registro.id: registro for registro in registros}   # na ordem de cadastro
+        chaves = sorted((normalizar_texto(getattr(registro, campo)), registro.id) for registro in registros)
+        self.registros = tuple(self.por_id[registro_id] for _, registro_id in chaves)   # ordem alfabética
+        self._chaves = [chave for chave, _ in chaves]
+        # (palavra, posição em self.registros), ordenado para achar palavras por prefixo
+        self._palavras = sorted({(palavra, indice)
+                                 for indice, chave in enumerate(self._chaves)
+                                 for palavra in chave.split()})
+
+    def sugerir(self, texto, limite):
+        """Registros cujo texto começa com o digitado e, completando o limite, os que têm
+        palavras começando com cada termo digitado"""
+        termo = normalizar_texto(texto.strip())
+        inicio = bisect.bisect_left(self._chaves, termo)
+        fim = inicio
+        while fim < len(self._chaves) and fim - inicio < limite and self._chaves[fim].startswith(termo):
+            fim += 1
+        sugestoes = list(self.registros[inicio:fim])
+        
+        termos = termo.split()
+        if termos and len(sugestoes) < limite:
+            encontrados = None
+            for t in termos:
+                com_palavra = self._com_palavra_iniciada_por(t)
+                encontrados = com_palavra if encontrados is None else encontrados & com_palavra
+            ja_sugeridos = range(inicio, fim)
+            for indice in sorted(encontrados):
+                if indice not in ja_sugeridos:
+                    sugestoes.append(self.registros[indice])
+                    if len(sugestoes) >= limite:
+                        break
+        return sugestoes
+
+    def _com_palavra_iniciada_por(self, prefixo):
+        """Posições dos registros com alguma palavra começando com o prefixo"""
+        indices = set()
+        for palavra, indice in itertools.islice(self._palavras, bisect.bisect_left(self._palavras, (prefixo,)), None):
+            if not palavra.startswith(prefixo):
+                break
+            indices.add(indice)
+        return indices
+
+
+class DadosReferencia:
+    """Cadastros de clientes, imóveis e itens mantidos em memória pelo processo.
+
+    Cada catálogo é lido do banco no primeiro uso e reaproveitado até que uma
+    escrita na tabela correspondente chame invalidar().
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._catalogos = {}
+        self._geracoes = dict.fromkeys(CATALOGOS, 0)
+
+    def catalogo(self, nome):
+        with self._trava:
+            catalogo = self._catalogos.get(nome)
+            geracao = self._geracoes[nome]
+        if catalogo is not None:
+            return catalogo
+        
+        sql, tipo, campo = CATALOGOS[nome]
+        catalogo = Catalogo([tipo(*row) for row in obter_conexao().execute(sql)], campo)
+        with self._trava:
+            # Uma invalidação durante a leitura torna o resultado possivelmente antigo
+            if self._geracoes[nome] == geracao:
+                self._catalogos[nome] = catalogo
+        return catalogo
+
+    def invalidar(self, *nomes):
+        with self._trava:
+            for nome in nomes:
+                self._catalogos.pop(nome, None)
+                self._geracoes[nome] += 1
+
+
+dados_referencia = DadosReferencia()
+
+# =============================================
+# FATURAMENTO
+# =============================================
+
+@dataclass(frozen=True)
+class Faturamento:
+    """Valores a receber de um imóvel, de um cliente ou de todos os imóveis num período"""
+    tipo: str                  # 'imovel', 'cliente' ou 'todos'
+    referencia_id: int
+    data_inicio: str
+    data_fim: str
+    por_imovel: tuple          # ((imovel_id, endereco, limpeza, enxoval, suprimento, cliente_id, cliente), ...)
+
+    @property
+    def limpezas(self):
+        return sum(imovel[2] for imovel in self.por_imovel)
+
+    @property
+    def enxoval(self):
+        return sum(imovel[3] for imovel in self.por_imovel)
+
+    @property
+    def suprimentos(self):
+        return sum(imovel[4] for imovel in self.por_imovel)
+
+    @property
+    def imoveis(self):
+        return len(self.por_imovel)
+
+    @property
+    def imoveis_atendidos(self):
+        """Imóveis com ao menos uma limpeza no período"""
+        return sum(1 for imovel in self.por_imovel if imovel[2])
+
+    @property
+    def gestao(self):
+        """Valor fixo de gestão, cobrado por imóvel da referência"""
+        return VALOR_GESTAO_POR_IMOVEL * self.imoveis
+
+    @property
+    def total(self):
+        return self.limpezas + self.enxoval + self.suprimentos + self.gestao
+
+
+FILTROS_FATURAMENTO = {
+    "imovel": "i.id = :referencia",
+    "cliente": "i.cliente_id = :referencia",
+    "todos": "1",
+}
+
+# Faturamentos recentes: (tipo, id, início, fim) -> (versões das tabelas, Faturamento)
+MAX_CACHE_FATURAMENTO = 64
+_cache_faturamento = {}
+_trava_faturamento = threading.Lock()
+
+
+def calcular_faturamento(tipo, referencia_id, data_inicio, data_fim, usar_cache=True):
+    """Calcula, numa única consulta agrupada por imóvel e categoria, os valores a receber no período.
+
+    O resultado fica em cache enquanto as versões das tabelas (versoes_tabelas, mantidas por
+    gatilhos) não mudarem, o que inclui escritas de outras conexões e processos; versões e
+    totais são lidos no mesmo retrato do banco. Com usar_cache=False o cálculo é sempre refeito,
+    como ao gravar um fechamento.
+    """
+    chave = (tipo, int(referencia_id or 0), str(data_inicio), str(data_fim))
+    with leitura() as conn:
+        versao = impressao_dos_dados()
+        if usar_cache:
+            with _trava_faturamento:
+                em_cache = _cache_faturamento.get(chave)
+            if em_cache and em_cache[0] == versao:
+                return em_cache[1]
+        
+        linhas = conn.execute(f"""
+            SELECT i.id, i.endereco,
+                   COALESCE(SUM(CASE WHEN d.categoria = 'limpeza' THEN d.valor_centavos END), 0),
+                   COALESCE(SUM(CASE WHEN d.categoria = 'enxoval' THEN d.valor_centavos END), 0),
+                   COALESCE(SUM(CASE WHEN d.categoria = 'suprimento' THEN d.valor_centavos END), 0),
+                   i.cliente_id, c.nome
+            FROM imoveis i
+            LEFT JOIN clientes c ON c.id = i.cliente_id
+            LEFT JOIN daily_totals d
+                ON d.imovel_id = i.id AND d.dia BETWEEN :inicio AND :fim
+            WHERE {FILTROS_FATURAMENTO[tipo]}
+            GROUP BY i.id
+            ORDER BY i.endereco
+        """, {'referencia': chave[1], 'inicio': chave[2], 'fim': chave[3]}).fetchall()
+    
+    faturamento = Faturamento(tipo, chave[1], chave[2], chave[3], tuple(linhas))
+    with _trava_faturamento:
+        # Só uma chave nova descarta a mais antiga; atualizar uma existente não
+        if chave not in _cache_faturamento and len(_cache_faturamento) >= MAX_CACHE_FATURAMENTO:
+            del _cache_faturamento[next(iter(_cache_faturamento))]
+        _cache_faturamento[chave] = (versao, faturamento)
+    return faturamento
+
+
+def calcular_faturamento_fechamento(tipo, referencia_id, data_inicio, data_fim, usar_cache=True):
+    """Faturamento de um fechamento de imóvel ou cliente; ValueError se não houver imóvel a fechar"""
+    faturamento = calcular_faturamento(tipo, referencia_id, data_inicio, data_fim, usar_cache)
+    if not faturamento.imoveis:
+        if tipo == "imovel":
+            raise ValueError("Imóvel não encontrado")
+        raise ValueError("Este cliente não possui imóveis cadastrados")
+    return faturamento
+
+
+def calcular_faturamentos_em_lote(tipo, data_inicio, data_fim):
+    """Faturamento de cada cliente ou de cada imóvel no período, a partir de uma única passada agrupada.
+
+    Retorna [(referencia_id, nome, Faturamento), ...] ordenado pelo nome.
+    """
+    todos = calcular_faturamento("todos", 0, data_inicio, data_fim)
+    
+    grupos = {}
+    for imovel in todos.por_imovel:
+        if tipo == "imovel":
+            referencia, nome = imovel[0], imovel[1]
+        elif imovel[5] is not None:
+            referencia, nome = imovel[5], imovel[6]
+        else:
+            continue  # imóvel sem cliente não entra no fechamento por cliente
+        grupos.setdefault((referencia, nome), []).append(imovel)
+    
+    lote = [
+        (referencia, nome, Faturamento(tipo, referencia, todos.data_inicio, todos.data_fim, tuple(imoveis)))
+        for (referencia, nome), imoveis in grupos.items()
+    ]
+    lote.sort(key=lambda item: str(item[1]))
+    return lote
 
 # =============================================
 # FUNÇÕES AUXILIARES
@@ -220,150 +1173,1689 @@ def calcular_horas(hora_inicio, hora_fim):
     except ValueError:
         return 0.0
 
-def selecionar_arquivo(entry_widget, diretorio="comprovantes"):
-    """Permite selecionar um arquivo e move para o diretório de comprovantes"""
+def selecionar_arquivo(entry_widget):
+    """Permite selecionar um arquivo e guarda uma cópia no armazenamento de comprovantes"""
     caminho = filedialog.askopenfilename()
     if caminho:
-        nome_arquivo = os.path.basename(caminho)
-        destino = os.path.join(diretorio, nome_arquivo)
-        os.replace(caminho, destino)
+        try:
+            destino = guardar_comprovante(caminho)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível guardar o comprovante:\n{str(e)}")
+            return
         entry_widget.delete(0, END)
         entry_widget.insert(0, destino)
 
-def formatar_moeda(valor):
-    """Formata um valor float para string monetária"""
-    return f"R$ {valor:.2f}".replace(".", ",")
+@lru_cache(maxsize=4096)
+def formatar_moeda(centavos):
+    """Formata um valor em centavos como moeda brasileira (R$ 1.234,56)"""
+    reais, resto = divmod(abs(int(centavos)), 100)
+    sinal = "-" if centavos < 0 else ""
+    return f"{sinal}R$ {reais:,}".replace(",", ".") + f",{resto:02d}"
+
+def ler_centavos(texto):
+    """Converte um valor digitado ("1.234,56", "1234.56", "R$ 30") para centavos inteiros.
+
+    Sem vírgula, pontos separando grupos de três dígitos são de milhar, como no pt-BR
+    ("1.234" e "1.234.567" são reais inteiros); um único ponto fora desse padrão é a
+    casa decimal ("1234.5", "12.50"). Levanta ValueError se o texto não for um valor numérico.
+    """
+    texto = str(texto).replace("R$", "").replace(" ", "").strip()
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    elif _so_separadores_de_milhar(texto):
+        texto = texto.replace(".", "")
+    try:
+        valor = Decimal(texto)
+    except InvalidOperation:
+        raise ValueError(f"Valor inválido: {texto!r}") from None
+    if not valor.is_finite():
+        raise ValueError(f"Valor inválido: {texto!r}")
+    return int((valor * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def _so_separadores_de_milhar(texto):
+    """Indica se os pontos do texto só separam grupos de três dígitos ("1.234", "-12.345.678")"""
+    grupos = texto.lstrip("+-").split(".")
+    return (
+        len(grupos) > 1
+        and all(grupo.isdigit() for grupo in grupos)
+        and len(grupos[0]) <= 3
+        and not grupos[0].startswith("0")
+        and all(len(grupo) == 3 for grupo in grupos[1:])
+    )
+
+def multiplicar_centavos(quantidade, centavos):
+    """Multiplica um valor em centavos por uma quantidade fracionária (ex.: horas), arredondando ao centavo"""
+    produto = Decimal(str(quantidade)) * int(centavos)
+    return int(produto.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def limitar_diretorio_cache(diretorio, limite, manter=None):
+    """Apaga os arquivos usados há mais tempo (mtime mais antigo) até o diretório caber no limite"""
+    arquivos = []
+    for pasta, _, nomes in os.walk(diretorio):
+        for nome in nomes:
+            if nome.endswith(".tmp"):
+                continue
+            caminho = os.path.join(pasta, nome)
+            try:
+                info = os.stat(caminho)
+            except OSError:
+                continue
+            arquivos.append((info.st_mtime, info.st_size, caminho))
+    
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        if manter and os.path.abspath(caminho) == os.path.abspath(manter):
+            continue
+        try:
+            os.remove(caminho)
+        except OSError:
+            continue
+        total -= tamanho
+
+# =============================================
+# COMPROVANTES
+# =============================================
+
+# Cada comprovante fica em COMPROVANTES_DIR/<2 primeiros dígitos do hash>/<sha256><extensão>:
+# arquivos iguais são guardados uma única vez e nenhuma pasta acumula milhares de itens.
+# Fica nos dados da aplicação, não na pasta de onde ela foi aberta
+COMPROVANTES_LOJA_DIR = os.fspath(COMPROVANTES_DIR)
+TAMANHO_BLOCO_COPIA = 1024 * 1024
+
 
-def gerar_relatorio_semanal():
-    """Gera um relatório semanal em formato DOCX"""
-    conn = sqlite3.connect("sistema.db")
-    cursor = conn.cursor()
+def guardar_comprovante(origem):
+    """Copia o arquivo para o armazenamento de comprovantes e devolve o caminho guardado.
+
+    O original não é alterado. O conteúdo é lido uma única vez, em blocos, passando
+    pelo hash enquanto é copiado para um temporário dentro do armazenamento; o
+    temporário é então renomeado para o nome definitivo ou descartado, se um
+    comprovante idêntico já estiver guardado.
+    """
+    if _esta_no_armazenamento(origem):
+        return origem
+    
+    os.makedirs(COMPROVANTES_LOJA_DIR, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=COMPROVANTES_LOJA_DIR, suffix=".tmp")
+    try:
+        resumo = hashlib.sha256()
+        with os.fdopen(descritor, "wb") as saida, open(origem, "rb") as entrada:
+            for bloco in iter(lambda: entrada.read(TAMANHO_BLOCO_COPIA), b""):
+                resumo.update(bloco)
+                saida.write(bloco)
+        
+        digest = resumo.hexdigest()
+        pasta = os.path.join(COMPROVANTES_LOJA_DIR, digest[:2])
+        destino = os.path.join(pasta, digest + os.path.splitext(origem)[1].lower())
+        os.makedirs(pasta, exist_ok=True)
+        if not os.path.exists(destino):
+            os.replace(temporario, destino)
+        return destino
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def _esta_no_armazenamento(caminho):
+    """Indica se o caminho já aponta para dentro do armazenamento de comprovantes"""
+    loja = os.path.abspath(COMPROVANTES_LOJA_DIR)
+    try:
+        return os.path.commonpath([os.path.abspath(caminho), loja]) == loja
+    except ValueError:  # unidades diferentes no Windows
+        return False
+
+# Miniaturas dos comprovantes, em cache no disco: miniaturas/<chave>_<L>x<A>.png nos dados da
+# aplicação, fora do armazenamento de comprovantes, com a chave sendo o hash do comprovante;
+# as usadas há mais tempo saem ao passar do limite
+MINIATURAS_DIR = os.path.join(APP_DATA_DIR, "miniaturas")
+MAX_BYTES_MINIATURAS = 50 * 1024 * 1024
+TAMANHO_MINIATURA = (160, 160)
+
+# O limite é verificado a cada tantas miniaturas novas, para não varrer a pasta a cada uma
+MINIATURAS_ENTRE_LIMPEZAS = 64
+_miniaturas_geradas = itertools.count(1)
+
+
+def caminho_miniatura(caminho, tamanho=TAMANHO_MINIATURA):
+    """Caminho da miniatura em cache; None se o comprovante não existir.
+
+    Comprovantes do armazenamento já têm o hash no nome; para os demais (gravados
+    antes dele) a chave é o hash do caminho, da data de modificação e do tamanho.
+    """
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    if len(nome) == 64 and all(c in "0123456789abcdef" for c in nome) and _esta_no_armazenamento(caminho):
+        chave = nome
+    else:
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            return None
+        chave = hashlib.sha256(f"{os.path.abspath(caminho)}|{info.st_mtime_ns}|{info.st_size}".encode()).hexdigest()
+    return os.path.join(MINIATURAS_DIR, chave[:2], f"{chave}_{tamanho[0]}x{tamanho[1]}.png")
+
+
+def abrir_miniatura(caminho, tamanho=TAMANHO_MINIATURA):
+    """Devolve a miniatura do comprovante como imagem PIL já carregada, ou None se não for imagem.
+
+    Executada fora da thread do Tk. A imagem original só é decodificada quando a
+    miniatura ainda não está em cache, e mesmo assim com draft(), que em JPEG
+    já lê a imagem reduzida em vez da resolução completa.
+    """
+    from PIL import Image
+
+    verificar_cancelamento()
+    destino = caminho_miniatura(caminho, tamanho)
+    if destino is None:
+        return None
+    
+    try:
+        miniatura = Image.open(destino)
+        miniatura.load()
+        os.utime(destino)
+        return miniatura
+    except OSError:
+        pass
+    
+    try:
+        with Image.open(caminho) as imagem:
+            imagem.draft("RGB", tamanho)
+            imagem.thumbnail(tamanho)
+            miniatura = imagem.convert("RGBA" if "A" in imagem.getbands() else "RGB")
+    except OSError:
+        return None   # PDF ou outro arquivo que não é imagem
     
-    # Data de início (7 dias atrás)
-    data_inicio = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporario = f"{destino}.{threading.get_ident()}.tmp"
+    miniatura.save(temporario, "PNG")
+    os.replace(temporario, destino)
     
-    # Criar documento
-    doc = Document()
-    doc.add_heading('Relatório Semanal de Serviços', 0)
+    if next(_miniaturas_geradas) % MINIATURAS_ENTRE_LIMPEZAS == 0:
+        limitar_diretorio_cache(MINIATURAS_DIR, MAX_BYTES_MINIATURAS)
+    return miniatura
+
+# =============================================
+# RELATÓRIOS
+# =============================================
+
+# Fila por onde os processos de relatório enviam (trabalho, fração, mensagem)
+# de volta à interface; definida pelo inicializador de cada processo
+_fila_progresso_relatorio = None
+_relatorio_atual = None
+
+
+def _inicializar_processo_relatorio(fila_progresso):
+    """Prepara um processo do pool de relatórios"""
+    global _fila_progresso_relatorio
+    _fila_progresso_relatorio = fila_progresso
+
+
+def informar_progresso(fracao, mensagem=""):
+    """Envia o progresso do relatório em andamento para a interface (sem efeito fora do pool)"""
+    if _fila_progresso_relatorio is not None and _relatorio_atual is not None:
+        _fila_progresso_relatorio.put((_relatorio_atual, fracao, mensagem))
+
+
+@dataclass(frozen=True)
+class SecaoRelatorio:
+    """Seção de um relatório: título, tabela opcional e linhas de totais"""
+    titulo: str
+    cabecalho: tuple = ()      # colunas da tabela; vazio quando a seção não tem tabela
+    linhas: tuple = ()         # ((texto, ...), ...) já formatadas, ou uma ConsultaLinhas
+    totais: tuple = ()         # linhas de texto exibidas depois da tabela
+
+@dataclass(frozen=True)
+class Relatorio:
+    """Conteúdo de um relatório, do qual saem tanto a pré-visualização quanto o DOCX"""
+    titulo: str
+    data_inicio: str
+    data_fim: str
+    prefixo_arquivo: str
+    secoes: tuple              # (SecaoRelatorio, ...)
+    total_geral: str           # destaque do resumo financeiro
+    impressao: tuple = ()      # versões das tabelas lidas, de impressao_dos_dados()
+    escopo: str = "todos"      # imóveis considerados, como em FILTROS_FATURAMENTO
+
+    @property
+    def periodo(self):
+        return f"Período: {self.data_inicio} a {self.data_fim}"
+
+
+def impressao_dos_dados():
+    """Contadores de modificação das tabelas usadas nos relatórios; mudam a cada escrita nelas"""
+    return tuple(obter_conexao().execute("SELECT tabela, versao FROM versoes_tabelas ORDER BY tabela"))
+
+
+@em_leitura
+def montar_relatorio_servicos(titulo, data_inicio, data_fim, prefixo_arquivo):
+    """Consulta os serviços do período e monta o Relatorio (limpezas, enxoval, suprimentos e totais).
+
+    Impressão, totais e linhas saem do mesmo retrato do banco; os totais não passam pelo
+    cache de faturamento, para que o arquivo guardado sob a impressão corresponda a ela.
+    """
+    cursor = obter_conexao().cursor()
+    impressao = impressao_dos_dados()
+    data_inicio = data_inicio.isoformat()
+    data_fim = data_fim.isoformat()
     
-    # Adicionar data
-    doc.add_paragraph(f"Período: {data_inicio} a {datetime.now().strftime('%Y-%m-%d')}")
+    # Valores a receber de todos os imóveis, pelo mesmo cálculo dos fechamentos
+    faturamento = calcular_faturamento("todos", 0, data_inicio, data_fim, usar_cache=False)
     
     # Limpezas realizadas
-    doc.add_heading('Limpezas Realizadas', level=1)
+    verificar_cancelamento()
     cursor.execute("""
-        SELECT i.endereco, l.data, l.horas_trabalhadas, l.valor_total 
+        SELECT i.endereco, l.data, l.horas_trabalhadas, l.valor_total_centavos
         FROM limpezas l
         JOIN imoveis i ON l.imovel_id = i.id
-        WHERE date(l.data) >= date(?)
+        WHERE l.data BETWEEN ? AND ?
         ORDER BY l.data
-    """, (data_inicio,))
-    
-    tabela_limpezas = doc.add_table(rows=1, cols=4)
-    tabela_limpezas.style = 'Light Shading'
-    cabecalho = tabela_limpezas.rows[0].cells
-    cabecalho[0].text = 'Imóvel'
-    cabecalho[1].text = 'Data'
-    cabecalho[2].text = 'Horas'
-    cabecalho[3].text = 'Valor'
-    
-    total_horas = 0
-    total_valor = 0
-    
-    for row in cursor.fetchall():
-        linha = tabela_limpezas.add_row().cells
-        linha[0].text = row[0]
-        linha[1].text = row[1]
-        linha[2].text = str(row[2])
-        linha[3].text = formatar_moeda(row[3])
-        total_horas += row[2]
-        total_valor += row[3]
-    
-    doc.add_paragraph(f"Total de horas trabalhadas: {total_horas}")
-    doc.add_paragraph(f"Total a receber por limpezas: {formatar_moeda(total_valor)}")
+    """, (data_inicio, data_fim))
+    resultados = cursor.fetchall()
+    total_horas = sum(row[2] or 0 for row in resultados)
+    
+    limpezas = SecaoRelatorio(
+        'Limpezas Realizadas',
+        ('Imóvel', 'Data', 'Horas', 'Valor'),
+        tuple((row[0], row[1], f"{row[2] or 0:.2f}h", formatar_moeda(row[3] or 0)) for row in resultados),
+        (f"Total de horas trabalhadas: {total_horas:.2f}h",
+         f"Total a receber por limpezas: {formatar_moeda(faturamento.limpezas)}")
+    )
     
     # Enxoval utilizado
-    doc.add_heading('Enxoval Utilizado', level=1)
+    verificar_cancelamento()
     cursor.execute("""
-        SELECT i.endereco, t.nome, SUM(c.quantidade), t.preco_unitario
+        SELECT i.endereco, t.nome, SUM(c.quantidade), t.preco_unitario_centavos
         FROM consumo_enxoval c
         JOIN imoveis i ON c.imovel_id = i.id
         JOIN tipos_enxoval t ON c.item_id = t.id
-        WHERE date(c.data) >= date(?)
+        WHERE c.data BETWEEN ? AND ?
         GROUP BY i.endereco, t.nome
         ORDER BY i.endereco
-    """, (data_inicio,))
-    
-    tabela_enxoval = doc.add_table(rows=1, cols=4)
-    tabela_enxoval.style = 'Light Shading'
-    cabecalho = tabela_enxoval.rows[0].cells
-    cabecalho[0].text = 'Imóvel'
-    cabecalho[1].text = 'Item'
-    cabecalho[2].text = 'Quantidade'
-    cabecalho[3].text = 'Valor Unitário'
-    
-    total_itens = 0
-    total_valor_enxoval = 0
-    
-    for row in cursor.fetchall():
-        linha = tabela_enxoval.add_row().cells
-        linha[0].text = row[0]
-        linha[1].text = row[1]
-        linha[2].text = str(row[2])
-        linha[3].text = formatar_moeda(row[3])
-        total_itens += row[2]
-        total_valor_enxoval += row[2] * row[3]
-    
-    doc.add_paragraph(f"Total de itens utilizados: {total_itens}")
-    doc.add_paragraph(f"Total a receber por enxoval: {formatar_moeda(total_valor_enxoval)}")
+    """, (data_inicio, data_fim))
+    resultados = cursor.fetchall()
+    total_itens = sum(row[2] or 0 for row in resultados)
+    
+    enxoval = SecaoRelatorio(
+        'Enxoval Utilizado',
+        ('Imóvel', 'Item', 'Quantidade', 'Valor Unitário'),
+        tuple((row[0], row[1], str(row[2]), formatar_moeda(row[3] or 0)) for row in resultados),
+        (f"Total de itens utilizados: {total_itens}",
+         f"Total a receber por enxoval: {formatar_moeda(faturamento.enxoval)}")
+    )
     
     # Suprimentos repostos
-    doc.add_heading('Suprimentos Repostos', level=1)
+    verificar_cancelamento()
     cursor.execute("""
-        SELECT i.endereco, s.nome, SUM(r.quantidade), r.valor_gasto
+        SELECT i.endereco, s.nome, SUM(r.quantidade), SUM(r.valor_gasto_centavos)
         FROM reposicao_suprimentos r
         JOIN imoveis i ON r.imovel_id = i.id
         JOIN suprimentos s ON r.suprimento_id = s.id
-        WHERE date(r.data) >= date(?)
+        WHERE r.data BETWEEN ? AND ?
         GROUP BY i.endereco, s.nome
         ORDER BY i.endereco
-    """, (data_inicio,))
-    
-    tabela_suprimentos = doc.add_table(rows=1, cols=4)
-    tabela_suprimentos.style = 'Light Shading'
-    cabecalho = tabela_suprimentos.rows[0].cells
-    cabecalho[0].text = 'Imóvel'
-    cabecalho[1].text = 'Item'
-    cabecalho[2].text = 'Quantidade'
-    cabecalho[3].text = 'Valor Gasto'
-    
-    total_suprimentos = 0
-    total_valor_suprimentos = 0
-    
-    for row in cursor.fetchall():
-        linha = tabela_suprimentos.add_row().cells
-        linha[0].text = row[0]
-        linha[1].text = row[1]
-        linha[2].text = str(row[2])
-        linha[3].text = formatar_moeda(row[3])
-        total_suprimentos += row[2]
-        total_valor_suprimentos += row[3]
-    
-    doc.add_paragraph(f"Total de suprimentos repostos: {total_suprimentos}")
-    doc.add_paragraph(f"Total gasto com suprimentos: {formatar_moeda(total_valor_suprimentos)}")
-    doc.add_paragraph(f"Valor fixo semanal por gestão: {formatar_moeda(50.0 * cursor.execute('SELECT COUNT(DISTINCT imovel_id) FROM limpezas WHERE date(data) >= date(?)', (data_inicio,)).fetchone()[0])}")
-    
-    # Total geral
-    doc.add_heading('Resumo Financeiro', level=1)
-    total_geral = total_valor + total_valor_enxoval + (50.0 * cursor.execute('SELECT COUNT(DISTINCT imovel_id) FROM limpezas WHERE date(data) >= date(?)', (data_inicio,)).fetchone()[0])
-    doc.add_paragraph(f"Total a receber: {formatar_moeda(total_geral)}", style='Heading 2')
-    
-    # Salvar documento
-    nome_arquivo = f"relatorios/Relatorio_{datetime.now().strftime('%Y%m%d')}.docx"
-    doc.save(nome_arquivo)
-    conn.close()
-    
-    return nome_arquivo
+    """, (data_inicio, data_fim))
+    resultados = cursor.fetchall()
+    total_suprimentos = sum(row[2] or 0 for row in resultados)
+    
+    # Gestão: cobrada só dos imóveis que tiveram limpeza no período
+    valor_gestao = VALOR_GESTAO_POR_IMOVEL * faturamento.imoveis_atendidos
+    
+    suprimentos = SecaoRelatorio(
+        'Suprimentos Repostos',
+        ('Imóvel', 'Item', 'Quantidade', 'Valor Gasto'),
+        tuple((row[0], row[1], str(row[2]), formatar_moeda(row[3] or 0)) for row in resultados),
+        (f"Total de suprimentos repostos: {total_suprimentos}",
+         f"Total gasto com suprimentos: {formatar_moeda(faturamento.suprimentos)}",
+         f"Valor fixo por gestão ({faturamento.imoveis_atendidos} imóveis): {formatar_moeda(valor_gestao)}")
+    )
+    
+    total_geral = faturamento.limpezas + faturamento.enxoval + valor_gestao
+    return Relatorio(titulo, data_inicio, data_fim, prefixo_arquivo,
+                     (limpezas, enxoval, suprimentos),
+                     f"Total a receber: {formatar_moeda(total_geral)}", impressao)
+
+
+def montar_relatorio_semanal():
+    """Monta o relatório dos últimos 7 dias"""
+    hoje = date.today()
+    return montar_relatorio_servicos("Relatório Semanal de Serviços",
+                                     hoje - timedelta(days=7), hoje, "Relatorio_Semanal")
+
+
+# Lançamentos de limpeza, enxoval e suprimentos numa só consulta, com uma linha por registro:
+# (imovel_id, endereco, categoria, data, descricao, quantidade, valor em centavos).
+# {filtro} vem de FILTROS_FATURAMENTO e {ordem} define a ordem dos lançamentos
+SQL_LANCAMENTOS = """
+    SELECT i.id AS imovel_id, i.endereco AS endereco, 'limpeza' AS categoria, l.data AS data,
+           'Limpeza', COALESCE(l.horas_trabalhadas, 0), COALESCE(l.valor_total_centavos, 0)
+    FROM limpezas l
+    JOIN imoveis i ON i.id = l.imovel_id
+    WHERE {filtro} AND l.data BETWEEN :inicio AND :fim
+    UNION ALL
+    SELECT i.id, i.endereco, 'enxoval', c.data,
+           t.nome, c.quantidade, c.quantidade * COALESCE(t.preco_unitario_centavos, 0)
+    FROM consumo_enxoval c
+    JOIN imoveis i ON i.id = c.imovel_id
+    JOIN tipos_enxoval t ON t.id = c.item_id
+    WHERE {filtro} AND c.data BETWEEN :inicio AND :fim
+    UNION ALL
+    SELECT i.id, i.endereco, 'suprimento', r.data,
+           COALESCE(s.nome, '-'), COALESCE(r.quantidade, 0), COALESCE(r.valor_gasto_centavos, 0)
+    FROM reposicao_suprimentos r
+    JOIN imoveis i ON i.id = r.imovel_id
+    LEFT JOIN suprimentos s ON s.id = r.suprimento_id
+    WHERE {filtro} AND r.data BETWEEN :inicio AND :fim
+    ORDER BY {ordem}
+"""
+
+ROTULOS_CATEGORIA = {"limpeza": "Limpezas", "enxoval": "Enxoval", "suprimento": "Suprimentos"}
+
+
+def formatar_quantidade(categoria, quantidade):
+    """Horas para limpezas, unidades para enxoval e suprimentos"""
+    if categoria == "limpeza":
+        return f"{quantidade:.2f}h"
+    return str(quantidade)
+
+
+class ConsultaLinhas:
+    """Linhas de uma tabela de relatório lidas do banco sob demanda.
+
+    Cada iteração refaz a consulta e passa o cursor por transformar(), um gerador
+    de módulo; assim a mesma seção pode ser percorrida pela pré-visualização e
+    pelos gravadores de DOCX e PDF (inclusive em outro processo) sem que as
+    linhas fiquem guardadas numa lista.
+    """
+
+    def __init__(self, sql, parametros, transformar):
+        self.sql = sql
+        self.parametros = parametros
+        self.transformar = transformar
+
+    def __iter__(self):
+        return self.transformar(obter_conexao().execute(self.sql, self.parametros))
+
+
+def linhas_por_imovel(lancamentos):
+    """Formata lançamentos ordenados por imóvel e categoria, intercalando subtotais calculados na passagem"""
+    for (_, endereco), do_imovel in itertools.groupby(lancamentos, key=lambda l: (l[0], l[1])):
+        total_imovel = 0
+        for categoria, da_categoria in itertools.groupby(do_imovel, key=lambda l: l[2]):
+            subtotal = 0
+            for _, _, _, data, descricao, quantidade, valor in da_categoria:
+                subtotal += valor
+                yield (endereco, data, descricao, formatar_quantidade(categoria, quantidade), formatar_moeda(valor))
+            total_imovel += subtotal
+            yield ("", "", f"Subtotal {ROTULOS_CATEGORIA[categoria].lower()}", "", formatar_moeda(subtotal))
+        yield ("", "", f"Total {endereco}", "", formatar_moeda(total_imovel))
+
+
+@em_leitura
+def montar_relatorio_mensal(hoje=None):
+    """Monta o relatório do mês corrente até hoje, com os lançamentos agrupados por imóvel.
+
+    Os lançamentos não são lidos aqui: a seção guarda uma ConsultaLinhas que os
+    percorre numa única passagem ordenada quando o relatório é exibido ou gravado.
+    Os totais do mês vêm de daily_totals, lidos sem o cache de faturamento no mesmo
+    retrato do banco que a impressão.
+    """
+    hoje = hoje or date.today()
+    data_inicio = hoje.replace(day=1).isoformat()
+    data_fim = hoje.isoformat()
+    impressao = impressao_dos_dados()
+    
+    faturamento = calcular_faturamento("todos", 0, data_inicio, data_fim, usar_cache=False)
+    quantidades = dict(obter_conexao().execute("""
+        SELECT categoria, SUM(quantidade) FROM daily_totals
+        WHERE dia BETWEEN ? AND ?
+        GROUP BY categoria
+    """, (data_inicio, data_fim)).fetchall())
+    
+    lancamentos = SecaoRelatorio(
+        'Serviços por Imóvel',
+        ('Imóvel', 'Data', 'Descrição', 'Qtd.', 'Valor'),
+        ConsultaLinhas(SQL_LANCAMENTOS.format(filtro=FILTROS_FATURAMENTO["todos"],
+                                              ordem="endereco, imovel_id, categoria, data"),
+                       {'inicio': data_inicio, 'fim': data_fim},
+                       linhas_por_imovel)
+    )
+    
+    # Gestão: cobrada só dos imóveis que tiveram limpeza no período
+    valor_gestao = VALOR_GESTAO_POR_IMOVEL * faturamento.imoveis_atendidos
+    
+    totais = SecaoRelatorio(
+        'Totais do Mês',
+        totais=(f"Total de horas trabalhadas: {quantidades.get('limpeza', 0):.2f}h",
+                f"Total a receber por limpezas: {formatar_moeda(faturamento.limpezas)}",
+                f"Total de itens de enxoval utilizados: {quantidades.get('enxoval', 0):.0f}",
+                f"Total a receber por enxoval: {formatar_moeda(faturamento.enxoval)}",
+                f"Total de suprimentos repostos: {quantidades.get('suprimento', 0):.0f}",
+                f"Total gasto com suprimentos: {formatar_moeda(faturamento.suprimentos)}",
+                f"Valor fixo por gestão ({faturamento.imoveis_atendidos} imóveis): {formatar_moeda(valor_gestao)}")
+    )
+    
+    total_geral = faturamento.limpezas + faturamento.enxoval + valor_gestao
+    return Relatorio("Relatório Mensal de Serviços", data_inicio, data_fim, "Relatorio_Mensal",
+                     (lancamentos, totais),
+                     f"Total a receber: {formatar_moeda(total_geral)}", impressao)
+
+
+# A pré-visualização vai para a interface em trechos de até LINHAS_POR_TRECHO_PREVIA linhas;
+# a fila entre a thread de trabalho e o Tk guarda no máximo MAX_TRECHOS_PREVIA_EM_ESPERA deles
+LINHAS_POR_TRECHO_PREVIA = 200
+MAX_TRECHOS_PREVIA_EM_ESPERA = 8
+
+
+def trechos_previa(relatorio):
+    """Gera o texto da pré-visualização como trechos (texto, estilo), sem o cabeçalho da empresa.
+
+    As tabelas, inclusive as de ConsultaLinhas, saem em blocos de linhas já formatadas,
+    para que nenhum trecho contenha a tabela inteira. Deve rodar fora da thread do Tk.
+    """
+    yield relatorio.periodo + "\n", "subtitulo"
+    for secao in relatorio.secoes:
+        yield "\n" + secao.titulo + "\n", "titulo"
+        if secao.cabecalho:
+            yield "\t".join(secao.cabecalho) + "\n", "negrito"
+            linhas = iter(secao.linhas)
+            while True:
+                verificar_cancelamento()
+                texto = "".join("\t".join(linha) + "\n"
+                                for linha in itertools.islice(linhas, LINHAS_POR_TRECHO_PREVIA))
+                if not texto:
+                    break
+                yield texto, "normal"
+        for texto in secao.totais:
+            yield texto + "\n", "normal"
+    
+    yield "\nResumo Financeiro\n", "titulo"
+    yield relatorio.total_geral + "\n", "destaque"
+
+
+def enfileirar_trecho(fila, trecho):
+    """Coloca o trecho na fila limitada, esperando a interface consumi-la e atendendo ao cancelamento"""
+    while True:
+        verificar_cancelamento()
+        try:
+            fila.put(trecho, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+class DocumentoRelatorio:
+    """Documento DOCX com o cabeçalho da empresa e os estilos usados nos relatórios"""
+
+    LINHAS_POR_BLOCO = 500
+
+    def __init__(self, titulo):
+        from docx import Document
+        from docx.shared import Pt, RGBColor
+        from docx.enum.style import WD_STYLE_TYPE
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        self.doc = Document()
+        
+        # Cabeçalho da empresa (na interface ele é desenhado por adicionar_cabecalho_relatorio)
+        estilo = self.doc.styles.add_style('CabecalhoEmpresa', WD_STYLE_TYPE.PARAGRAPH)
+        estilo.font.name = 'Arial'
+        estilo.font.size = Pt(14)
+        estilo.font.bold = True
+        estilo.font.color.rgb = RGBColor(0x2C, 0x3E, 0x50)  # COR_PRIMARIA
+        
+        para = self.doc.add_paragraph("SUA EMPRESA LTDA", style='CabecalhoEmpresa')
+        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        para = self.doc.add_paragraph(titulo, style='Heading 1')
+        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    def titulo(self, texto, nivel=1):
+        """Adiciona um título de seção"""
+        self.doc.add_heading(texto, level=nivel)
+
+    def paragrafo(self, texto, estilo='Body Text'):
+        """Adiciona um parágrafo"""
+        self.doc.add_paragraph(texto, style=estilo)
+
+    def tabela(self, cabecalho, linhas):
+        """Adiciona uma tabela com uma linha de cabeçalho; linhas pode ser qualquer iterável de tuplas"""
+        from docx.oxml import parse_xml
+        from docx.oxml.ns import nsdecls
+
+        # O python-docx monta o estilo, a grade e o cabeçalho; as demais linhas
+        # são geradas como texto XML e anexadas de uma vez, pois add_row() e
+        # cell.text ficam cada vez mais lentos conforme a tabela cresce
+        tabela = self.doc.add_table(rows=1, cols=len(cabecalho), style='Light Shading Accent 1')
+        tabela.autofit = True
+        for celula, texto in zip(tabela.rows[0].cells, cabecalho):
+            celula.text = texto
+        
+        # Em blocos, para que linhas vindas de um gerador não virem um único texto enorme
+        larguras = [celula.width.twips for celula in tabela.rows[0].cells]
+        linhas = iter(linhas)
+        while True:
+            xml = "".join(
+                "<w:tr>" + "".join(self._celula_xml(largura, texto) for largura, texto in zip(larguras, linha)) + "</w:tr>"
+                for linha in itertools.islice(linhas, self.LINHAS_POR_BLOCO)
+            )
+            if not xml:
+                break
+            tabela._tbl.extend(list(parse_xml(f"<w:tbl {nsdecls('w')}>{xml}</w:tbl>")))
+
+    @staticmethod
+    def _celula_xml(largura, texto):
+        """XML de uma célula com o mesmo conteúdo que cell.text produziria"""
+        conteudo = f'<w:r><w:t xml:space="preserve">{escape(str(texto))}</w:t></w:r>' if texto else ""
+        return f'<w:tc><w:tcPr><w:tcW w:w="{largura}" w:type="dxa"/></w:tcPr><w:p>{conteudo}</w:p></w:tc>'
+
+    def salvar(self, caminho):
+        """Salva o documento por meio de um arquivo temporário, para nunca deixar um DOCX pela metade"""
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        self.doc.save(temporario)
+        os.replace(temporario, caminho)
+        return caminho
+
+
+def escrever_docx(relatorio, caminho):
+    """Renderiza o Relatorio em DOCX no caminho informado"""
+    documento = DocumentoRelatorio(relatorio.titulo)
+    documento.paragrafo(relatorio.periodo, 'Heading 2')
+    
+    for numero, secao in enumerate(relatorio.secoes):
+        informar_progresso(numero / (len(relatorio.secoes) + 1), secao.titulo)
+        documento.titulo(secao.titulo)
+        if secao.cabecalho:
+            documento.tabela(secao.cabecalho, secao.linhas)
+        for texto in secao.totais:
+            documento.paragrafo(texto)
+    
+    documento.titulo('Resumo Financeiro')
+    documento.paragrafo(relatorio.total_geral, 'Heading 2')
+    
+    informar_progresso(0.95, "Salvando documento")
+    return documento.salvar(caminho)
+
+
+def renderizar_relatorio(trabalho_id, funcao, argumentos):
+    """Ponto de entrada dos processos de relatório: executa funcao(*argumentos) e devolve o caminho gravado"""
+    global _relatorio_atual
+    _relatorio_atual = trabalho_id
+    try:
+        return funcao(*argumentos)
+    finally:
+        _relatorio_atual = None
+
+
+class FilaRelatorios:
+    """Renderiza relatórios em um pool de processos, vários ao mesmo tempo.
+
+    O pool só é criado no primeiro relatório. Progresso e resultados são
+    entregues na thread do Tk por um root.after periódico, ativo apenas
+    enquanto houver trabalhos pendentes.
+    """
+
+    INTERVALO_VERIFICACAO_MS = 100
+
+    def __init__(self, root, max_processos=None):
+        self.root = root
+        self.max_processos = max_processos or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._pool = None
+        self._fila_progresso = None
+        self._trabalhos = {}
+        self._contador = itertools.count(1)
+        self._agendamento = None
+
+    def enviar(self, funcao, argumentos, ao_concluir, ao_progredir=None, ao_falhar=None):
+        """Coloca funcao(*argumentos) na fila e devolve o identificador do trabalho.
+
+        funcao é uma das funções de gravação de módulo (gravar_relatorio_em_cache, escrever_pdf_relatorio,
+        escrever_pdf_fechamento); ao_concluir recebe o caminho do arquivo, ao_progredir recebe
+        (trabalho_id, fração, mensagem) e ao_falhar recebe a exceção.
+        """
+        if self._pool is None:
+            # spawn: os processos não herdam o Tk nem as conexões SQLite da aplicação
+            contexto = multiprocessing.get_context("spawn")
+            self._fila_progresso = contexto.Queue()
+            self._pool = ProcessPoolExecutor(max_workers=self.max_processos,
+                                             mp_context=contexto,
+                                             initializer=_inicializar_processo_relatorio,
+                                             initargs=(self._fila_progresso,))
+        
+        trabalho_id = next(self._contador)
+        futuro = self._pool.submit(renderizar_relatorio, trabalho_id, funcao, argumentos)
+        self._trabalhos[trabalho_id] = (futuro, ao_concluir, ao_progredir, ao_falhar)
+        self._agendar_verificacao()
+        return trabalho_id
+
+    def cancelar(self, trabalho_id):
+        """Cancela o trabalho; se já estiver em execução, o resultado é descartado"""
+        trabalho = self._trabalhos.pop(trabalho_id, None)
+        if trabalho:
+            trabalho[0].cancel()
+
+    def encerrar(self):
+        """Cancela os trabalhos pendentes e encerra o pool (chamado ao fechar a janela)"""
+        for trabalho_id in list(self._trabalhos):
+            self.cancelar(trabalho_id)
+        if self._agendamento is not None:
+            self.root.after_cancel(self._agendamento)
+            self._agendamento = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    @property
+    def pendentes(self):
+        return len(self._trabalhos)
+
+    def _agendar_verificacao(self):
+        if self._agendamento is None:
+            self._agendamento = self.root.after(self.INTERVALO_VERIFICACAO_MS, self._verificar)
+
+    def _verificar(self):
+        """Entrega, na thread do Tk, o progresso e os relatórios concluídos"""
+        self._agendamento = None
+        
+        while True:
+            try:
+                trabalho_id, fracao, mensagem = self._fila_progresso.get_nowait()
+            except queue.Empty:
+                break
+            trabalho = self._trabalhos.get(trabalho_id)
+            if trabalho is not None and trabalho[2] is not None:
+                trabalho[2](trabalho_id, fracao, mensagem)
+        
+        for trabalho_id, (futuro, ao_concluir, _, ao_falhar) in list(self._trabalhos.items()):
+            if not futuro.done():
+                continue
+            del self._trabalhos[trabalho_id]
+            
+            try:
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    if ao_falhar is not None:
+                        ao_falhar(e)
+                    else:
+                        messagebox.showerror("Erro", f"Erro ao gerar relatório:\n{str(e)}")
+                else:
+                    ao_concluir(resultado)
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao exibir relatório:\n{str(e)}")
+        
+        if self._trabalhos:
+            self._agendar_verificacao()
+
+# =============================================
+# RELATÓRIOS - CACHE DE ARQUIVOS
+# =============================================
+
+# Arquivos gerados (DOCX e pré-visualizações) ficam em relatorios/cache, nomeados pelo hash da chave
+# (tipo, período, escopo, impressão dos dados); ao passar do limite de tamanho
+# os menos usados recentemente são apagados
+CACHE_RELATORIOS_DIR = os.path.join("relatorios", "cache")
+MAX_BYTES_CACHE_RELATORIOS = 100 * 1024 * 1024
+
+# Incrementar quando o layout dos relatórios mudar, para não reaproveitar arquivos antigos
+VERSAO_LAYOUT_RELATORIOS = 2
+
+
+def caminho_cache_relatorio(relatorio, extensao="docx"):
+    """Caminho do arquivo do relatório no cache; o mesmo enquanto período, escopo e dados não mudarem"""
+    chave = (VERSAO_LAYOUT_RELATORIOS, relatorio.prefixo_arquivo, relatorio.data_inicio,
+             relatorio.data_fim, relatorio.escopo, relatorio.impressao)
+    resumo = hashlib.sha256(repr(chave).encode()).hexdigest()[:16]
+    nome = f"{relatorio.prefixo_arquivo}_{relatorio.data_inicio}_a_{relatorio.data_fim}_{resumo}.{extensao}"
+    return os.path.join(CACHE_RELATORIOS_DIR, nome)
+
+
+def buscar_relatorio_em_cache(relatorio):
+    """Devolve o DOCX já gerado para este relatório (marcando-o como usado) ou None"""
+    caminho = caminho_cache_relatorio(relatorio)
+    try:
+        os.utime(caminho)
+    except OSError:
+        return None
+    return caminho
+
+
+def gravar_relatorio_em_cache(relatorio):
+    """Gera o DOCX do relatório no cache, se ainda não existir, e aplica o limite de tamanho.
+
+    As versões das tabelas são relidas na mesma transação em que as linhas são consultadas:
+    se os dados mudaram depois de o relatório ser montado, o arquivo é gravado fora do cache,
+    em relatorios/, para não ficar registrado sob a impressão antiga.
+    """
+    caminho = buscar_relatorio_em_cache(relatorio)
+    if caminho is not None:
+        return caminho
+    
+    with leitura():
+        if impressao_dos_dados() != relatorio.impressao:
+            avulso = f"{relatorio.prefixo_arquivo}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+            return escrever_docx(relatorio, os.path.join("relatorios", avulso))
+        caminho = escrever_docx(relatorio, caminho_cache_relatorio(relatorio))
+    limitar_diretorio_cache(CACHE_RELATORIOS_DIR, MAX_BYTES_CACHE_RELATORIOS, manter=caminho)
+    return caminho
+
+
+def trechos_previa_em_cache(relatorio):
+    """Trechos da pré-visualização, lidos do cache quando já existirem; senão gerados e gravados nele.
+
+    Deve rodar na mesma transação de leitura em que o relatório foi montado, para que as
+    linhas correspondam à impressão da chave. A gravação vai para um arquivo temporário
+    que só substitui o definitivo no fim, então uma exibição cancelada não entra no cache.
+    """
+    caminho = caminho_cache_relatorio(relatorio, "previa")
+    try:
+        arquivo = open(caminho, encoding="utf-8")
+    except OSError:
+        arquivo = None
+    
+    if arquivo is not None:
+        os.utime(caminho)
+        with arquivo:
+            for linha in arquivo:
+                yield tuple(json.loads(linha))
+        return
+    
+    os.makedirs(CACHE_RELATORIOS_DIR, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            for trecho in trechos_previa(relatorio):
+                arquivo.write(json.dumps(trecho) + "\n")
+                yield trecho
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    limitar_diretorio_cache(CACHE_RELATORIOS_DIR, MAX_BYTES_CACHE_RELATORIOS, manter=caminho)
+
+# =============================================
+# EXPORTAÇÃO EM PDF
+# =============================================
+
+class EscritorPDF:
+    """Gravador de PDF mínimo e sem dependências: textos em Helvetica e tabelas simples.
+
+    Cada página vai para o arquivo assim que fica cheia, então a memória usada
+    não cresce com o número de linhas. Os objetos 1 a 4 são reservados para o
+    catálogo, a árvore de páginas e as duas fontes, gravados em fechar().
+    """
+
+    LARGURA, ALTURA = 595, 842     # A4, em pontos
+    MARGEM = 50
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self._posicao = 0
+        self._offsets = {}
+        self._paginas = []
+        self._proximo_id = 5
+        self._conteudo = None
+        self._y = 0
+        self._cabecalho_tabela = None
+        self._escrever(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def texto(self, texto, tamanho=10, negrito=False):
+        """Escreve uma linha de texto, abrindo nova página se preciso"""
+        self._reservar(tamanho * 1.5)
+        self._texto_em(self.MARGEM, self._y, texto, tamanho, negrito)
+
+    def espaco(self, altura=8):
+        """Deixa um espaço vertical"""
+        if self._conteudo is not None:
+            self._y -= altura
+
+    def tabela(self, cabecalho, linhas, tamanho=9):
+        """Escreve uma tabela consumindo linhas de qualquer iterável; o cabeçalho se repete a cada página"""
+        self._linha_tabela(cabecalho, tamanho, True)
+        self._cabecalho_tabela = (cabecalho, tamanho)
+        try:
+            for linha in linhas:
+                self._linha_tabela(linha, tamanho, False)
+        finally:
+            self._cabecalho_tabela = None
+
+    def fechar(self):
+        """Grava a última página, o catálogo, as fontes e a tabela de referências"""
+        if self._conteudo is None and not self._paginas:
+            self._nova_pagina()
+        self._fechar_pagina()
+        
+        paginas = " ".join(f"{numero} 0 R" for numero in self._paginas)
+        self._objeto(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._objeto(2, f"<< /Type /Pages /Kids [{paginas}] /Count {len(self._paginas)} >>".encode())
+        for numero, fonte in ((3, "Helvetica"), (4, "Helvetica-Bold")):
+            self._objeto(numero, f"<< /Type /Font /Subtype /Type1 /BaseFont /{fonte} "
+                                 f"/Encoding /WinAnsiEncoding >>".encode())
+        
+        inicio_xref = self._posicao
+        self._escrever(b"xref\n0 %d\n0000000000 65535 f \n" % self._proximo_id)
+        self._escrever(b"".join(b"%010d 00000 n \n" % self._offsets[numero]
+                                for numero in range(1, self._proximo_id)))
+        self._escrever(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                       % (self._proximo_id, inicio_xref))
+
+    def _linha_tabela(self, celulas, tamanho, negrito):
+        self._reservar(tamanho * 1.6)
+        largura = (self.LARGURA - 2 * self.MARGEM) / len(celulas)
+        maximo = max(1, int(largura / (tamanho * 0.52)) - 1)   # largura média aproximada da Helvetica
+        for coluna, celula in enumerate(celulas):
+            texto = str(celula)
+            if len(texto) > maximo:
+                texto = texto[:maximo - 1] + "…"
+            self._texto_em(self.MARGEM + coluna * largura, self._y, texto, tamanho, negrito)
+        if negrito:
+            y = self._y - tamanho * 0.4
+            self._conteudo.append(b"0.5 w %.2f %.2f m %.2f %.2f l S"
+                                  % (self.MARGEM, y, self.LARGURA - self.MARGEM, y))
+
+    def _reservar(self, altura):
+        """Desce o cursor para a próxima linha, trocando de página quando ela não cabe"""
+        if self._conteudo is None or self._y - altura < self.MARGEM:
+            self._nova_pagina()
+            if self._cabecalho_tabela is not None:
+                self._linha_tabela(self._cabecalho_tabela[0], self._cabecalho_tabela[1], True)
+        self._y -= altura
+
+    def _texto_em(self, x, y, texto, tamanho, negrito=False):
+        texto = " ".join(str(texto).split("\n")).encode("cp1252", "replace")
+        texto = texto.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        self._conteudo.append(b"BT /%s %d Tf %.2f %.2f Td (%s) Tj ET"
+                              % (b"F2" if negrito else b"F1", tamanho, x, y, texto))
+
+    def _nova_pagina(self):
+        self._fechar_pagina()
+        self._conteudo = []
+        self._y = self.ALTURA - self.MARGEM
+
+    def _fechar_pagina(self):
+        """Grava a página atual (conteúdo comprimido e objeto de página) no arquivo"""
+        if self._conteudo is None:
+            return
+        self._texto_em(self.MARGEM, self.MARGEM / 2, f"Página {len(self._paginas) + 1}", 8)
+        fluxo = zlib.compress(b"\n".join(self._conteudo))
+        self._conteudo = None
+        
+        conteudo_id, pagina_id = self._proximo_id, self._proximo_id + 1
+        self._proximo_id += 2
+        self._objeto(conteudo_id, b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+                     % (len(fluxo), fluxo))
+        self._objeto(pagina_id, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.LARGURA} {self.ALTURA}] "
+                                 f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+                                 f"/Contents {conteudo_id} 0 R >>").encode())
+        self._paginas.append(pagina_id)
+
+    def _objeto(self, numero, corpo):
+        self._offsets[numero] = self._posicao
+        self._escrever(b"%d 0 obj\n%s\nendobj\n" % (numero, corpo))
+
+    def _escrever(self, dados):
+        self.arquivo.write(dados)
+        self._posicao += len(dados)
+
+
+def escrever_pdf_relatorio(relatorio, caminho):
+    """Renderiza o Relatorio em PDF no caminho informado"""
+    with open(caminho, "wb") as arquivo:
+        pdf = EscritorPDF(arquivo)
+        pdf.texto("SUA EMPRESA LTDA", 14, True)
+        pdf.texto(relatorio.titulo, 16, True)
+        pdf.texto(relatorio.periodo, 11)
+        
+        for numero, secao in enumerate(relatorio.secoes):
+            informar_progresso(numero / (len(relatorio.secoes) + 1), secao.titulo)
+            pdf.espaco()
+            pdf.texto(secao.titulo, 13, True)
+            if secao.cabecalho:
+                pdf.tabela(secao.cabecalho, secao.linhas)
+            for texto in secao.totais:
+                pdf.texto(texto)
+        
+        pdf.espaco()
+        pdf.texto('Resumo Financeiro', 13, True)
+        pdf.texto(relatorio.total_geral, 12, True)
+        
+        informar_progresso(0.95, "Salvando documento")
+        pdf.fechar()
+    return caminho
+
+
+def escrever_pdf_fechamento(tipo, referencia_id, data_inicio, data_fim, caminho):
+    """Gera em PDF o extrato de fechamento de um imóvel ou cliente, lendo os lançamentos aos poucos.
+
+    Roda no processo de relatórios, onde o cache de faturamento não vê as escritas da
+    aplicação: os totais são recalculados no mesmo retrato do banco que os lançamentos.
+    """
+    with leitura():
+        faturamento = calcular_faturamento_fechamento(tipo, referencia_id, data_inicio, data_fim, usar_cache=False)
+        
+        if tipo == "imovel":
+            referencia = f"Imóvel: {faturamento.por_imovel[0][1]}"
+        else:
+            referencia = f"Cliente: {faturamento.por_imovel[0][6]}"
+        
+        cursor = obter_conexao().execute(
+            SQL_LANCAMENTOS.format(filtro=FILTROS_FATURAMENTO[tipo], ordem="data, endereco"),
+            {'referencia': faturamento.referencia_id, 'inicio': faturamento.data_inicio, 'fim': faturamento.data_fim}
+        )
+        
+        with open(caminho, "wb") as arquivo:
+            pdf = EscritorPDF(arquivo)
+            pdf.texto("SUA EMPRESA LTDA", 14, True)
+            pdf.texto("Extrato de Fechamento", 16, True)
+            pdf.texto(referencia, 11, True)
+            pdf.texto(f"Período: {faturamento.data_inicio} a {faturamento.data_fim}", 11)
+            
+            informar_progresso(0.1, "Resumo por imóvel")
+            pdf.espaco()
+            pdf.texto("Resumo por Imóvel", 13, True)
+            pdf.tabela(('Imóvel', 'Limpezas', 'Enxoval', 'Suprimentos'),
+                       ((row[1], formatar_moeda(row[2]), formatar_moeda(row[3]), formatar_moeda(row[4]))
+                        for row in faturamento.por_imovel))
+            pdf.espaco()
+            pdf.texto(f"Limpezas: {formatar_moeda(faturamento.limpezas)}")
+            pdf.texto(f"Enxoval: {formatar_moeda(faturamento.enxoval)}")
+            pdf.texto(f"Suprimentos: {formatar_moeda(faturamento.suprimentos)}")
+            pdf.texto(f"Gestão ({faturamento.imoveis} imóveis): {formatar_moeda(faturamento.gestao)}")
+            pdf.texto(f"TOTAL: {formatar_moeda(faturamento.total)}", 12, True)
+            
+            informar_progresso(0.3, "Lançamentos")
+            pdf.espaco()
+            pdf.texto("Lançamentos", 13, True)
+            pdf.tabela(('Data', 'Imóvel', 'Descrição', 'Qtd.', 'Valor'),
+                       ((data, endereco,
+                         descricao if categoria == "limpeza" else f"{ROTULOS_CATEGORIA[categoria]}: {descricao}",
+                         formatar_quantidade(categoria, quantidade), formatar_moeda(valor))
+                        for _, endereco, categoria, data, descricao, quantidade, valor in cursor))
+            
+            informar_progresso(0.95, "Salvando documento")
+            pdf.fechar()
+    return caminho
+
+# =============================================
+# EXECUÇÃO EM SEGUNDO PLANO
+# =============================================
+
+class TarefaCancelada(Exception):
+    """Sinaliza que a tarefa em segundo plano foi cancelada"""
+
+
+_tarefa_atual = threading.local()
+
+
+def verificar_cancelamento():
+    """Interrompe a tarefa em segundo plano atual caso ela tenha sido cancelada"""
+    evento = getattr(_tarefa_atual, "cancelamento", None)
+    if evento is not None and evento.is_set():
+        raise TarefaCancelada()
+
+
+class ExecutorTarefas:
+    """Executa consultas e relatórios fora da thread do Tk e entrega os resultados via root.after"""
+
+    INTERVALO_VERIFICACAO_MS = 30
+
+    def __init__(self, root, ao_mudar_estado=None, max_threads=3):
+        self.root = root
+        self.ao_mudar_estado = ao_mudar_estado
+        self._pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="tarefa")
+        self._concluidas = queue.Queue()
+        self._ativas = {}  # chave -> evento de cancelamento da tarefa mais recente
+        self._pendentes = 0
+        self._agendamento = None
+        self._estado_notificado = False
+
+    @property
+    def ocupado(self):
+        return self._pendentes > 0
+
+    def executar(self, chave, funcao, ao_concluir=None, ao_falhar=None):
+        """Roda funcao() numa thread de trabalho e chama ao_concluir(resultado) na thread do Tk.
+
+        Uma nova tarefa com a mesma chave cancela a anterior, cujo resultado é descartado.
+        """
+        self.cancelar(chave)
+        cancelamento = threading.Event()
+        self._ativas[chave] = cancelamento
+        self._pendentes += 1
+        self._pool.submit(self._rodar, chave, cancelamento, funcao, ao_concluir, ao_falhar)
+        self._notificar()
+        self._agendar_verificacao()
+        return cancelamento
+
+    def cancelar(self, chave):
+        """Cancela a tarefa pendente com a chave informada"""
+        evento = self._ativas.pop(chave, None)
+        if evento is not None:
+            evento.set()
+
+    def cancelar_todas(self):
+        """Cancela todas as tarefas pendentes"""
+        for chave in list(self._ativas):
+            self.cancelar(chave)
+
+    def encerrar(self):
+        """Cancela as tarefas e libera as threads de trabalho"""
+        self.cancelar_todas()
+        if self._agendamento is not None:
+            self.root.after_cancel(self._agendamento)
+            self._agendamento = None
+        self._pool.shutdown(wait=False)
+
+    def _rodar(self, chave, cancelamento, funcao, ao_concluir, ao_falhar):
+        """Corpo executado na thread de trabalho"""
+        _tarefa_atual.cancelamento = cancelamento
+        try:
+            verificar_cancelamento()
+            resultado = (True, funcao())
+        except TarefaCancelada:
+            resultado = None
+        except Exception as e:
+            resultado = (False, e)
+        finally:
+            _tarefa_atual.cancelamento = None
+        self._concluidas.put((chave, cancelamento, resultado, ao_concluir, ao_falhar))
+
+    def _agendar_verificacao(self):
+        if self._agendamento is None:
+            self._agendamento = self.root.after(self.INTERVALO_VERIFICACAO_MS, self._verificar)
+
+    def _verificar(self):
+        """Entrega, na thread do Tk, os resultados das tarefas concluídas"""
+        self._agendamento = None
+        while True:
+            try:
+                chave, cancelamento, resultado, ao_concluir, ao_falhar = self._concluidas.get_nowait()
+            except queue.Empty:
+                break
+            
+            self._pendentes -= 1
+            if self._ativas.get(chave) is cancelamento:
+                del self._ativas[chave]
+            if resultado is None or cancelamento.is_set():
+                continue
+            
+            sucesso, valor = resultado
+            try:
+                if sucesso:
+                    if ao_concluir is not None:
+                        ao_concluir(valor)
+                elif ao_falhar is not None:
+                    ao_falhar(valor)
+                else:
+                    messagebox.showerror("Erro", f"Erro ao carregar dados:\n{str(valor)}")
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao exibir dados:\n{str(e)}")
+        
+        self._notificar()
+        if self._pendentes > 0:
+            self._agendar_verificacao()
+
+    def _notificar(self):
+        if self.ocupado == self._estado_notificado:
+            return
+        self._estado_notificado = self.ocupado
+        if self.ao_mudar_estado is not None:
+            self.ao_mudar_estado(self.ocupado)
+
+# =============================================
+# COMPONENTES DE INTERFACE
+# =============================================
+
+class ListaPaginada:
+    """Mantém num Treeview só uma janela de linhas e busca as demais conforme a rolagem.
+
+    A paginação é por chave (data, id) em ordem decrescente, apoiada no índice de data
+    de cada tabela, então abrir ou rolar a lista custa o mesmo com 100 ou 1.000.000 de linhas.
+    
+    A consulta recebida pode ter WHERE, GROUP BY ou ORDER BY próprios: ela é usada como
+    subconsulta, e coluna_data e coluna_id são nomes de colunas do seu resultado.
+    """
+
+    TAMANHO_PAGINA = 100
+    MAX_LINHAS = 300
+    MARGEM_ROLAGEM = 0.15  # fração da janela, perto das bordas, que dispara nova busca
+
+    def __init__(self, tree, scrollbar, executor, chave, sql, coluna_data, coluna_id, indice_data, formatar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.executor = executor
+        self.chave = chave
+        self.indice_data = indice_data
+        self.formatar = formatar
+        
+        # Consultas simples são achatadas pelo SQLite, mantendo o uso do índice de data
+        sql = f"SELECT * FROM ({sql}) AS base"
+        ordem_desc = f"ORDER BY {coluna_data} DESC, {coluna_id} DESC LIMIT ?"
+        self._sql_inicio = f"{sql} {ordem_desc}"
+        self._sql_seguintes = f"{sql} WHERE ({coluna_data}, {coluna_id}) < (?, ?) {ordem_desc}"
+        self._sql_anteriores = f"{sql} WHERE ({coluna_data}, {coluna_id}) > (?, ?) ORDER BY {coluna_data}, {coluna_id} LIMIT ?"
+        self._sql_ultimo_id = f"{sql} ORDER BY {coluna_id} DESC LIMIT 1"
+        self._sql_novos = f"{sql} WHERE {coluna_id} > ? ORDER BY {coluna_id}"
+        self._sql_registro = f"{sql} WHERE {coluna_id} = ?"
+        
+        self._chaves = {}  # iid -> (data, id) das linhas presentes no Treeview
+        self._ha_anteriores = False
+        self._ha_seguintes = False
+        self._pendente = None
+        self._ultimo_id = 0  # maior id já conhecido; linhas acima dele são novas
+        
+        self.tree.configure(yscrollcommand=self._ao_rolar)
+
+    @property
+    def carregando(self):
+        return self._pendente is not None and not self._pendente.is_set()
+
+    def recarregar(self):
+        """Descarta as linhas exibidas e busca a página mais recente"""
+        def consultar():
+            conn = obter_conexao()
+            ultimo = conn.execute(self._sql_ultimo_id).fetchone()
+            rows = conn.execute(self._sql_inicio, (self.TAMANHO_PAGINA + 1,)).fetchall()
+            return (ultimo[0] if ultimo else 0), rows
+        self._pendente = self.executor.executar(self.chave, consultar, self._exibir_inicio)
+
+    def ir_para(self, registro_id):
+        """Carrega a janela de linhas em torno do registro e o seleciona"""
+        metade = self.TAMANHO_PAGINA // 2
+        def consultar():
+            conn = obter_conexao()
+            row = conn.execute(self._sql_registro, (registro_id,)).fetchone()
+            if row is None:
+                return None
+            chave = (row[self.indice_data], row[0])
+            anteriores = conn.execute(self._sql_anteriores, (*chave, metade + 1)).fetchall()
+            seguintes = conn.execute(self._sql_seguintes, (*chave, metade + 1)).fetchall()
+            ultimo = conn.execute(self._sql_ultimo_id).fetchone()
+            return ultimo[0], anteriores, row, seguintes
+        self._pendente = self.executor.executar(self.chave, consultar,
+                                                lambda dados: self._exibir_registro(dados, metade))
+
+    def atualizar(self):
+        """Insere na janela apenas os registros gravados desde a última carga"""
+        self.executor.executar(
+            f"{self.chave}_novos",
+            lambda: obter_conexao().execute(self._sql_novos, (self._ultimo_id,)).fetchall(),
+            self._exibir_novos
+        )
+
+    def _buscar(self, sql, parametros, ao_concluir):
+        def consultar():
+            return obter_conexao().execute(sql, parametros).fetchall()
+        self._pendente = self.executor.executar(self.chave, consultar, ao_concluir)
+
+    def _ao_rolar(self, primeiro, ultimo):
+        """yscrollcommand do Treeview: repassa à scrollbar e busca a página vizinha se preciso"""
+        self.scrollbar.set(primeiro, ultimo)
+        if self.carregando:
+            return
+        
+        linhas = self.tree.get_children()
+        if not linhas:
+            return
+        
+        if float(ultimo) >= 1 - self.MARGEM_ROLAGEM and self._ha_seguintes:
+            self._buscar(self._sql_seguintes,
+                         (*self._chaves[linhas[-1]], self.TAMANHO_PAGINA + 1),
+                         self._exibir_seguintes)
+        elif float(primeiro) <= self.MARGEM_ROLAGEM and self._ha_anteriores:
+            self._buscar(self._sql_anteriores,
+                         (*self._chaves[linhas[0]], self.TAMANHO_PAGINA + 1),
+                         self._exibir_anteriores)
+
+    def _inserir(self, indice, row):
+        iid = str(row[0])
+        self._chaves[iid] = (row[self.indice_data], row[0])
+        self.tree.insert('', indice, iid=iid, values=self.formatar(row))
+
+    def _remover(self, iids):
+        self.tree.delete(*iids)
+        for iid in iids:
+            del self._chaves[iid]
+
+    def _exibir_inicio(self, dados):
+        self._ultimo_id, rows = dados
+        self._pendente = None
+        self.tree.delete(*self.tree.get_children())
+        self._chaves.clear()
+        
+        self._ha_anteriores = False
+        self._ha_seguintes = len(rows) > self.TAMANHO_PAGINA
+        for row in rows[:self.TAMANHO_PAGINA]:
+            self._inserir('end', row)
+        self.tree.yview_moveto(0)
+
+    def _exibir_registro(self, dados, metade):
+        self._pendente = None
+        if dados is None:
+            self.recarregar()  # registro removido depois da busca
+            return
+        self._ultimo_id, anteriores, row, seguintes = dados
+        self.tree.delete(*self.tree.get_children())
+        self._chaves.clear()
+        
+        # anteriores vêm em ordem crescente, ou seja, do mais próximo ao mais distante do registro
+        self._ha_anteriores = len(anteriores) > metade
+        self._ha_seguintes = len(seguintes) > metade
+        for anterior in reversed(anteriores[:metade]):
+            self._inserir('end', anterior)
+        self._inserir('end', row)
+        for seguinte in seguintes[:metade]:
+            self._inserir('end', seguinte)
+        
+        iid = str(row[0])
+        self.tree.selection_set(iid)
+        self.tree.see(iid)
+
+    def _exibir_seguintes(self, rows):
+        """Acrescenta uma página ao fim e descarta as linhas excedentes do topo"""
+        self._pendente = None
+        topo = self._linha_do_topo()
+        
+        self._ha_seguintes = len(rows) > self.TAMANHO_PAGINA
+        for row in rows[:self.TAMANHO_PAGINA]:
+            self._inserir('end', row)
+        
+        linhas = self.tree.get_children()
+        excesso = len(linhas) - self.MAX_LINHAS
+        if excesso > 0:
+            self._remover(linhas[:excesso])
+            self._ha_anteriores = True
+            self._mover_para(topo - excesso)
+
+    def _exibir_anteriores(self, rows):
+        """Acrescenta uma página no início (rows vêm em ordem crescente) e descarta o excedente do fim"""
+        self._pendente = None
+        topo = self._linha_do_topo()
+        
+        self._ha_anteriores = len(rows) > self.TAMANHO_PAGINA
+        rows = rows[:self.TAMANHO_PAGINA]
+        for row in rows:
+            self._inserir(0, row)
+        
+        linhas = self.tree.get_children()
+        excesso = len(linhas) - self.MAX_LINHAS
+        if excesso > 0:
+            self._remover(linhas[-excesso:])
+            self._ha_seguintes = True
+        self._mover_para(topo + len(rows))
+
+    def _exibir_novos(self, rows):
+        """Posiciona cada registro novo pela chave (data, id), se ele cair dentro da janela atual"""
+        for row in rows:
+            if row[0] <= self._ultimo_id:
+                continue  # já trazido por uma recarga concluída depois da busca
+            self._ultimo_id = row[0]
+            
+            chave = (row[self.indice_data], row[0])
+            linhas = self.tree.get_children()
+            indice = len(linhas)
+            for i, iid in enumerate(linhas):
+                if self._chaves[iid] < chave:
+                    indice = i
+                    break
+            
+            # Fora da janela: aparecerá quando a página correspondente for buscada
+            if (indice == 0 and linhas and self._ha_anteriores) or \
+               (indice == len(linhas) and self._ha_seguintes):
+                continue
+            self._inserir(indice, row)
+
+    def _linha_do_topo(self):
+        """Índice da primeira linha visível"""
+        return int(round(float(self.tree.yview()[0]) * len(self.tree.get_children())))
+
+    def _mover_para(self, indice):
+        total = len(self.tree.get_children())
+        if total:
+            self.tree.yview_moveto(max(indice, 0) / total)
+
+class SeletorRegistro(ttk.Combobox):
+    """Combobox com sugestões tiradas dos dados de referência conforme o texto digitado.
+
+    A cada pausa na digitação mostra até LIMITE_SUGESTOES registros do catálogo cujo
+    texto começa com o digitado, completando com os que têm palavras começando com ele.
+    O id escolhido fica em self.selecionado (0 sem seleção), sem depender do texto exibido.
+    """
+
+    LIMITE_SUGESTOES = 20
+
+    def __init__(self, master, executor, catalogo, formatar=None, **opcoes):
+        super().__init__(master, **opcoes)
+        self.executor = executor
+        self.catalogo = catalogo
+        self.formatar = formatar or (lambda registro: getattr(registro, CATALOGOS[catalogo][2]))
+        self.selecionado = IntVar(self, 0)
+        self._sugestoes = []   # (id, texto) na ordem de self['values']
+        self._texto_selecionado = None
+        self._agendamento = None
+        
+        self.bind("<KeyRelease>", self._ao_digitar, add="+")
+        self.bind("<<ComboboxSelected>>", lambda e: self._ao_escolher(), add="+")
+        self.bind("<Return>", lambda e: self._confirmar(), add="+")
+        self.bind("<FocusOut>", lambda e: self._confirmar(), add="+")
+
+    def atualizar(self):
+        """Refaz as sugestões para o texto atual (por exemplo, após novos cadastros)"""
+        self._consultar(self.get().strip())
+
+    def selecionar(self, registro_id, texto):
+        self.selecionado.set(registro_id)
+        self._texto_selecionado = texto
+        self.set(texto)
+
+    def limpar(self):
+        self.selecionado.set(0)
+        self._texto_selecionado = None
+        self.set('')
+        self.atualizar()
+
+    def _ao_digitar(self, evento):
+        if evento.keysym in ("Return", "Escape", "Up", "Down", "Tab"):
+            return
+        if self.get() != self._texto_selecionado:
+            self.selecionado.set(0)
+        if self._agendamento is not None:
+            self.after_cancel(self._agendamento)
+        self._agendamento = self.after(ATRASO_BUSCA_MS, self.atualizar)
+
+    def _consultar(self, texto):
+        self._agendamento = None
+        self.executor.executar(f"seletor{self}", lambda: self._buscar_sugestoes(texto), self._exibir_sugestoes)
+
+    def _buscar_sugestoes(self, texto):
+        """Executado fora da thread do Tk, que só espera pelo banco na primeira leitura do catálogo"""
+        registros = dados_referencia.catalogo(self.catalogo).sugerir(texto, self.LIMITE_SUGESTOES)
+        return [(registro.id, self.formatar(registro)) for registro in registros]
+
+    def _exibir_sugestoes(self, sugestoes):
+        self._sugestoes = sugestoes
+        self['values'] = [rotulo for _, rotulo in sugestoes]
+
+    def _ao_escolher(self):
+        indice = self.current()
+        if 0 <= indice < len(self._sugestoes):
+            self.selecionar(*self._sugestoes[indice])
+
+    def _confirmar(self):
+        """Ao sair do campo, aceita o texto se ele identificar uma única sugestão"""
+        texto = self.get().strip()
+        if self.selecionado.get() or not texto:
+            return
+        iguais = [s for s in self._sugestoes if s[1].casefold() == texto.casefold()]
+        if len(iguais) == 1 or (not iguais and len(self._sugestoes) == 1):
+            self.selecionar(*(iguais or self._sugestoes)[0])
+
+class GerenciadorBlit:
+    """Redesenha só os artistas animados de uma figura matplotlib sobre um fundo guardado (blitting)"""
+
+    def __init__(self, canvas, artistas):
+        self.canvas = canvas
+        self.artistas = list(artistas)
+        self._fundo = None
+        
+        for artista in self.artistas:
+            artista.set_animated(True)
+        # Toda renderização completa (inclusive por redimensionamento) renova o fundo guardado
+        self.canvas.mpl_connect('draw_event', self._ao_desenhar)
+
+    def _ao_desenhar(self, evento):
+        self._fundo = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._desenhar_artistas()
+
+    def _desenhar_artistas(self):
+        for artista in self.artistas:
+            self.canvas.figure.draw_artist(artista)
+
+    def atualizar(self, redesenhar_fundo=False):
+        """Exibe os dados novos dos artistas; renderiza a figura inteira só quando eixos ou rótulos mudaram"""
+        if redesenhar_fundo or self._fundo is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._fundo)
+        self._desenhar_artistas()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+def teto_do_eixo(maximo, passo=5):
+    """Limite superior do eixo: múltiplo de passo com folga para os rótulos, estável entre atualizações"""
+    return max(passo, math.ceil(maximo * 1.15 / passo) * passo)
+
+
+class SincronizadorTreeview:
+    """Atualiza um Treeview aplicando só as inclusões, alterações e remoções desde a última carga.
+
+    Cada linha é identificada pela chave primária (primeira coluna), usada como iid.
+    """
+
+    def __init__(self, tree, formatar=tuple):
+        self.tree = tree
+        self.formatar = formatar
+        self._valores = {}  # iid -> valores exibidos
+
+    def aplicar(self, rows):
+        """Deixa o Treeview igual a rows, na mesma ordem"""
+        novos = {str(row[0]): tuple(self.formatar(row)) for row in rows}
+        
+        removidos = [iid for iid in self._valores if iid not in novos]
+        if removidos:
+            self.tree.delete(*removidos)
+            for iid in removidos:
+                del self._valores[iid]
+        
+        # Só reordena se a ordem das linhas mantidas mudou
+        mantidos = [iid for iid in novos if iid in self._valores]
+        if mantidos != list(self.tree.get_children()):
+            for indice, iid in enumerate(mantidos):
+                self.tree.move(iid, '', indice)
+        
+        for indice, (iid, valores) in enumerate(novos.items()):
+            anteriores = self._valores.get(iid)
+            if anteriores is None:
+                self.tree.insert('', indice, iid=iid, values=valores)
+            elif anteriores != valores:
+                self.tree.item(iid, values=valores)
+            self._valores[iid] = valores
+
+class GaleriaComprovantes:
+    """Janela com as miniaturas dos comprovantes numa grade rolável.
+
+    Só as células visíveis pedem miniatura, cada uma numa tarefa em segundo plano;
+    as que saem da tela antes de carregar são canceladas, e apenas as
+    MAX_IMAGENS_MEMORIA usadas mais recentemente ficam em memória como PhotoImage.
+    """
+
+    COLUNAS = 4
+    LARGURA_CELULA = 190
+    ALTURA_CELULA = 215
+    MAX_IMAGENS_MEMORIA = 120
+
+    # origem -> consulta com (id, data, descrição, caminho do comprovante)
+    CONSULTAS = {
+        "Suprimentos": """
+            SELECT r.id, r.data, COALESCE(i.endereco, '') || ' - ' || COALESCE(s.nome, ''), r.comprovante_path
+            FROM reposicao_suprimentos r
+            LEFT JOIN imoveis i ON r.imovel_id = i.id
+            LEFT JOIN suprimentos s ON r.suprimento_id = s.id
+            WHERE r.comprovante_path IS NOT NULL AND r.comprovante_path != ''
+            ORDER BY r.data DESC, r.id DESC
+        """,
+        "Fechamentos": """
+            SELECT f.id, f.data_fechamento,
+                   CASE f.tipo WHEN 'imovel' THEN i.endereco ELSE c.nome END, f.comprovante_path
+            FROM fechamentos f
+            LEFT JOIN imoveis i ON f.tipo = 'imovel' AND f.referencia_id = i.id
+            LEFT JOIN clientes c ON f.tipo = 'cliente' AND f.referencia_id = c.id
+            WHERE f.comprovante_path IS NOT NULL AND f.comprovante_path != ''
+            ORDER BY f.data_fechamento DESC, f.id DESC
+        """,
+    }
+
+    def __init__(self, root, executor, origem, ao_abrir):
+        self.executor = executor
+        self.ao_abrir = ao_abrir
+        self._registros = []
+        self._itens_imagem = []   # índice -> id do item de imagem no canvas
+        self._itens_texto = []    # índice -> id do texto exibido enquanto não há imagem
+        self._imagens = OrderedDict()  # índice -> PhotoImage (None se não for imagem), do menos ao mais recente
+        self._pedidos = {}        # índice -> chave da tarefa que busca a miniatura
+        self._geracao = 0         # descarta miniaturas pedidas antes de trocar a origem
+        
+        self.janela = Toplevel(root)
+        self.janela.title("Comprovantes")
+        self.janela.geometry(f"{self.COLUNAS * self.LARGURA_CELULA + 40}x650")
+        self.janela.configure(bg=COR_FUNDO)
+        self.janela.protocol("WM_DELETE_WINDOW", self.fechar)
+        
+        frame_topo = Frame(self.janela, bg=COR_FUNDO)
+        frame_topo.pack(fill=X, padx=10, pady=10)
+        Label(frame_topo, text="Origem:", bg=COR_FUNDO).pack(side=LEFT)
+        self.combo_origem = ttk.Combobox(frame_topo, values=list(self.CONSULTAS), state="readonly", width=15)
+        self.combo_origem.pack(side=LEFT, padx=5)
+        self.combo_origem.bind("<<ComboboxSelected>>", lambda e: self.carregar(self.combo_origem.get()))
+        self.label_total = Label(frame_topo, text="", bg=COR_FUNDO)
+        self.label_total.pack(side=LEFT, padx=10)
+        
+        frame_grade = Frame(self.janela, bg=COR_FUNDO)
+        frame_grade.pack(fill=BOTH, expand=True, padx=10, pady=(0, 10))
+        self.scrollbar = ttk.Scrollbar(frame_grade, orient=VERTICAL)
+        self.canvas = Canvas(frame_grade, bg=COR_CARD, highlightthickness=0,
+                             yscrollcommand=self._ao_rolar)
+        self.scrollbar.configure(command=self.canvas.yview)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.canvas.pack(side=LEFT, fill=BOTH, expand=True)
+        
+        self.canvas.bind("<Configure>", lambda e: self._carregar_visiveis())
+        self.canvas.bind("<Button-1>", self._ao_clicar)
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(int(-e.delta / 120) or (-1 if e.delta > 0 else 1), "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+        
+        self.carregar(origem)
+
+    def carregar(self, origem):
+        """Busca os comprovantes da origem e monta a grade, ainda sem miniaturas"""
+        self.combo_origem.set(origem)
+        sql = self.CONSULTAS[origem]
+        self.executor.executar(f"galeria_{id(self)}",
+                               lambda: obter_conexao().execute(sql).fetchall(),
+                               self._exibir_registros)
+
+    def mostrar(self):
+        self.janela.deiconify()
+        self.janela.lift()
+
+    def fechar(self):
+        self._cancelar_pedidos(list(self._pedidos))
+        self._imagens.clear()
+        self.janela.destroy()
+
+    def _exibir_registros(self, registros):
+        self._cancelar_pedidos(list(self._pedidos))
+        self._geracao += 1
+        self._registros = registros
+        self._imagens.clear()
+        self._itens_imagem = []
+        self._itens_texto = []
+        self.canvas.delete("all")
+        self.label_total.config(text=f"{len(registros)} comprovante(s)")
+        
+        for indice, (_, data, descricao, caminho) in enumerate(registros):
+            x, y = self._origem_celula(indice)
+            centro = x + self.LARGURA_CELULA / 2
+            lado = TAMANHO_MINIATURA[0]
+            self.canvas.create_rectangle(centro - lado / 2, y + 8, centro + lado / 2, y + 8 + lado,
+                                         outline="#dddddd", fill=COR_FUNDO)
+            self._itens_texto.append(self.canvas.create_text(
+                centro, y + 8 + lado / 2, text="Carregando...", fill="#888888", font=("Helvetica", 9)))
+            self._itens_imagem.append(self.canvas.create_image(centro, y + 8 + lado / 2))
+            legenda = f"{data}\n{descricao or ''}"
+            self.canvas.create_text(centro, y + lado + 12, text=legenda, anchor=N, justify=CENTER,
+                                    width=self.LARGURA_CELULA - 10, fill=COR_TEXTO, font=("Helvetica", 8))
+        
+        linhas = math.ceil(len(registros) / self.COLUNAS)
+        self.canvas.configure(scrollregion=(0, 0, self.COLUNAS * self.LARGURA_CELULA, linhas * self.ALTURA_CELULA))
+        self.canvas.yview_moveto(0)
+        self._carregar_visiveis()
+
+    def _origem_celula(self, indice):
+        linha, coluna = divmod(indice, self.COLUNAS)
+        return coluna * self.LARGURA_CELULA, linha * self.ALTURA_CELULA
+
+    def _indices_visiveis(self):
+        topo = self.canvas.canvasy(0)
+        base = self.canvas.canvasy(self.canvas.winfo_height())
+        primeira = max(int(topo // self.ALTURA_CELULA), 0)
+        ultima = int(base // self.ALTURA_CELULA)
+        fim = min((ultima + 1) * self.COLUNAS, len(self._registros))
+        return range(primeira * self.COLUNAS, fim)
+
+    def _ao_rolar(self, primeiro, ultimo):
+        """yscrollcommand do canvas: repassa à scrollbar e pede as miniaturas que ficaram visíveis"""
+        self.scrollbar.set(primeiro, ultimo)
+        self._carregar_visiveis()
+
+    def _carregar_visiveis(self):
+        visiveis = self._indices_visiveis()
+        self._cancelar_pedidos([i for i in self._pedidos if i not in visiveis])
+        
+        for indice in visiveis:
+            if indice in self._imagens:
+                self._imagens.move_to_end(indice)
+            elif indice not in self._pedidos:
+                self._pedir_miniatura(indice)
+
+    def _pedir_miniatura(self, indice):
+        caminho = self._registros[indice][3]
+        geracao = self._geracao
+        chave = f"miniatura_{id(self)}_{indice}"
+        self._pedidos[indice] = chave
+        self.executor.executar(
+            chave,
+            lambda: abrir_miniatura(caminho),
+            lambda imagem: self._exibir_miniatura(geracao, indice, imagem),
+            lambda e: self._exibir_miniatura(geracao, indice, None)
+        )
+
+    def _cancelar_pedidos(self, indices):
+        for indice in indices:
+            self.executor.cancelar(self._pedidos.pop(indice))
+
+    def _exibir_miniatura(self, geracao, indice, imagem):
+        from PIL import ImageTk
+
+        if geracao != self._geracao or not self.janela.winfo_exists():
+            return
+        self._pedidos.pop(indice, None)
+        
+        if imagem is None:
+            caminho = self._registros[indice][3]
+            extensao = os.path.splitext(caminho)[1].upper().lstrip(".")
+            texto = f"{extensao or 'Arquivo'}\n(clique para abrir)" if os.path.exists(caminho) else "Arquivo não encontrado"
+            self.canvas.itemconfigure(self._itens_texto[indice], text=texto)
+            self._imagens[indice] = None
+        else:
+            foto = ImageTk.PhotoImage(imagem, master=self.janela)
+            self.canvas.itemconfigure(self._itens_texto[indice], text="")
+            self.canvas.itemconfigure(self._itens_imagem[indice], image=foto)
+            self._imagens[indice] = foto
+        
+        # Libera as imagens vistas há mais tempo; voltam a ser pedidas (do cache em disco) se reaparecerem
+        while len(self._imagens) > self.MAX_IMAGENS_MEMORIA:
+            antigo, foto = self._imagens.popitem(last=False)
+            if foto is not None:
+                self.canvas.itemconfigure(self._itens_imagem[antigo], image="")
+                self.canvas.itemconfigure(self._itens_texto[antigo], text="Carregando...")
+
+    def _ao_clicar(self, evento):
+        x, y = self.canvas.canvasx(evento.x), self.canvas.canvasy(evento.y)
+        coluna = int(x // self.LARGURA_CELULA)
+        indice = int(y // self.ALTURA_CELULA) * self.COLUNAS + coluna
+        if coluna < self.COLUNAS and 0 <= indice < len(self._registros):
+            self.ao_abrir(self._registros[indice][3])
 
 # =============================================
 # INTERFACE PRINCIPAL
@@ -378,12 +2870,22 @@ class SistemaGestaoApp:
         
         # Configurações de estilo
         self.fonte_titulo = ("Helvetica", 14, "bold")
+        self.fonte_subtitulo = ("Helvetica", 12, "bold")
         self.fonte_normal = ("Helvetica", 11)
         self.fonte_pequena = ("Helvetica", 9)
         
         # Inicializar banco de dados
         inicializar_banco_dados()
         
+        # Consultas rodam fora da thread do Tk; relatórios, em processos separados
+        self.executor = ExecutorTarefas(self.root, ao_mudar_estado=self.atualizar_indicador_ocupado)
+        self.fila_relatorios = FilaRelatorios(self.root)
+        self._progresso_relatorios = {}
+        self.barra_progresso_relatorio = None   # criada com a tela de relatórios
+        self.galeria_comprovantes = None
+        self._registro_buscado = None   # (tela, iid) a selecionar quando a tela terminar de carregar
+        self.root.protocol("WM_DELETE_WINDOW", self.ao_fechar)
+        
         # Criar layout principal
         self.criar_cabecalho()
         self.criar_menu_lateral()
@@ -392,6 +2894,12 @@ class SistemaGestaoApp:
         # Mostrar tela inicial
         self.mostrar_tela("dashboard")
     
+    def ao_fechar(self):
+        """Encerra as tarefas em segundo plano antes de fechar a janela"""
+        self.executor.encerrar()
+        self.fila_relatorios.encerrar()
+        self.root.destroy()
+    
     def criar_cabecalho(self):
         """Cria o cabeçalho do sistema"""
         frame = Frame(self.root, bg=COR_PRIMARIA, height=70)
@@ -409,6 +2917,124 @@ class SistemaGestaoApp:
                               fg="white",
                               font=self.fonte_normal)
         self.label_data.pack(side=RIGHT, padx=20)
+        
+        self.criar_busca_global(frame)
+        
+        # Indicador de carregamento (visível enquanto houver tarefas em segundo plano)
+        self.frame_ocupado = Frame(frame, bg=COR_PRIMARIA)
+        self.label_ocupado = Label(self.frame_ocupado,
+                                 text="Carregando...",
+                                 bg=COR_PRIMARIA,
+                                 fg="white",
+                                 font=self.fonte_pequena)
+        self.label_ocupado.pack(side=LEFT)
+        Button(self.frame_ocupado,
+               text="Cancelar",
+               command=self.executor.cancelar_todas,
+               bg=COR_SECUNDARIA,
+               fg="white",
+               borderwidth=0,
+               font=self.fonte_pequena,
+               padx=8).pack(side=LEFT, padx=(8, 0))
+    
+    def criar_busca_global(self, frame):
+        """Caixa de busca do cabeçalho; os resultados aparecem numa lista logo abaixo dela"""
+        frame_busca = Frame(frame, bg=COR_PRIMARIA)
+        frame_busca.pack(side=LEFT, padx=20)
+        Label(frame_busca, text="Buscar:", bg=COR_PRIMARIA, fg="white", font=self.fonte_normal).pack(side=LEFT)
+        self.entry_busca = Entry(frame_busca, width=35, font=self.fonte_normal)
+        self.entry_busca.pack(side=LEFT, padx=5)
+        
+        self.lista_busca = Listbox(self.root, font=self.fonte_normal, height=10, activestyle="dotbox")
+        self._resultados_busca = []
+        self._busca_agendada = None
+        
+        self.entry_busca.bind("<KeyRelease>", self._agendar_busca)
+        self.entry_busca.bind("<Return>", lambda e: self._abrir_resultado_busca(0))
+        self.entry_busca.bind("<Down>", lambda e: self._focar_resultados_busca())
+        self.entry_busca.bind("<Escape>", lambda e: self._esconder_resultados_busca())
+        self.lista_busca.bind("<Return>", lambda e: self._abrir_resultado_busca(self._indice_resultado_busca()))
+        self.lista_busca.bind("<Double-Button-1>", lambda e: self._abrir_resultado_busca(self._indice_resultado_busca()))
+        self.lista_busca.bind("<Escape>", lambda e: (self._esconder_resultados_busca(), self.entry_busca.focus_set()))
+    
+    def _agendar_busca(self, evento):
+        """Consulta só depois de uma pausa na digitação"""
+        if evento.keysym in ("Return", "Escape", "Up", "Down"):
+            return
+        if self._busca_agendada is not None:
+            self.root.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.root.after(ATRASO_BUSCA_MS, self._buscar)
+    
+    def _buscar(self):
+        self._busca_agendada = None
+        texto = self.entry_busca.get().strip()
+        if len(texto) < MIN_CARACTERES_BUSCA:
+            self.executor.cancelar("busca_global")
+            self._esconder_resultados_busca()
+            return
+        self.executor.executar("busca_global", lambda: buscar_registros(texto), self._exibir_resultados_busca)
+    
+    def _exibir_resultados_busca(self, resultados):
+        self._resultados_busca = resultados
+        self.lista_busca.delete(0, END)
+        if not resultados:
+            self.lista_busca.insert(END, "Nenhum resultado")
+        for _, rotulo, _, descricao, trecho in resultados:
+            texto = f"{rotulo}: {descricao}"
+            if trecho:
+                texto += f"  —  {trecho}"
+            self.lista_busca.insert(END, texto)
+        self.lista_busca.configure(height=min(max(len(resultados), 1), 10))
+        self.lista_busca.place(in_=self.entry_busca, x=0, rely=1.0, y=2, width=520)
+        self.lista_busca.lift()
+    
+    def _esconder_resultados_busca(self):
+        self.lista_busca.place_forget()
+    
+    def _focar_resultados_busca(self):
+        if self._resultados_busca and self.lista_busca.winfo_ismapped():
+            self.lista_busca.focus_set()
+            self.lista_busca.selection_set(0)
+            self.lista_busca.activate(0)
+    
+    def _indice_resultado_busca(self):
+        selecao = self.lista_busca.curselection()
+        return selecao[0] if selecao else 0
+    
+    def _abrir_resultado_busca(self, indice):
+        """Abre a tela do registro encontrado e o seleciona na lista"""
+        if indice >= len(self._resultados_busca):
+            return
+        tela, _, registro_id, _, _ = self._resultados_busca[indice]
+        self._esconder_resultados_busca()
+        
+        if tela == "limpeza":
+            self.mostrar_tela(tela)
+            self.lista_limpezas.ir_para(registro_id)
+        else:
+            self._registro_buscado = (tela, str(registro_id))
+            self.mostrar_tela(tela)
+    
+    def _selecionar_registro_buscado(self, tela, tree):
+        """Seleciona no Treeview o registro escolhido na busca global, se ele pertencer a esta tela"""
+        if self._registro_buscado is None or self._registro_buscado[0] != tela:
+            return
+        iid = self._registro_buscado[1]
+        self._registro_buscado = None
+        if tree.exists(iid):
+            tree.selection_set(iid)
+            tree.see(iid)
+    
+    def atualizar_indicador_ocupado(self, ocupado):
+        """Mostra ou esconde o indicador de carregamento do cabeçalho"""
+        if not hasattr(self, "frame_ocupado"):
+            return
+        if ocupado:
+            self.frame_ocupado.pack(side=RIGHT, padx=10)
+            self.root.config(cursor="watch")
+        else:
+            self.frame_ocupado.pack_forget()
+            self.root.config(cursor="")
     
     def criar_menu_lateral(self):
         """Cria o menu de navegação lateral"""
@@ -443,53 +3069,41 @@ class SistemaGestaoApp:
                         pady=12)
             btn.pack(fill=X)
     
+    # Pré-visualização de relatórios: trechos inseridos por ciclo e intervalo entre ciclos
+    TRECHOS_PREVIA_POR_CICLO = 4
+    INTERVALO_PREVIA_MS = 15
+
+    # tela -> (método que constrói a tela, atributo do frame, método que carrega os dados)
+    TELAS = {
+        "dashboard": ("criar_dashboard", "frame_dashboard", "atualizar_dashboard"),
+        "clientes": ("criar_clientes", "frame_clientes", "carregar_clientes"),
+        "imoveis": ("criar_imoveis", "frame_imoveis", "carregar_imoveis"),
+        "limpeza": ("criar_limpeza", "frame_limpeza", "carregar_limpezas"),
+        "enxoval": ("criar_enxoval", "frame_enxoval", "carregar_itens_enxoval"),
+        "suprimentos": ("criar_suprimentos", "frame_suprimentos", "carregar_suprimentos"),
+        "relatorios": ("criar_relatorios", "frame_relatorios", None),
+        "config_itens": ("criar_config_itens", "frame_config_itens", None),
+        "fechar_contas": ("criar_fechamento_contas", "frame_fechamento", None),
+    }
+
     def criar_area_conteudo(self):
-        """Cria a área de conteúdo principal"""
+        """Cria a área de conteúdo principal; cada tela é construída ao ser aberta pela primeira vez"""
         self.frame_conteudo = Frame(self.root, bg=COR_FUNDO)
         self.frame_conteudo.pack(fill=BOTH, expand=True, padx=20, pady=20)
-        
-        # Criar todos os frames de conteúdo
-        self.criar_dashboard()
-        self.criar_clientes()
-        self.criar_imoveis()
-        self.criar_limpeza()
-        self.criar_enxoval()
-        self.criar_suprimentos()
-        self.criar_relatorios()
-        self.criar_config_itens()
-        self.criar_fechamento_contas()
-   
-
 
     def mostrar_tela(self, tela):
         """Controla qual tela mostrar"""
+        criar, atributo_frame, carregar = self.TELAS[tela]
+        
         for widget in self.frame_conteudo.winfo_children():
             widget.pack_forget()
         
-        if tela == "dashboard":
-            self.frame_dashboard.pack(fill=BOTH, expand=True)
-            self.atualizar_dashboard()
-        elif tela == "clientes":
-            self.frame_clientes.pack(fill=BOTH, expand=True)
-            self.carregar_clientes()
-        elif tela == "imoveis":
-            self.frame_imoveis.pack(fill=BOTH, expand=True)
-            self.carregar_imoveis()
-        elif tela == "limpeza":
-            self.frame_limpeza.pack(fill=BOTH, expand=True)
-            self.carregar_limpezas()
-        elif tela == "enxoval":
-            self.frame_enxoval.pack(fill=BOTH, expand=True)
-            self.carregar_itens_enxoval()
-        elif tela == "suprimentos":
-            self.frame_suprimentos.pack(fill=BOTH, expand=True)
-            self.carregar_suprimentos()
-        elif tela == "relatorios":
-            self.frame_relatorios.pack(fill=BOTH, expand=True)
-        elif tela == "config_itens":
-            self.frame_config_itens.pack(fill=BOTH, expand=True)
-        elif tela == "fechar_contas":
-            self.frame_fechamento.pack(fill=BOTH, expand=True)
+        if not hasattr(self, atributo_frame):
+            getattr(self, criar)()
+        
+        getattr(self, atributo_frame).pack(fill=BOTH, expand=True)
+        if carregar:
+            getattr(self, carregar)()
 
     # =============================================
     # MÓDULO DASHBOARD
@@ -513,47 +3127,31 @@ class SistemaGestaoApp:
         frame_graficos = Frame(self.frame_dashboard, bg=COR_FUNDO)
         frame_graficos.pack(fill=BOTH, expand=True)
 
-        # ============================
-        # Gráfico de Limpezas por Dia
-        # ============================
-        frame_grafico1 = Frame(frame_graficos, bg=COR_FUNDO)
-        frame_grafico1.pack(side=LEFT, fill=BOTH, expand=True, padx=5, pady=5)
-        Label(frame_grafico1, text="Limpezas por Dia", bg=COR_FUNDO, font=self.fonte_titulo).pack()
-
-        fig1 = Figure(figsize=(4, 2.5), dpi=100)
-        ax1 = fig1.add_subplot(111)
-        dias = ['Seg', 'Ter', 'Qua', 'Qui', 'Sex']
-        quantidades = [3, 5, 2, 4, 6]
-        ax1.bar(dias, quantidades, color='#4CAF50')  # verde moderno
-        ax1.set_facecolor('#FFFFFF')
-        fig1.patch.set_facecolor(COR_CARD)
-        ax1.tick_params(labelsize=8)
-        ax1.spines['top'].set_visible(False)
-        ax1.spines['right'].set_visible(False)
-
-        self.canvas_grafico1 = FigureCanvasTkAgg(fig1, master=frame_grafico1)
-        self.canvas_grafico1.draw()
-        self.canvas_grafico1.get_tk_widget().pack(fill=BOTH, expand=True)
-
-        # ==========================================
-        # Gráfico de Itens de Enxoval Mais Utilizados
-        # ==========================================
-        frame_grafico2 = Frame(frame_graficos, bg=COR_FUNDO)
-        frame_grafico2.pack(side=LEFT, fill=BOTH, expand=True, padx=5, pady=5)
-        Label(frame_grafico2, text="Itens de Enxoval Mais Utilizados", bg=COR_FUNDO, font=self.fonte_titulo).pack()
-
-        fig2 = Figure(figsize=(4, 2.5), dpi=100)
-        ax2 = fig2.add_subplot(111)
-        itens = ['Toalhas', 'Lençóis', 'Fronhas', 'Cobertores']
-        usos = [40, 30, 20, 10]
-        cores = ['#2196F3', '#FFC107', '#FF5722', '#9C27B0']
-        ax2.pie(usos, labels=itens, autopct='%1.1f%%', colors=cores, startangle=140)
-        fig2.patch.set_facecolor(COR_CARD)
-
-        self.canvas_grafico2 = FigureCanvasTkAgg(fig2, master=frame_grafico2)
-        self.canvas_grafico2.draw()
-        self.canvas_grafico2.get_tk_widget().pack(fill=BOTH, expand=True)
-
+        # Os canvas do matplotlib só são criados quando chegam os primeiros dados
+        self.frame_grafico1 = Frame(frame_graficos, bg=COR_FUNDO)
+        self.frame_grafico1.pack(side=LEFT, fill=BOTH, expand=True, padx=5, pady=5)
+        Label(self.frame_grafico1, text="Limpezas por Dia", bg=COR_FUNDO, font=self.fonte_titulo).pack()
+        self.canvas_grafico1 = None
+
+        self.frame_grafico2 = Frame(frame_graficos, bg=COR_FUNDO)
+        self.frame_grafico2.pack(side=LEFT, fill=BOTH, expand=True, padx=5, pady=5)
+        Label(self.frame_grafico2, text="Itens de Enxoval Mais Utilizados", bg=COR_FUNDO, font=self.fonte_titulo).pack()
+        self.canvas_grafico2 = None
+        
+        # Versão do banco refletida nos cards e gráficos (ver atualizar_dashboard)
+        self._versao_dashboard = None
+
+    def _obter_canvas_grafico(self, atributo, frame):
+        """Devolve o canvas matplotlib de um gráfico do dashboard, criando-o no primeiro uso"""
+        canvas = getattr(self, atributo)
+        if canvas is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            
+            canvas = FigureCanvasTkAgg(Figure(figsize=(4, 2.5), dpi=100), master=frame)
+            canvas.get_tk_widget().pack(fill=BOTH, expand=True)
+            setattr(self, atributo, canvas)
+        return canvas
     
     def criar_card(self, parent, titulo, valor, cor):
         """Cria um card de resumo para o dashboard"""
@@ -570,76 +3168,51 @@ class SistemaGestaoApp:
         
         return label_valor
     
-    def atualizar_dashboard(self):
-        """Atualiza os dados do dashboard"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
+    def atualizar_dashboard(self, forcar=False):
+        """Atualiza os dados do dashboard em segundo plano, se o banco mudou desde a última exibição"""
+        # As janelas do resumo são relativas ao dia atual, então a virada do dia também invalida
+        versao = (versao_do_banco(), date.today())
+        if not forcar and versao == self._versao_dashboard:
+            return  # cards e gráficos exibidos continuam válidos
         
+        def exibir(resumo):
+            self._exibir_dashboard(resumo)
+            self._versao_dashboard = versao
+        
+        self.executor.executar("dashboard", self._consultar_dashboard, exibir)
+
+    def _consultar_dashboard(self):
+        """Consulta o resumo do dashboard (executado fora da thread do Tk)"""
+        # O primeiro import do matplotlib é lento; feito aqui, não trava a thread do Tk
+        import matplotlib.backends.backend_tkagg
+        
+        return consultar_dashboard()
+
+    def _exibir_dashboard(self, resumo):
+        """Preenche os cards e os gráficos a partir do DashboardSnapshot"""
         # Limpezas esta semana
-        cursor.execute("""
-            SELECT COUNT(*), SUM(valor_total) 
-            FROM limpezas 
-            WHERE date(data) >= date('now', '-7 days')
-        """)
-        limpezas = cursor.fetchone()
-        self.card_limpezas.config(text=f"{limpezas[0]}\n{formatar_moeda(limpezas[1] or 0)}")
+        self.card_limpezas.config(text=f"{resumo.limpezas[0]}\n{formatar_moeda(resumo.limpezas[1])}")
         
         # Enxoval utilizado
-        cursor.execute("""
-            SELECT COUNT(*), SUM(t.preco_unitario * c.quantidade)
-            FROM consumo_enxoval c
-            JOIN tipos_enxoval t ON c.item_id = t.id
-            WHERE date(c.data) >= date('now', '-7 days')
-        """)
-        enxoval = cursor.fetchone()
-        self.card_enxoval.config(text=f"{enxoval[0]}\n{formatar_moeda(enxoval[1] or 0)}")
+        self.card_enxoval.config(text=f"{resumo.enxoval[0]}\n{formatar_moeda(resumo.enxoval[1])}")
         
         # Suprimentos repostos
-        cursor.execute("""
-            SELECT COUNT(*), SUM(valor_gasto)
-            FROM reposicao_suprimentos
-            WHERE date(data) >= date('now', '-7 days')
-        """)
-        suprimentos = cursor.fetchone()
-        self.card_suprimentos.config(text=f"{suprimentos[0]}\n{formatar_moeda(suprimentos[1] or 0)}")
+        self.card_suprimentos.config(text=f"{resumo.suprimentos[0]}\n{formatar_moeda(resumo.suprimentos[1])}")
         
         # Total a receber
-        total = (limpezas[1] or 0) + (enxoval[1] or 0) + (50.0 * cursor.execute("SELECT COUNT(DISTINCT imovel_id) FROM limpezas WHERE date(data) >= date('now', '-7 days')").fetchone()[0])
-        self.card_receber.config(text=formatar_moeda(total))
+        self.card_receber.config(text=formatar_moeda(resumo.total_a_receber))
         
         # Gerar gráficos
-        self.gerar_grafico_limpezas()
-        self.gerar_grafico_enxoval()
-        
-        conn.close()
-    def gerar_grafico_limpezas(self):
-        """Atualiza o gráfico de limpezas diretamente no canvas"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT date(data), COUNT(*)
-            FROM limpezas
-            WHERE date(data) >= date('now', '-30 days')
-            GROUP BY date(data)
-            ORDER BY date(data)
-        """)
+        self.gerar_grafico_limpezas(resumo.serie_limpezas)
+        self.gerar_grafico_enxoval(resumo.enxoval_por_item)
 
-        datas = []
-        quantidades = []
-
-        for row in cursor.fetchall():
-            datas.append(row[0][5:])  # Mostrar apenas dia/mês
-            quantidades.append(row[1])
-
-        # Limpar gráfico anterior
-        fig = self.canvas_grafico1.figure
-        fig.clear()
+    def _criar_grafico_limpezas(self):
+        """Cria o eixo e os artistas do gráfico de limpezas, reaproveitados a cada atualização"""
+        canvas = self._obter_canvas_grafico('canvas_grafico1', self.frame_grafico1)
+        fig = canvas.figure
         ax = fig.add_subplot(111)
 
         # Gráfico moderno
-        ax.plot(datas, quantidades, marker='o', linestyle='-', color=COR_DESTAQUE, linewidth=2)
-        ax.fill_between(datas, quantidades, color=COR_DESTAQUE, alpha=0.2)
         ax.set_title('Limpezas nos Últimos 30 Dias', fontsize=10)
         ax.set_ylabel('Quantidade')
         ax.tick_params(axis='x', rotation=45, labelsize=8)
@@ -647,50 +3220,85 @@ class SistemaGestaoApp:
         ax.set_facecolor("#FFFFFF")
         ax.grid(True, linestyle="--", alpha=0.3)
 
-        self.canvas_grafico1.draw()
-        conn.close()
-
-    
-    def gerar_grafico_enxoval(self):
-        """Atualiza o gráfico de enxoval diretamente no canvas"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT t.nome, SUM(c.quantidade)
-            FROM consumo_enxoval c
-            JOIN tipos_enxoval t ON c.item_id = t.id
-            WHERE date(c.data) >= date('now', '-30 days')
-            GROUP BY t.nome
-            ORDER BY SUM(c.quantidade) DESC
-            LIMIT 5
-        """)
-
-        itens = []
-        quantidades = []
-
-        for row in cursor.fetchall():
-            itens.append(row[0])
-            quantidades.append(row[1])
-
-        fig = self.canvas_grafico2.figure
-        fig.clear()
+        self.ax_limpezas = ax
+        self.linha_limpezas, = ax.plot([], [], marker='o', linestyle='-', color=COR_DESTAQUE, linewidth=2)
+        self.area_limpezas = ax.fill_between([0, 1], [0, 0], color=COR_DESTAQUE, alpha=0.2)
+        self.blit_limpezas = GerenciadorBlit(canvas, (self.linha_limpezas, self.area_limpezas))
+        self._eixo_limpezas = None  # (rótulos, teto) já desenhados no fundo
+
+    def gerar_grafico_limpezas(self, serie_limpezas):
+        """Atualiza os dados do gráfico de limpezas sem recriar o eixo"""
+        if self.canvas_grafico1 is None:
+            self._criar_grafico_limpezas()
+        
+        rotulos = tuple(dia[5:] for dia, _ in serie_limpezas)  # Mostrar apenas mês-dia
+        quantidades = [quantidade for _, quantidade in serie_limpezas]
+        posicoes = range(len(quantidades))
+
+        self.linha_limpezas.set_data(posicoes, quantidades)
+        self.area_limpezas.set_verts([[(0, 0), *zip(posicoes, quantidades), (len(quantidades) - 1, 0)]])
+
+        # Eixos e rótulos fazem parte do fundo; só mudam quando muda o dia ou a escala
+        eixo = (rotulos, teto_do_eixo(max(quantidades, default=0)))
+        mudou_eixo = eixo != self._eixo_limpezas
+        if mudou_eixo:
+            ax = self.ax_limpezas
+            ax.set_xlim(-0.5, len(rotulos) - 0.5)
+            ax.set_ylim(0, eixo[1])
+            ax.set_xticks(posicoes[::5])
+            ax.set_xticklabels(rotulos[::5])
+            self._eixo_limpezas = eixo
+
+        self.blit_limpezas.atualizar(redesenhar_fundo=mudou_eixo)
+
+    def _criar_grafico_enxoval(self):
+        """Cria o eixo, as barras e os rótulos do gráfico de enxoval, reaproveitados a cada atualização"""
+        canvas = self._obter_canvas_grafico('canvas_grafico2', self.frame_grafico2)
+        fig = canvas.figure
         ax = fig.add_subplot(111)
 
         # Gráfico de barras horizontal moderno
-        bars = ax.barh(itens, quantidades, color=COR_SECUNDARIA)
         ax.set_title('Itens Mais Utilizados', fontsize=10)
         ax.set_xlabel('Quantidade')
         fig.patch.set_facecolor(COR_CARD)
         ax.set_facecolor("#FFFFFF")
         ax.grid(True, axis='x', linestyle="--", alpha=0.3)
-        ax.bar_label(bars, fmt='%d', label_type='edge', padding=3)
 
-        self.canvas_grafico2.draw()
-        conn.close()
+        posicoes = range(TOP_ITENS_ENXOVAL)
+        self.ax_enxoval = ax
+        self.barras_enxoval = list(ax.barh(posicoes, [0] * TOP_ITENS_ENXOVAL, color=COR_SECUNDARIA))
+        self.rotulos_enxoval = [ax.text(0, i, '', va='center', fontsize=8) for i in posicoes]
+        ax.set_yticks(posicoes)
+        ax.invert_yaxis()  # item mais usado no topo
+        self.blit_enxoval = GerenciadorBlit(canvas, self.barras_enxoval + self.rotulos_enxoval)
+        self._eixo_enxoval = None  # (nomes, teto) já desenhados no fundo
+
+    def gerar_grafico_enxoval(self, enxoval_por_item):
+        """Atualiza largura e rótulo das barras de enxoval sem recriar o eixo"""
+        if self.canvas_grafico2 is None:
+            self._criar_grafico_enxoval()
+
+        vazios = TOP_ITENS_ENXOVAL - len(enxoval_por_item)
+        nomes = tuple(nome for nome, _ in enxoval_por_item) + ('',) * vazios
+        quantidades = [quantidade for _, quantidade in enxoval_por_item] + [0] * vazios
+        teto = teto_do_eixo(max(quantidades, default=0))
+
+        for barra, rotulo, quantidade in zip(self.barras_enxoval, self.rotulos_enxoval, quantidades):
+            barra.set_width(quantidade)
+            rotulo.set_x(quantidade + teto * 0.01)
+            rotulo.set_text(f"{quantidade:.0f}" if quantidade else '')
+
+        eixo = (nomes, teto)
+        mudou_eixo = eixo != self._eixo_enxoval
+        if mudou_eixo:
+            self.ax_enxoval.set_yticklabels(nomes)
+            self.ax_enxoval.set_xlim(0, teto)
+            self._eixo_enxoval = eixo
+
+        self.blit_enxoval.atualizar(redesenhar_fundo=mudou_eixo)
 
     def exibir_imagem_no_canvas(self, caminho_imagem, canvas):
-        from PIL import Image, ImageTk
+        from PIL import ImageTk
 
         # Acesse o widget Tkinter real dentro do FigureCanvasTkAgg
         tk_widget = canvas.get_tk_widget()
@@ -705,18 +3313,23 @@ class SistemaGestaoApp:
             self.frame_dashboard.after(100, lambda: self.exibir_imagem_no_canvas(caminho_imagem, canvas))
             return
 
-        # Carrega e redimensiona a imagem
-        img = Image.open(caminho_imagem)
-        img = img.resize((largura, altura), Image.LANCZOS)
-        img_tk = ImageTk.PhotoImage(img)
-
-        # Armazena referência da imagem para evitar garbage collection
-        canvas._img_ref = img_tk
-
-        # Adiciona a imagem ao canvas
-        canvas_widget = tk_widget
-        label = Label(canvas_widget, image=img_tk, bg=COR_CARD)
-        label.place(relx=0.5, rely=0.5, anchor='center')
+        def exibir(img):
+            if img is None:
+                return
+            img_tk = ImageTk.PhotoImage(img)
+            # Armazena referência da imagem para evitar garbage collection
+            canvas._img_ref = img_tk
+            # Um único Label por canvas, reaproveitado a cada nova imagem
+            label = getattr(canvas, "_label_imagem", None)
+            if label is None:
+                label = canvas._label_imagem = Label(tk_widget, bg=COR_CARD)
+                label.place(relx=0.5, rely=0.5, anchor='center')
+            label.configure(image=img_tk)
+
+        # Redução feita (e guardada em cache) fora da thread do Tk, sem decodificar a resolução completa
+        self.executor.executar(f"imagem_{id(canvas)}",
+                               lambda: abrir_miniatura(caminho_imagem, (largura, altura)),
+                               exibir)
 
     
     # =============================================
@@ -743,6 +3356,7 @@ class SistemaGestaoApp:
         )
         self.tree_clientes.pack(fill=BOTH, expand=True)
         scrollbar.config(command=self.tree_clientes.yview)
+        self.sinc_clientes = SincronizadorTreeview(self.tree_clientes)
 
         self.tree_clientes.heading('nome', text='Nome')
         self.tree_clientes.heading('telefone', text='Telefone')
@@ -830,20 +3444,18 @@ class SistemaGestaoApp:
 
     
     def carregar_clientes(self):
-        """Carrega os clientes no TreeView"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, nome, telefone, email FROM clientes")
-        
-        # Limpar treeview
-        for item in self.tree_clientes.get_children():
-            self.tree_clientes.delete(item)
-        
-        # Adicionar novos itens
-        for row in cursor.fetchall():
-            self.tree_clientes.insert('', 'end', values=row)
-        
-        conn.close()
+        """Carrega os clientes no TreeView em segundo plano"""
+        self.executor.executar("clientes", self._consultar_clientes, self._exibir_clientes)
+
+    def _consultar_clientes(self):
+        """Lista os clientes dos dados de referência (executado fora da thread do Tk)"""
+        clientes = dados_referencia.catalogo("clientes").por_id.values()
+        return [(c.id, c.nome, c.telefone, c.email) for c in clientes]
+
+    def _exibir_clientes(self, clientes):
+        """Preenche o TreeView de clientes"""
+        self.sinc_clientes.aplicar(clientes)
+        self._selecionar_registro_buscado("clientes", self.tree_clientes)
     
     def adicionar_cliente(self):
         """Adiciona um novo cliente ao banco de dados"""
@@ -853,14 +3465,12 @@ class SistemaGestaoApp:
         endereco = self.entry_cliente_endereco.get()
         
         if nome:
-            conn = sqlite3.connect("sistema.db")
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO clientes (nome, telefone, email, endereco)
-                VALUES (?, ?, ?, ?)
-            """, (nome, telefone, email, endereco))
-            conn.commit()
-            conn.close()
+            with transacao() as cursor:
+                cursor.execute("""
+                    INSERT INTO clientes (nome, telefone, email, endereco)
+                    VALUES (?, ?, ?, ?)
+                """, (nome, telefone, email, endereco))
+            dados_referencia.invalidar("clientes")
             
             messagebox.showinfo("Sucesso", "Cliente cadastrado com sucesso!")
             self.carregar_clientes()
@@ -898,6 +3508,7 @@ class SistemaGestaoApp:
         )
         self.tree_imoveis.pack(fill=BOTH, expand=True)
         scrollbar.config(command=self.tree_imoveis.yview)
+        self.sinc_imoveis = SincronizadorTreeview(self.tree_imoveis)
 
         # Esconder a coluna 'id' que usaremos apenas para referência
         self.tree_imoveis.column('id', width=0, stretch=NO)
@@ -942,7 +3553,7 @@ class SistemaGestaoApp:
         # Cliente (Combobox)
         Label(form_grid, text="Cliente:", bg=COR_CARD, anchor="w", font=self.fonte_pequena).grid(
             row=0, column=0, sticky='w', padx=5, pady=5)
-        self.combo_cliente_imovel = ttk.Combobox(form_grid, font=self.fonte_pequena)
+        self.combo_cliente_imovel = SeletorRegistro(form_grid, self.executor, "clientes", font=self.fonte_pequena)
         self.combo_cliente_imovel.grid(row=0, column=1, sticky='ew', padx=5, pady=5)
 
         # Endereço
@@ -1007,20 +3618,21 @@ class SistemaGestaoApp:
 
     def adicionar_imovel(self):
         """Adiciona um imóvel ao banco de dados e atualiza a Treeview"""
-        cliente = self.combo_cliente_imovel.get().strip()
+        cliente_id = self.combo_cliente_imovel.selecionado.get()
         endereco = self.entry_imovel_endereco.get().strip()
         quartos = self.entry_imovel_quartos.get().strip()
         banheiros = self.entry_imovel_banheiros.get().strip()
         plataforma = self.entry_imovel_plataforma.get().strip()
 
         # Validação simples
-        if not (cliente and endereco and quartos and banheiros and plataforma):
+        if not (endereco and quartos and banheiros and plataforma):
             messagebox.showwarning("Campos obrigatórios", "Por favor, preencha todos os campos.")
             return
+        if not cliente_id:
+            messagebox.showwarning("Campos obrigatórios", "Selecione o cliente na lista de sugestões.")
+            return
 
         try:
-            # Extrai o ID do cliente do combobox (formato "ID - Nome")
-            cliente_id = int(cliente.split(' - ')[0])
             quartos = int(quartos)
             banheiros = int(banheiros)
         except (ValueError, IndexError):
@@ -1028,20 +3640,16 @@ class SistemaGestaoApp:
             return
 
         # Inserir no banco de dados
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute("""
-                INSERT INTO imoveis 
-                (cliente_id, endereco, quartos, banheiros, plataforma)
-                VALUES (?, ?, ?, ?, ?)
-            """, (cliente_id, endereco, quartos, banheiros, plataforma))
-            conn.commit()
+            with transacao() as cursor:
+                cursor.execute("""
+                    INSERT INTO imoveis 
+                    (cliente_id, endereco, quartos, banheiros, plataforma)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (cliente_id, endereco, quartos, banheiros, plataforma))
+            dados_referencia.invalidar("imoveis")
         except sqlite3.Error as e:
             messagebox.showerror("Erro no banco de dados", f"Não foi possível salvar o imóvel:\n{str(e)}")
-        finally:
-            conn.close()
 
         # Recarregar a lista de imóveis
         self.carregar_imoveis()
@@ -1052,43 +3660,25 @@ class SistemaGestaoApp:
         messagebox.showinfo("Sucesso", "Imóvel cadastrado com sucesso!")
 
     def carregar_imoveis(self):
-        """Carrega os imóveis no TreeView e atualiza o combobox de clientes"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
-        # Verifica se a coluna plataforma existe e a adiciona se necessário
-        cursor.execute("PRAGMA table_info(imoveis)")
-        colunas = [col[1] for col in cursor.fetchall()]
-        if 'plataforma' not in colunas:
-            cursor.execute("ALTER TABLE imoveis ADD COLUMN plataforma TEXT")
-            conn.commit()
-        
-        # Restante do código permanece o mesmo...
-        cursor.execute("SELECT id, nome FROM clientes")
-        clientes = cursor.fetchall()
-        self.combo_cliente_imovel['values'] = [f"{c[0]} - {c[1]}" for c in clientes]
-        
-        if clientes:
-            self.combo_cliente_imovel.current(0)
-        
-        cursor.execute("""
-            SELECT i.id, c.nome, i.endereco, i.quartos, i.banheiros, 
-                COALESCE(i.plataforma, '') as plataforma
-            FROM imoveis i
-            JOIN clientes c ON i.cliente_id = c.id
-        """)
-        
-        for item in self.tree_imoveis.get_children():
-            self.tree_imoveis.delete(item)
-        
-        for row in cursor.fetchall():
-            self.tree_imoveis.insert('', 'end', values=row)
-        
-        conn.close()
+        """Carrega os imóveis no TreeView e as sugestões de clientes em segundo plano"""
+        self.executor.executar("imoveis", self._consultar_imoveis, self._exibir_imoveis)
+        self.combo_cliente_imovel.atualizar()
+
+    def _consultar_imoveis(self):
+        """Lista os imóveis com o nome do cliente, dos dados de referência (executado fora da thread do Tk)"""
+        clientes = dados_referencia.catalogo("clientes").por_id
+        imoveis = dados_referencia.catalogo("imoveis").por_id.values()
+        return [(i.id, clientes[i.cliente_id].nome, i.endereco, i.quartos, i.banheiros, i.plataforma)
+                for i in imoveis if i.cliente_id in clientes]
+
+    def _exibir_imoveis(self, imoveis):
+        """Preenche o TreeView de imóveis"""
+        self.sinc_imoveis.aplicar(imoveis)
+        self._selecionar_registro_buscado("imoveis", self.tree_imoveis)
 
     def limpar_form_imovel(self):
             """Limpa o formulário de imóveis"""
-            self.combo_cliente_imovel.set('')  # Limpa o combobox
+            self.combo_cliente_imovel.limpar()
             self.entry_imovel_endereco.delete(0, END)
             self.entry_imovel_quartos.delete(0, END)
             self.entry_imovel_banheiros.delete(0, END)
@@ -1136,40 +3726,36 @@ class SistemaGestaoApp:
         frame_botoes = Frame(frame_principal)
         frame_botoes.grid(row=4, column=0, columnspan=2, pady=10)
     
-   
-    # Função para salvar as alterações
-    def salvar_edicao():
-        # Validação dos campos
-        if not (var_endereco.get() and var_quartos.get() and var_banheiros.get() and var_plataforma.get()):
-            messagebox.showwarning("Campos obrigatórios", "Preencha todos os campos!")
-            return
-        
-        try:
-            quartos = int(var_quartos.get())
-            banheiros = int(var_banheiros.get())
-        except ValueError:
-            messagebox.showerror("Erro", "Quartos e banheiros devem ser números!")
-            return
-        
-        # Atualizar no banco de dados
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        try:
-            cursor.execute("""
-                UPDATE imoveis 
-                SET endereco=?, quartos=?, banheiros=?, plataforma=?
-                WHERE id=?
-            """, (var_endereco.get(), quartos, banheiros, var_plataforma.get(), dados[0]))
-            conn.commit()
-            messagebox.showinfo("Sucesso", "Imóvel atualizado com sucesso!")
+        # Função para salvar as alterações
+        def salvar_edicao():
+            # Validação dos campos
+            if not (var_endereco.get() and var_quartos.get() and var_banheiros.get() and var_plataforma.get()):
+                messagebox.showwarning("Campos obrigatórios", "Preencha todos os campos!")
+                return
             
-            # Atualizar a Treeview
-            self.carregar_imoveis()
-            janela_edicao.destroy()
-        except sqlite3.Error as e:
-            messagebox.showerror("Erro", f"Não foi possível atualizar:\n{str(e)}")
-        finally:
-            conn.close()
+            try:
+                quartos = int(var_quartos.get())
+                banheiros = int(var_banheiros.get())
+            except ValueError:
+                messagebox.showerror("Erro", "Quartos e banheiros devem ser números!")
+                return
+            
+            # Atualizar no banco de dados
+            try:
+                with transacao() as cursor:
+                    cursor.execute("""
+                        UPDATE imoveis 
+                        SET endereco=?, quartos=?, banheiros=?, plataforma=?
+                        WHERE id=?
+                    """, (var_endereco.get(), quartos, banheiros, var_plataforma.get(), dados[0]))
+                dados_referencia.invalidar("imoveis")
+                messagebox.showinfo("Sucesso", "Imóvel atualizado com sucesso!")
+                
+                # Atualizar a Treeview
+                self.carregar_imoveis()
+                janela_edicao.destroy()
+            except sqlite3.Error as e:
+                messagebox.showerror("Erro", f"Não foi possível atualizar:\n{str(e)}")
     
         # Botões
         Button(frame_botoes, text="Salvar", command=salvar_edicao, width=10).pack(side=LEFT, padx=5)
@@ -1180,6 +3766,8 @@ class SistemaGestaoApp:
     
     def criar_limpeza(self):
         """Cria a interface para gestão de limpezas"""
+        from tkcalendar import DateEntry
+
         self.frame_limpeza = Frame(self.frame_conteudo, bg=COR_FUNDO)
         
         # Treeview para listar limpezas
@@ -1195,6 +3783,18 @@ class SistemaGestaoApp:
         self.tree_limpezas.pack(fill=BOTH, expand=True)
         scrollbar.config(command=self.tree_limpezas.yview)
         
+        self.lista_limpezas = ListaPaginada(
+            self.tree_limpezas, scrollbar, self.executor, "limpezas_lista",
+            """
+                SELECT l.id, i.endereco, l.data, l.horas_trabalhadas, l.valor_hora_centavos, l.valor_total_centavos
+                FROM limpezas l
+                JOIN imoveis i ON l.imovel_id = i.id
+            """,
+            "data", "id", 2,
+            lambda row: (row[0], row[1], row[2], f"{row[3]:.2f}h",
+                         formatar_moeda(row[4]), formatar_moeda(row[5]))
+        )
+        
         self.tree_limpezas.heading('#0', text='ID')
         self.tree_limpezas.heading('#1', text='Imóvel')
         self.tree_limpezas.heading('#2', text='Data')
@@ -1215,7 +3815,7 @@ class SistemaGestaoApp:
         
         # Grid para organização dos campos
         rows = [
-            ("Imóvel:", ttk.Combobox(frame_form)),
+            ("Imóvel:", SeletorRegistro(frame_form, self.executor, "imoveis")),
             ("Data:", DateEntry(frame_form, date_pattern='dd/mm/yyyy')),
             ("Hora Início:", Entry(frame_form)),
             ("Hora Fim:", Entry(frame_form)),
@@ -1232,7 +3832,7 @@ class SistemaGestaoApp:
         self.entry_limpeza_observacoes = rows[5][1]
         
         # Configurar valor padrão para hora
-        self.entry_limpeza_valor_hora.insert(0, "30.00")
+        self.entry_limpeza_valor_hora.insert(0, "30,00")
         
         # Posicionar widgets usando grid
         for i, (label_text, widget) in enumerate(rows, start=1):
@@ -1272,44 +3872,9 @@ class SistemaGestaoApp:
             child.grid_configure(padx=5, pady=2)
             
     def carregar_limpezas(self):
-        """Carrega as limpezas no TreeView e atualiza o combobox de imóveis"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
-        # Carregar imóveis no combobox
-        cursor.execute("SELECT id, endereco FROM imoveis")
-        imoveis = cursor.fetchall()
-        self.combo_imovel_limpeza['values'] = [f"{i[0]} - {i[1]}" for i in imoveis]
-        
-        if imoveis:
-            self.combo_imovel_limpeza.current(0)
-        
-        # Carregar limpezas no treeview
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS imoveis (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        cliente_id INTEGER,
-        endereco TEXT NOT NULL,
-        quartos INTEGER,
-        banheiros INTEGER,
-        FOREIGN KEY (cliente_id) REFERENCES clientes (id)
-    );
-    """)
-        
-        # Limpar treeview
-        for item in self.tree_limpezas.get_children():
-            self.tree_limpezas.delete(item)
-        
-        # Adicionar novos itens formatados
-        for row in cursor.fetchall():
-            self.tree_limpezas.insert('', 'end', values=(
-                row[0], row[1], row[2], 
-                f"{row[3]:.2f}h", 
-                formatar_moeda(row[4]), 
-                formatar_moeda(row[5])
-            ))
-        
-        conn.close()
+        """Carrega as sugestões de imóveis e a primeira página de limpezas em segundo plano"""
+        self.combo_imovel_limpeza.atualizar()
+        self.lista_limpezas.recarregar()
     
     def calcular_limpeza(self):
         """Calcula o valor da limpeza com base nas horas trabalhadas"""
@@ -1319,7 +3884,7 @@ class SistemaGestaoApp:
         
         try:
             horas = calcular_horas(hora_inicio, hora_fim)
-            valor = horas * float(valor_hora)
+            valor = multiplicar_centavos(horas, ler_centavos(valor_hora))
             messagebox.showinfo("Cálculo", 
                               f"Horas trabalhadas: {horas:.2f}h\n"
                               f"Valor total: {formatar_moeda(valor)}")
@@ -1328,7 +3893,7 @@ class SistemaGestaoApp:
     
     def adicionar_limpeza(self):
         """Adiciona uma nova limpeza ao banco de dados"""
-        imovel_id = self.combo_imovel_limpeza.get().split(" - ")[0]
+        imovel_id = self.combo_imovel_limpeza.selecionado.get()
         data = self.entry_limpeza_data.get_date()
         hora_inicio = self.entry_limpeza_hora_inicio.get()
         hora_fim = self.entry_limpeza_hora_fim.get()
@@ -1338,20 +3903,19 @@ class SistemaGestaoApp:
         if imovel_id and data and hora_inicio and hora_fim and valor_hora:
             try:
                 horas = calcular_horas(hora_inicio, hora_fim)
-                valor_total = horas * float(valor_hora)
+                valor_hora = ler_centavos(valor_hora)
+                valor_total = multiplicar_centavos(horas, valor_hora)
                 
-                conn = sqlite3.connect("sistema.db")
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO limpezas 
-                    (imovel_id, data, hora_inicio, hora_fim, horas_trabalhadas, valor_hora, valor_total, observacoes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (imovel_id, data, hora_inicio, hora_fim, horas, float(valor_hora), valor_total, observacoes))
-                conn.commit()
-                conn.close()
+                with transacao() as cursor:
+                    cursor.execute("""
+                        INSERT INTO limpezas 
+                        (imovel_id, data, hora_inicio, hora_fim, horas_trabalhadas,
+                         valor_hora_centavos, valor_total_centavos, observacoes)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (imovel_id, data.isoformat(), hora_inicio, hora_fim, horas, valor_hora, valor_total, observacoes))
                 
                 messagebox.showinfo("Sucesso", "Limpeza registrada com sucesso!")
-                self.carregar_limpezas()
+                self.lista_limpezas.atualizar()
                 self.limpar_form_limpeza()
             except ValueError:
                 messagebox.showerror("Erro", "Valor por hora deve ser numérico")
@@ -1370,6 +3934,8 @@ class SistemaGestaoApp:
     
     def criar_enxoval(self):
         """Cria a interface para gestão de enxoval com layout profissional"""
+        from tkcalendar import DateEntry
+
         self.frame_enxoval = Frame(self.frame_conteudo, bg=COR_FUNDO)
         
         # Container principal com grid layout
@@ -1406,6 +3972,20 @@ class SistemaGestaoApp:
         scroll_y.config(command=self.tree_enxoval.yview)
         scroll_x.config(command=self.tree_enxoval.xview)
         
+        self.lista_enxoval = ListaPaginada(
+            self.tree_enxoval, scroll_y, self.executor, "enxoval_lista",
+            """
+                SELECT c.id, i.endereco, t.nome, c.quantidade, c.data, t.preco_unitario_centavos,
+                    (c.quantidade * t.preco_unitario_centavos) as valor_total
+                FROM consumo_enxoval c
+                JOIN imoveis i ON c.imovel_id = i.id
+                JOIN tipos_enxoval t ON c.item_id = t.id
+            """,
+            "data", "id", 4,
+            lambda row: (row[0], row[1], row[2], row[3], row[4],
+                         formatar_moeda(row[5]), formatar_moeda(row[6]))
+        )
+        
         # Configuração das colunas
         colunas = [
             ('ID', 50, 'center'),
@@ -1438,15 +4018,18 @@ class SistemaGestaoApp:
         
         # Campos do formulário com grid layout
         campos = [
-            ('Imóvel:', self.combo_imovel_enxoval, ttk.Combobox(form_card)),
-            ('Item:', self.combo_item_enxoval, ttk.Combobox(form_card)),
-            ('Quantidade:', self.entry_enxoval_quantidade, Entry(form_card)),
-            ('Data:', self.entry_enxoval_data, DateEntry(form_card, date_pattern='dd/mm/yyyy'))
+            ('Imóvel:', 'combo_imovel_enxoval',
+             SeletorRegistro(form_card, self.executor, "imoveis")),
+            ('Item:', 'combo_item_enxoval',
+             SeletorRegistro(form_card, self.executor, "tipos_enxoval",
+                             lambda item: f"{item.nome} ({formatar_moeda(item.preco_unitario_centavos)})")),
+            ('Quantidade:', 'entry_enxoval_quantidade', Entry(form_card)),
+            ('Data:', 'entry_enxoval_data', DateEntry(form_card, date_pattern='dd/mm/yyyy'))
         ]
         
         for row, (label_text, var, widget) in enumerate(campos, start=1):
             # Atribui o widget à variável de instância
-            setattr(self, var if isinstance(var, str) else var.widget, widget)
+            setattr(self, var, widget)
             
             Label(form_card, text=label_text, bg=COR_CARD).grid(
                 row=row, column=0, padx=5, pady=5, sticky="w")
@@ -1468,52 +4051,36 @@ class SistemaGestaoApp:
         container.grid_columnconfigure(1, weight=4)  # 40% para formulário
         container.grid_rowconfigure(0, weight=1)
         
-        # Carregar dados iniciais
-        self.carregar_itens_enxoval()
-
 # Os métodos adicionar_consumo_enxoval, carregar_itens_enxoval e limpar_form_enxoval permanecem os mesmos
 
     def adicionar_consumo_enxoval(self):
             """Adiciona um novo consumo de enxoval ao banco de dados"""
             try:
-                imovel = self.combo_imovel_enxoval.get()
-                item = self.combo_item_enxoval.get()
+                imovel_id = self.combo_imovel_enxoval.selecionado.get()
+                item_id = self.combo_item_enxoval.selecionado.get()
                 quantidade = self.entry_enxoval_quantidade.get()
                 data = self.entry_enxoval_data.get_date()
                 
-                if not all([imovel, item, quantidade, data]):
+                if not all([imovel_id, item_id, quantidade, data]):
                     messagebox.showerror("Erro", "Preencha todos os campos obrigatórios!")
                     return
                     
-                imovel_id = imovel.split(" - ")[0]
-                item_id = item.split(" - ")[0]
                 quantidade = int(quantidade)
                 
-                conn = sqlite3.connect("sistema.db")
-                cursor = conn.cursor()
-                
                 # Verificar se o item existe
-                cursor.execute("SELECT preco_unitario FROM tipos_enxoval WHERE id=?", (item_id,))
-                resultado = cursor.fetchone()
-                
-                if not resultado:
+                if item_id not in dados_referencia.catalogo("tipos_enxoval").por_id:
                     messagebox.showerror("Erro", "Item selecionado não encontrado!")
                     return
-                    
-                preco_unitario = resultado[0]
-                valor_total = quantidade * preco_unitario
-                
-                cursor.execute("""
-                    INSERT INTO consumo_enxoval 
-                    (imovel_id, item_id, quantidade, data)
-                    VALUES (?, ?, ?, ?)
-                """, (imovel_id, item_id, quantidade, data))
                 
-                conn.commit()
-                conn.close()
+                with transacao() as cursor:
+                    cursor.execute("""
+                        INSERT INTO consumo_enxoval 
+                        (imovel_id, item_id, quantidade, data)
+                        VALUES (?, ?, ?, ?)
+                    """, (imovel_id, item_id, quantidade, data.isoformat()))
                 
                 messagebox.showinfo("Sucesso", "Consumo de enxoval registrado com sucesso!")
-                self.carregar_itens_enxoval()
+                self.lista_enxoval.atualizar()
                 self.limpar_form_enxoval()
                 
             except ValueError:
@@ -1522,63 +4089,16 @@ class SistemaGestaoApp:
                 messagebox.showerror("Erro", f"Ocorreu um erro ao registrar o consumo:\n{str(e)}")
 
     def carregar_itens_enxoval(self):
-        """Carrega os itens de enxoval no TreeView e atualiza os comboboxes"""
-        try:
-            conn = sqlite3.connect("sistema.db")
-            cursor = conn.cursor()
-            
-            # Carregar imóveis no combobox
-            cursor.execute("SELECT id, endereco FROM imoveis")
-            imoveis = cursor.fetchall()
-            self.combo_imovel_enxoval['values'] = [f"{i[0]} - {i[1]}" for i in imoveis]
-            
-            if imoveis:
-                self.combo_imovel_enxoval.current(0)
-            
-            # Carregar itens de enxoval no combobox
-            cursor.execute("SELECT id, nome, preco_unitario FROM tipos_enxoval")
-            itens = cursor.fetchall()
-            self.combo_item_enxoval['values'] = [f"{i[0]} - {i[1]} (R$ {i[2]:.2f})" for i in itens]
-            
-            if itens:
-                self.combo_item_enxoval.current(0)
-            
-            # Carregar consumo de enxoval no treeview
-            cursor.execute("""
-                SELECT c.id, i.endereco, t.nome, c.quantidade, c.data, t.preco_unitario, 
-                    (c.quantidade * t.preco_unitario) as valor_total
-                FROM consumo_enxoval c
-                JOIN imoveis i ON c.imovel_id = i.id
-                JOIN tipos_enxoval t ON c.item_id = t.id
-                ORDER BY c.data DESC
-            """)
-            
-            # Limpar treeview
-            for item in self.tree_enxoval.get_children():
-                self.tree_enxoval.delete(item)
-            
-            # Adicionar novos itens formatados
-            for row in cursor.fetchall():
-                self.tree_enxoval.insert('', 'end', values=(
-                    row[0], row[1], row[2], row[3], row[4],
-                    formatar_moeda(row[5]), 
-                    formatar_moeda(row[6])
-                ))
-            
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar itens de enxoval:\n{str(e)}")
-        finally:
-            conn.close()
+        """Carrega as sugestões de imóveis e itens e a primeira página de consumo de enxoval em segundo plano"""
+        self.combo_imovel_enxoval.atualizar()
+        self.combo_item_enxoval.atualizar()
+        self.lista_enxoval.recarregar()
 
 
     def limpar_form_enxoval(self):
         """Limpa o formulário de enxoval"""
         self.entry_enxoval_quantidade.delete(0, END)
-        # Mantém os comboboxes com os valores atuais
-        if self.combo_imovel_enxoval['values']:
-            self.combo_imovel_enxoval.current(0)
-        if self.combo_item_enxoval['values']:
-            self.combo_item_enxoval.current(0)
+        # Mantém o imóvel e o item selecionados, para lançamentos em sequência
         # Define a data atual como padrão
         self.entry_enxoval_data.set_date(datetime.now().date())
     
@@ -1622,6 +4142,7 @@ class SistemaGestaoApp:
             self.tree_enxoval_config = tree
         else:
             self.tree_suprimentos_config = tree
+        setattr(self, f"sinc_{tipo_item}_config", SincronizadorTreeview(tree, self._formatar_item_config))
         
         # Configurar bind para seleção
         tree.bind('<<TreeviewSelect>>', lambda e: self._preencher_form_item(tipo_item))
@@ -1718,31 +4239,27 @@ class SistemaGestaoApp:
             messagebox.showerror("Erro", "O nome é obrigatório!")
             return
         
-        try:
-            preco = float(preco) if preco else 0.0
-        except ValueError:
-            messagebox.showerror("Erro", "Preço deve ser um número válido!")
-            return
-        
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
-        if hasattr(self, 'item_selecionado_id') and self.item_selecionado_id and self.item_selecionado_tipo == tipo_item:
-            # Atualizar item existente
-            cursor.execute(f"""
-                UPDATE {tabela} 
-                SET nome=?, preco_unitario=?, unidade_medida=?
-                WHERE id=?
-            """, (nome, preco, unidade, self.item_selecionado_id))
-        else:
-            # Inserir novo item
-            cursor.execute(f"""
-                INSERT INTO {tabela} (nome, preco_unitario, unidade_medida)
-                VALUES (?, ?, ?)
-            """, (nome, preco, unidade))
+        try:
+            preco = ler_centavos(preco) if preco else 0
+        except ValueError:
+            messagebox.showerror("Erro", "Preço deve ser um número válido!")
+            return
         
-        conn.commit()
-        conn.close()
+        with transacao() as cursor:
+            if hasattr(self, 'item_selecionado_id') and self.item_selecionado_id and self.item_selecionado_tipo == tipo_item:
+                # Atualizar item existente
+                cursor.execute(f"""
+                    UPDATE {tabela} 
+                    SET nome=?, preco_unitario_centavos=?, unidade_medida=?
+                    WHERE id=?
+                """, (nome, preco, unidade, self.item_selecionado_id))
+            else:
+                # Inserir novo item
+                cursor.execute(f"""
+                    INSERT INTO {tabela} (nome, preco_unitario_centavos, unidade_medida)
+                    VALUES (?, ?, ?)
+                """, (nome, preco, unidade))
+        dados_referencia.invalidar(tabela)
         
         messagebox.showinfo("Sucesso", "Item salvo com sucesso!")
         self.carregar_itens_config()
@@ -1758,15 +4275,12 @@ class SistemaGestaoApp:
         if resposta:
             tabela = "tipos_enxoval" if tipo_item == "enxoval" else "suprimentos"
             
-            conn = sqlite3.connect("sistema.db")
-            cursor = conn.cursor()
-            
-            try:
+            with transacao() as cursor:
                 # Verificar se o item está em uso
                 if tipo_item == "enxoval":
                     cursor.execute("SELECT COUNT(*) FROM consumo_enxoval WHERE item_id=?", (self.item_selecionado_id,))
                 else:
-                    cursor.execute("SELECT COUNT(*) FROM consumo_suprimentos WHERE item_id=?", (self.item_selecionado_id,))
+                    cursor.execute("SELECT COUNT(*) FROM reposicao_suprimentos WHERE suprimento_id=?", (self.item_selecionado_id,))
                 
                 if cursor.fetchone()[0] > 0:
                     messagebox.showerror("Erro", "Este item está em uso e não pode ser removido!")
@@ -1774,13 +4288,12 @@ class SistemaGestaoApp:
                 
                 # Remover o item
                 cursor.execute(f"DELETE FROM {tabela} WHERE id=?", (self.item_selecionado_id,))
-                conn.commit()
-                messagebox.showinfo("Sucesso", "Item removido!")
-                
-                self.carregar_itens_config()
-                self._limpar_form_item(tipo_item)
-            finally:
-                conn.close()
+            dados_referencia.invalidar(tabela)
+            
+            messagebox.showinfo("Sucesso", "Item removido!")
+            
+            self.carregar_itens_config()
+            self._limpar_form_item(tipo_item)
 
     def _limpar_form_item(self, tipo_item):
             """Limpa o formulário de itens"""
@@ -1799,54 +4312,35 @@ class SistemaGestaoApp:
                 del self.item_selecionado_tipo
 
     def carregar_itens_config(self):
-        """Carrega todos os itens para configuração"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
+        """Carrega todos os itens para configuração em segundo plano"""
+        self.executor.executar(
+            "config_itens",
+            self._consultar_itens_config,
+            self._exibir_itens_config,
+            lambda e: messagebox.showerror("Erro", f"Erro ao carregar itens:\n{str(e)}")
+        )
+
+    def _consultar_itens_config(self):
+        """Lista os itens de enxoval e suprimentos dos dados de referência (executado fora da thread do Tk)"""
+        return tuple(
+            [(i.id, i.nome, i.preco_unitario_centavos, i.unidade_medida) for i in dados_referencia.catalogo(tabela).registros]
+            for tabela in ("tipos_enxoval", "suprimentos")
+        )
+
+    def _exibir_itens_config(self, dados):
+        """Preenche os TreeViews de configuração de itens"""
+        itens_enxoval, itens_suprimentos = dados
+        self.sinc_enxoval_config.aplicar(itens_enxoval)
         
-        try:
-            # Verificar se a coluna unidade_medida existe, se não, adicionar
-            cursor.execute("PRAGMA table_info(tipos_enxoval)")
-            colunas = [col[1] for col in cursor.fetchall()]
-            
-            if 'unidade_medida' not in colunas:
-                cursor.execute("ALTER TABLE tipos_enxoval ADD COLUMN unidade_medida TEXT DEFAULT 'unidade'")
-                conn.commit()
-            
-            # Carregar itens de enxoval
-            cursor.execute("""
-                SELECT id, nome, preco_unitario, 
-                    COALESCE(unidade_medida, 'unidade') as unidade_medida 
-                FROM tipos_enxoval 
-                ORDER BY nome
-            """)
-            self._preencher_treeview(self.tree_enxoval_config, cursor.fetchall())
-            
-            # Carregar suprimentos (se aplicável)
-            if hasattr(self, 'tree_suprimentos_config'):
-                cursor.execute("""
-                    SELECT id, nome, preco_unitario, 
-                        COALESCE(unidade_medida, 'unidade') as unidade_medida 
-                    FROM suprimentos 
-                    ORDER BY nome
-                """)
-                self._preencher_treeview(self.tree_suprimentos_config, cursor.fetchall())
-                
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar itens:\n{str(e)}")
-        finally:
-            conn.close()
+        # Carregar suprimentos (se aplicável)
+        if hasattr(self, 'sinc_suprimentos_config'):
+            self.sinc_suprimentos_config.aplicar(itens_suprimentos)
 
-    def _preencher_treeview(self, tree, dados):
-            """Preenche um treeview com os dados fornecidos"""
-            # Limpar treeview
-            for item in tree.get_children():
-                tree.delete(item)
-            
-            # Adicionar itens formatados
-            for row in dados:
-                preco = f"R$ {row[2]:.2f}" if row[2] is not None else "N/A"
-                unidade = row[3] if row[3] else "unidade"
-                tree.insert('', 'end', values=(row[0], row[1], preco, unidade))
+    def _formatar_item_config(self, row):
+        """Formata um item de configuração para exibição no TreeView"""
+        preco = formatar_moeda(row[2]) if row[2] is not None else "N/A"
+        unidade = row[3] if row[3] else "unidade"
+        return (row[0], row[1], preco, unidade)
 
 
     # =============================================
@@ -1855,6 +4349,8 @@ class SistemaGestaoApp:
     
     def criar_suprimentos(self):
         """Cria a interface para gestão de suprimentos"""
+        from tkcalendar import DateEntry
+
         self.frame_suprimentos = Frame(self.frame_conteudo, bg=COR_FUNDO)
         
         # Treeview para listar reposição de suprimentos
@@ -1870,6 +4366,19 @@ class SistemaGestaoApp:
         self.tree_suprimentos.pack(fill=BOTH, expand=True)
         scrollbar.config(command=self.tree_suprimentos.yview)
         
+        self.lista_suprimentos = ListaPaginada(
+            self.tree_suprimentos, scrollbar, self.executor, "suprimentos_lista",
+            """
+                SELECT r.id, i.endereco, s.nome, r.quantidade, r.data, r.valor_gasto_centavos, r.comprovante_path
+                FROM reposicao_suprimentos r
+                JOIN imoveis i ON r.imovel_id = i.id
+                JOIN suprimentos s ON r.suprimento_id = s.id
+            """,
+            "data", "id", 4,
+            lambda row: (row[0], row[1], row[2], row[3], row[4],
+                         formatar_moeda(row[5]), "Sim" if row[6] else "Não")
+        )
+        
         self.tree_suprimentos.heading('#0', text='ID')
         self.tree_suprimentos.heading('#1', text='Imóvel')
         self.tree_suprimentos.heading('#2', text='Item')
@@ -1890,14 +4399,14 @@ class SistemaGestaoApp:
         frame_imovel = Frame(frame_form, bg=COR_CARD)
         frame_imovel.pack(fill=X, padx=10, pady=5)
         Label(frame_imovel, text="Imóvel:", bg=COR_CARD).pack(side=LEFT, padx=5)
-        self.combo_imovel_suprimento = ttk.Combobox(frame_imovel)
+        self.combo_imovel_suprimento = SeletorRegistro(frame_imovel, self.executor, "imoveis")
         self.combo_imovel_suprimento.pack(side=LEFT, expand=True, fill=X)
         
         # Combobox para selecionar item
         frame_item = Frame(frame_form, bg=COR_CARD)
         frame_item.pack(fill=X, padx=10, pady=5)
         Label(frame_item, text="Item:", bg=COR_CARD).pack(side=LEFT, padx=5)
-        self.combo_item_suprimento = ttk.Combobox(frame_item)
+        self.combo_item_suprimento = SeletorRegistro(frame_item, self.executor, "suprimentos")
         self.combo_item_suprimento.pack(side=LEFT, expand=True, fill=X)
         
         # Campos de quantidade, data e valor
@@ -1934,56 +4443,19 @@ class SistemaGestaoApp:
               bg=COR_DESTAQUE, fg="white").pack(side=LEFT, padx=5)
         Button(frame_botoes, text="Limpar", command=self.limpar_form_suprimento,
               bg=COR_SECUNDARIA, fg="white").pack(side=LEFT, padx=5)
+        Button(frame_botoes, text="Comprovantes", command=lambda: self.abrir_galeria_comprovantes("Suprimentos"),
+              bg=COR_SECUNDARIA, fg="white").pack(side=LEFT, padx=5)
     
     def carregar_suprimentos(self):
-        """Carrega os suprimentos no TreeView e atualiza os comboboxes"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
-        # Carregar imóveis no combobox
-        cursor.execute("SELECT id, endereco FROM imoveis")
-        imoveis = cursor.fetchall()
-        self.combo_imovel_suprimento['values'] = [f"{i[0]} - {i[1]}" for i in imoveis]
-        
-        if imoveis:
-            self.combo_imovel_suprimento.current(0)
-        
-        # Carregar itens de suprimento no combobox
-        cursor.execute("SELECT id, nome FROM suprimentos")
-        itens = cursor.fetchall()
-        self.combo_item_suprimento['values'] = [f"{i[0]} - {i[1]}" for i in itens]
-        
-        if itens:
-            self.combo_item_suprimento.current(0)
-        
-        # Carregar reposição de suprimentos no treeview
-        cursor.execute("""
-            SELECT r.id, i.endereco, s.nome, r.quantidade, r.data, r.valor_gasto, r.comprovante_path
-            FROM reposicao_suprimentos r
-            JOIN imoveis i ON r.imovel_id = i.id
-            JOIN suprimentos s ON r.suprimento_id = s.id
-            ORDER BY r.data DESC
-        """)
-        
-        # Limpar treeview
-        for item in self.tree_suprimentos.get_children():
-            self.tree_suprimentos.delete(item)
-        
-        # Adicionar novos itens formatados
-        for row in cursor.fetchall():
-            comprovante = "Sim" if row[6] else "Não"
-            self.tree_suprimentos.insert('', 'end', values=(
-                row[0], row[1], row[2], row[3], row[4],
-                formatar_moeda(row[5]), 
-                comprovante
-            ))
-        
-        conn.close()
+        """Carrega as sugestões de imóveis e suprimentos e a primeira página de reposições em segundo plano"""
+        self.combo_imovel_suprimento.atualizar()
+        self.combo_item_suprimento.atualizar()
+        self.lista_suprimentos.recarregar()
     
     def adicionar_reposicao_suprimento(self):
         """Adiciona uma nova reposição de suprimento ao banco de dados"""
-        imovel_id = self.combo_imovel_suprimento.get().split(" - ")[0]
-        item_id = self.combo_item_suprimento.get().split(" - ")[0]
+        imovel_id = self.combo_imovel_suprimento.selecionado.get()
+        item_id = self.combo_item_suprimento.selecionado.get()
         quantidade = self.entry_suprimento_quantidade.get()
         data = self.entry_suprimento_data.get_date()
         valor = self.entry_suprimento_valor.get()
@@ -1992,20 +4464,25 @@ class SistemaGestaoApp:
         if imovel_id and item_id and quantidade and data and valor:
             try:
                 quantidade = int(quantidade)
-                valor = float(valor)
+                valor = ler_centavos(valor)
                 
-                conn = sqlite3.connect("sistema.db")
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO reposicao_suprimentos 
-                    (imovel_id, suprimento_id, quantidade, data, valor_gasto, comprovante_path)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (imovel_id, item_id, quantidade, data, valor, comprovante))
-                conn.commit()
-                conn.close()
+                # Caminho digitado à mão também passa pelo armazenamento
+                if comprovante:
+                    try:
+                        comprovante = guardar_comprovante(comprovante)
+                    except OSError as e:
+                        messagebox.showerror("Erro", f"Não foi possível guardar o comprovante:\n{str(e)}")
+                        return
+                
+                with transacao() as cursor:
+                    cursor.execute("""
+                        INSERT INTO reposicao_suprimentos 
+                        (imovel_id, suprimento_id, quantidade, data, valor_gasto_centavos, comprovante_path)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (imovel_id, item_id, quantidade, data.isoformat(), valor, comprovante))
                 
                 messagebox.showinfo("Sucesso", "Reposição de suprimento registrada com sucesso!")
-                self.carregar_suprimentos()
+                self.lista_suprimentos.atualizar()
                 self.limpar_form_suprimento()
             except ValueError:
                 messagebox.showerror("Erro", "Quantidade deve ser inteiro e valor deve ser numérico")
@@ -2018,6 +4495,15 @@ class SistemaGestaoApp:
         self.entry_suprimento_valor.delete(0, END)
         self.entry_suprimento_comprovante.delete(0, END)
     
+    def abrir_galeria_comprovantes(self, origem):
+        """Abre a galeria de comprovantes na origem indicada, reaproveitando a janela se já estiver aberta"""
+        galeria = self.galeria_comprovantes
+        if galeria is not None and galeria.janela.winfo_exists():
+            galeria.carregar(origem)
+            galeria.mostrar()
+            return
+        self.galeria_comprovantes = GaleriaComprovantes(self.root, self.executor, origem, self._abrir_arquivo)
+    
     # =============================================
     # MÓDULO RELATÓRIOS
     # =============================================
@@ -2056,6 +4542,17 @@ class SistemaGestaoApp:
                                     pady=8)
         btn_relatorio_mensal.pack(side=LEFT, padx=5)
         
+        # Botão para salvar o relatório exibido em DOCX
+        btn_salvar_docx = Button(frame_botoes_horizontal, 
+                                text="Salvar DOCX",
+                                command=self.salvar_relatorio,
+                                bg=COR_PRIMARIA,
+                                fg="white",
+                                font=("Arial", 10, "bold"),
+                                padx=15,
+                                pady=8)
+        btn_salvar_docx.pack(side=LEFT, padx=5)
+        
         # Botão para exportar para PDF
         btn_exportar_pdf = Button(frame_botoes_horizontal, 
                                 text="Exportar para PDF",
@@ -2067,6 +4564,21 @@ class SistemaGestaoApp:
                                 pady=8)
         btn_exportar_pdf.pack(side=LEFT, padx=5)
         
+        # Progresso dos relatórios em geração (podem ser vários ao mesmo tempo)
+        frame_progresso = Frame(frame_botoes, bg=COR_FUNDO)
+        frame_progresso.pack(fill=X, pady=(10, 0))
+        
+        self.barra_progresso_relatorio = ttk.Progressbar(frame_progresso, mode='determinate', maximum=100)
+        self.barra_progresso_relatorio.pack(side=LEFT, padx=5)
+        self.label_progresso_relatorio = Label(frame_progresso, text="", bg=COR_FUNDO,
+                                               fg=COR_SECUNDARIA, font=self.fonte_pequena)
+        self.label_progresso_relatorio.pack(side=LEFT, padx=5)
+        self._exibir_progresso_relatorios()
+        
+        # Relatório em exibição e fila dos trechos da pré-visualização ainda não inseridos
+        self.relatorio_exibido = None
+        self._fila_previa = None
+        
         # Frame para visualização do relatório
         frame_visualizacao = Frame(self.frame_relatorios, bg=COR_FUNDO)
         frame_visualizacao.pack(fill=BOTH, expand=True, padx=10, pady=10)
@@ -2133,75 +4645,129 @@ class SistemaGestaoApp:
         btn_limpar.pack(side=RIGHT, padx=5)
     
     def _gerar_relatorio_semanal(self):
-        """Gera e exibe o relatório semanal na interface"""
-        try:
-            caminho = self._gerar_relatorio_semanal_docx()
-            
-            # Limpar a área de texto
-            self.texto_relatorio.delete(1.0, END)
-            
-            # Adicionar cabeçalho personalizado
-            self.adicionar_cabecalho_relatorio("Relatório Semanal")
-            
-            # Exibir conteúdo do relatório com formatação
-            with open(caminho, 'rb') as f:
-                doc = Document(f)
-                
-                for para in doc.paragraphs:
-                    texto = para.text
-                    estilo = "normal"
-                    
-                    if para.style.name == 'Heading 1':
-                        estilo = "titulo"
-                    elif para.style.name == 'Heading 2':
-                        estilo = "cabecalho"
-                    elif para.style.name == 'Heading 3':
-                        estilo = "subtitulo"
-                    elif any(run.bold for run in para.runs):
-                        estilo = "negrito"
-                    
-                    self.texto_relatorio.insert(END, texto + "\n", estilo)
-            
-            messagebox.showinfo("Sucesso", f"Relatório semanal gerado com sucesso!\n{caminho}")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao gerar relatório: {str(e)}")
+        """Monta o relatório semanal em segundo plano e o exibe na interface"""
+        self._montar_relatorio(montar_relatorio_semanal)
 
     def _gerar_relatorio_mensal(self):
-        """Gera e exibe o relatório mensal na interface"""
-        try:
-            caminho = self._gerar_relatorio_mensal_docx()
-            
-            # Limpar a área de texto
-            self.texto_relatorio.delete(1.0, END)
-            
-            # Adicionar cabeçalho personalizado
-            self.adicionar_cabecalho_relatorio("Relatório Mensal")
-            
-            # Exibir conteúdo do relatório com formatação
-            with open(caminho, 'rb') as f:
-                doc = Document(f)
-                
-                for para in doc.paragraphs:
-                    texto = para.text
-                    estilo = "normal"
-                    
-                    if para.style.name == 'Heading 1':
-                        estilo = "titulo"
-                    elif para.style.name == 'Heading 2':
-                        estilo = "cabecalho"
-                    elif para.style.name == 'Heading 3':
-                        estilo = "subtitulo"
-                    elif any(run.bold for run in para.runs):
-                        estilo = "negrito"
-                    
-                    self.texto_relatorio.insert(END, texto + "\n", estilo)
-            
-            messagebox.showinfo("Sucesso", f"Relatório mensal gerado com sucesso!\n{caminho}")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao gerar relatório mensal: {str(e)}")
+        """Monta o relatório mensal em segundo plano e o exibe na interface"""
+        self._montar_relatorio(montar_relatorio_mensal)
+
+    def _montar_relatorio(self, montar):
+        """Consulta e formata o relatório fora da thread do Tk; o arquivo só é gravado ao salvar.
+
+        A thread de trabalho entrega o Relatorio e depois os trechos da pré-visualização
+        numa fila limitada, que _inserir_trechos_previa esvazia aos poucos. Montagem e
+        trechos vêm da mesma transação de leitura, e a pré-visualização de dados
+        inalterados sai do cache em vez de ser consultada de novo.
+        """
+        fila = queue.Queue(maxsize=MAX_TRECHOS_PREVIA_EM_ESPERA)
+        self._fila_previa = fila
+        
+        def consultar():
+            with leitura():
+                relatorio = montar()
+                enfileirar_trecho(fila, relatorio)
+                for trecho in trechos_previa_em_cache(relatorio):
+                    enfileirar_trecho(fila, trecho)
+            enfileirar_trecho(fila, None)
+        
+        def falhar(e):
+            if self._fila_previa is fila:
+                self._fila_previa = None
+            messagebox.showerror("Erro", f"Erro ao gerar relatório: {str(e)}")
+        
+        self.executor.executar("relatorio", consultar, None, falhar)
+        self.root.after(self.INTERVALO_PREVIA_MS, self._inserir_trechos_previa, fila)
+
+    def _inserir_trechos_previa(self, fila):
+        """Insere na área de texto alguns trechos por ciclo, para a janela seguir respondendo"""
+        if self._fila_previa is not fila:
+            return
+        
+        for _ in range(self.TRECHOS_PREVIA_POR_CICLO):
+            try:
+                trecho = fila.get_nowait()
+            except queue.Empty:
+                break
+            if trecho is None:
+                self._fila_previa = None
+                return
+            if isinstance(trecho, Relatorio):
+                self._exibir_relatorio(trecho)
+            else:
+                self.texto_relatorio.insert(END, *trecho)
+        
+        self.root.after(self.INTERVALO_PREVIA_MS, self._inserir_trechos_previa, fila)
+
+    def salvar_relatorio(self, ao_salvar=None):
+        """Grava o relatório exibido em DOCX num processo separado, acompanhando o progresso na barra"""
+        relatorio = self.relatorio_exibido
+        if relatorio is None:
+            messagebox.showwarning("Aviso", "Gere um relatório antes de salvá-lo")
+            return
+        if ao_salvar is None:
+            ao_salvar = lambda caminho: messagebox.showinfo("Sucesso", f"Relatório salvo em:\n{caminho}")
+        
+        # Mesmo período e mesmos dados: o arquivo já gerado é reaproveitado
+        caminho = buscar_relatorio_em_cache(relatorio)
+        if caminho is not None:
+            ao_salvar(caminho)
+            return
+
+        self._gravar_em_processo(relatorio.titulo, gravar_relatorio_em_cache, (relatorio,), ao_salvar,
+                                 "Erro ao salvar relatório")
+
+    def _gravar_em_processo(self, titulo, funcao, argumentos, ao_concluir, mensagem_erro):
+        """Envia uma gravação de arquivo à fila de processos, acompanhando o progresso na barra de relatórios"""
+        def concluir(caminho):
+            self._encerrar_progresso_relatorio(trabalho_id)
+            ao_concluir(caminho)
+
+        def falhar(e):
+            self._encerrar_progresso_relatorio(trabalho_id)
+            if isinstance(e, ValueError):
+                messagebox.showerror("Erro", str(e))
+            else:
+                messagebox.showerror("Erro", f"{mensagem_erro}: {str(e)}")
+
+        trabalho_id = self.fila_relatorios.enviar(funcao, argumentos, concluir,
+                                                  self._atualizar_progresso_relatorio, falhar)
+        self._progresso_relatorios[trabalho_id] = (titulo, 0.0, "Na fila")
+        self._exibir_progresso_relatorios()
+
+    def _atualizar_progresso_relatorio(self, trabalho_id, fracao, mensagem):
+        if trabalho_id in self._progresso_relatorios:
+            titulo = self._progresso_relatorios[trabalho_id][0]
+            self._progresso_relatorios[trabalho_id] = (titulo, fracao, mensagem)
+            self._exibir_progresso_relatorios()
+
+    def _encerrar_progresso_relatorio(self, trabalho_id):
+        self._progresso_relatorios.pop(trabalho_id, None)
+        self._exibir_progresso_relatorios()
+
+    def _exibir_progresso_relatorios(self):
+        """Mostra na barra a média dos relatórios em andamento e, no rótulo, a etapa de cada um"""
+        if self.barra_progresso_relatorio is None:
+            return
+        if not self._progresso_relatorios:
+            self.barra_progresso_relatorio['value'] = 0
+            self.label_progresso_relatorio.config(text="")
+            return
+        
+        andamento = self._progresso_relatorios.values()
+        self.barra_progresso_relatorio['value'] = 100 * sum(f for _, f, _ in andamento) / len(andamento)
+        self.label_progresso_relatorio.config(
+            text="  |  ".join(f"{titulo}: {mensagem} ({fracao:.0%})" for titulo, fracao, mensagem in andamento))
+
+    def _exibir_relatorio(self, relatorio):
+        """Começa a exibição do Relatorio: limpa a área de texto e escreve o cabeçalho.
+
+        O restante chega em trechos já formatados (ver _inserir_trechos_previa).
+        """
+        self.relatorio_exibido = relatorio
+        self.texto_relatorio.delete(1.0, END)
+        self.adicionar_cabecalho_relatorio(relatorio.titulo)
 
-       
- 
     def adicionar_cabecalho_relatorio(self, titulo):
         """Adiciona um cabeçalho profissional ao relatório"""
         # Informações da empresa
@@ -2219,104 +4785,50 @@ class SistemaGestaoApp:
         self.texto_relatorio.insert(END, f"Emitido em: {data_atual}\n", "subtitulo")
         self.texto_relatorio.insert(END, "="*80 + "\n\n", "normal")
 
-    def _gerar_relatorio_semanal_docx(self):
-        """Gera um relatório semanal profissional em formato DOCX"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
-        # Data de início (7 dias atrás)
-        data_inicio = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-        data_fim = datetime.now().strftime("%Y-%m-%d")
-        
-        # Criar documento profissional
-        doc = Document()
-        
-        # Estilos personalizados
-        styles = doc.styles
-        style = styles.add_style('CabecalhoEmpresa', WD_STYLE_TYPE.PARAGRAPH)
-        style.font.name = 'Arial'
-        style.font.size = Pt(14)
-        style.font.bold = True
-        style.font.color.rgb = RGBColor(0x2C, 0x3E, 0x50)  # COR_PRIMARIA
-        
-        # Cabeçalho do documento
-        para = doc.add_paragraph("SUA EMPRESA LTDA", style='CabecalhoEmpresa')
-        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        para = doc.add_paragraph("Relatório Semanal de Serviços", style='Heading 1')
-        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        doc.add_paragraph(f"Período: {data_inicio} a {data_fim}", style='Heading 2')
-        
-        # Limpezas realizadas
-        doc.add_heading('Limpezas Realizadas', level=1)
-        cursor.execute("""
-            SELECT i.endereco, l.data, l.horas_trabalhadas, l.valor_total 
-            FROM limpezas l
-            JOIN imoveis i ON l.imovel_id = i.id
-            WHERE date(l.data) BETWEEN date(?) AND date(?)
-            ORDER BY l.data
-        """, (data_inicio, data_fim))
-        
-        tabela_limpezas = doc.add_table(rows=1, cols=4, style='Light Shading Accent 1')
-        tabela_limpezas.autofit = True
-        
-        # Cabeçalho da tabela
-        cabecalho = tabela_limpezas.rows[0].cells
-        cabecalho[0].text = 'Imóvel'
-        cabecalho[1].text = 'Data'
-        cabecalho[2].text = 'Horas'
-        cabecalho[3].text = 'Valor'
-        
-        total_horas = 0
-        total_valor = 0
-        
-        for row in cursor.fetchall():
-            linha = tabela_limpezas.add_row().cells
-            linha[0].text = row[0]
-            linha[1].text = row[1]
-            linha[2].text = f"{row[2]:.2f}h"
-            linha[3].text = formatar_moeda(row[3])
-            total_horas += row[2]
-            total_valor += row[3]
-        
-        doc.add_paragraph(f"Total de horas trabalhadas: {total_horas:.2f}h", style='Body Text')
-        doc.add_paragraph(f"Total a receber por limpezas: {formatar_moeda(total_valor)}", style='Body Text')
-        
-        # Restante da implementação do relatório...
-        # ... (manter o restante do código de geração do relatório)
-
-        # Salvar documento
-        os.makedirs("relatorios", exist_ok=True)
-        nome_arquivo = f"relatorios/Relatorio_Semanal_{datetime.now().strftime('%Y%m%d_%H%M')}.docx"
-        doc.save(nome_arquivo)
-        conn.close()
+    def abrir_relatorio_word(self):
+        """Abre no Word o relatório exibido (gravando-o, se preciso) ou o último salvo"""
+        if self.relatorio_exibido is not None:
+            self.salvar_relatorio(ao_salvar=self._abrir_arquivo)
+            return
         
-        return nome_arquivo
-
-# Adicione os outros métodos auxiliares (adicionar_cabecalho_relatorio, abrir_relatorio_word, etc.)
+        try:
+            arquivos = [f for f in os.listdir(CACHE_RELATORIOS_DIR) if f.endswith(".docx")]
+        except OSError:
+            arquivos = []
+        if arquivos:
+            arquivos.sort(key=lambda f: os.path.getmtime(os.path.join(CACHE_RELATORIOS_DIR, f)), reverse=True)
+            self._abrir_arquivo(os.path.join(CACHE_RELATORIOS_DIR, arquivos[0]))
+        else:
+            messagebox.showwarning("Aviso", "Nenhum relatório encontrado na pasta 'relatorios'")
 
-    def abrir_relatorio_word(self):
-        """Abre o último relatório gerado no Word"""
+    def _abrir_arquivo(self, caminho):
         try:
-            arquivos = [f for f in os.listdir("relatorios") if f.endswith(".docx")]
-            if arquivos:
-                arquivos.sort(reverse=True)
-                caminho = os.path.join("relatorios", arquivos[0])
-                os.startfile(caminho)  # Abre com o programa padrão
-            else:
-                messagebox.showwarning("Aviso", "Nenhum relatório encontrado na pasta 'relatorios'")
+            os.startfile(caminho)  # Abre com o programa padrão
         except Exception as e:
-            messagebox.showerror("Erro", f"Não foi possível abrir o relatório: {str(e)}")
+            messagebox.showerror("Erro", f"Não foi possível abrir o arquivo: {str(e)}")
 
     def exportar_para_pdf(self):
-        """Exporta o relatório atual para PDF"""
-        try:
-            # Implemente a conversão para PDF aqui
-            # Pode usar bibliotecas como python-docx para DOCX para PDF
-            messagebox.showinfo("Em desenvolvimento", "Funcionalidade de exportar para PDF será implementada em breve")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao exportar para PDF: {str(e)}")
+        """Exporta o relatório exibido para PDF, sem depender do Word"""
+        relatorio = self.relatorio_exibido
+        if relatorio is None:
+            messagebox.showwarning("Aviso", "Gere um relatório antes de exportá-lo")
+            return
+        
+        caminho = self._escolher_arquivo_pdf(f"{relatorio.prefixo_arquivo}_{relatorio.data_fim}.pdf")
+        if caminho:
+            self._gravar_em_processo(
+                relatorio.titulo, escrever_pdf_relatorio, (relatorio, caminho),
+                lambda caminho: messagebox.showinfo("Sucesso", f"PDF gerado em:\n{caminho}"),
+                "Erro ao exportar para PDF"
+            )
+
+    def _escolher_arquivo_pdf(self, nome_sugerido):
+        """Pergunta onde salvar o PDF, sugerindo a pasta de relatórios"""
+        os.makedirs("relatorios", exist_ok=True)
+        return filedialog.asksaveasfilename(defaultextension=".pdf",
+                                            filetypes=[("PDF", "*.pdf")],
+                                            initialdir="relatorios",
+                                            initialfile=nome_sugerido)
 
     def copiar_relatorio(self):
         """Copia o conteúdo do relatório para a área de transferência"""
@@ -2330,12 +4842,17 @@ class SistemaGestaoApp:
 
     def limpar_relatorio(self):
         """Limpa a área de visualização do relatório"""
+        self.executor.cancelar("relatorio")
+        self._fila_previa = None
+        self.relatorio_exibido = None
         self.texto_relatorio.delete(1.0, END)
 
         # =======FECHAMENTO DE CONTAS=========))
 
     def _construir_aba_fechamento(self, frame, tipo):
         """Constrói a interface de fechamento de contas para imóvel ou cliente"""
+        from tkcalendar import DateEntry
+
 
         label_titulo = Label(frame, text=f"Fechamento por {tipo.title()}", font=("Arial", 12, "bold"), bg=COR_FUNDO)
         label_titulo.pack(pady=10)
@@ -2387,6 +4904,8 @@ class SistemaGestaoApp:
 
     def _construir_aba_fechamento(self, parent_frame, tipo):
         """Método auxiliar para construir a interface de fechamento"""
+        from tkcalendar import DateEntry
+
         # Frame para seleção
         frame_selecao = Frame(parent_frame, bg=COR_CARD, padx=10, pady=10)
         frame_selecao.pack(fill=X)
@@ -2394,7 +4913,8 @@ class SistemaGestaoApp:
         Label(frame_selecao, text=f"Selecione o {'Imóvel' if tipo == 'imovel' else 'Cliente'}:", 
             bg=COR_CARD).pack(side=LEFT, padx=5)
         
-        setattr(self, f"combo_fechamento_{tipo}", ttk.Combobox(frame_selecao))
+        catalogo = "imoveis" if tipo == "imovel" else "clientes"
+        setattr(self, f"combo_fechamento_{tipo}", SeletorRegistro(frame_selecao, self.executor, catalogo))
         getattr(self, f"combo_fechamento_{tipo}").pack(side=LEFT, expand=True, fill=X, padx=5)
     
         # Frame para período
@@ -2428,284 +4948,162 @@ class SistemaGestaoApp:
             command=lambda: self.gerar_fechamento(tipo),
             bg=COR_SUCESSO, fg="white").pack(side=LEFT, padx=5)
         
+        Button(frame_botoes, text="Exportar PDF", 
+            command=lambda: self.exportar_fechamento_pdf(tipo),
+            bg="#4CAF50", fg="white").pack(side=LEFT, padx=5)
+        
         Button(frame_botoes, text="Limpar", 
             command=lambda: self.limpar_form_fechamento(tipo),
             bg=COR_SECUNDARIA, fg="white").pack(side=LEFT, padx=5)
         
+        Button(frame_botoes, text="Comprovantes", 
+            command=lambda: self.abrir_galeria_comprovantes("Fechamentos"),
+            bg=COR_SECUNDARIA, fg="white").pack(side=LEFT, padx=5)
+        
         # Carrega os itens no combobox
         self.carregar_itens_fechamento(tipo)
 
     def carregar_itens_fechamento(self, tipo):
-        """Carrega imóveis ou clientes no combobox correspondente ao tipo"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
-        if tipo == "imovel":
-            cursor.execute("SELECT id, endereco FROM imoveis")
-            itens = [f"{row[0]} - {row[1]}" for row in cursor.fetchall()]
-        else:
-            cursor.execute("SELECT id, nome FROM clientes")
-            itens = [f"{row[0]} - {row[1]}" for row in cursor.fetchall()]
-        
-        combo = getattr(self, f"combo_fechamento_{tipo}", None)
-        if combo:
-            combo['values'] = itens
-            if itens:
-                combo.current(0)
-        
-        conn.close()
+        """Carrega as sugestões de imóveis ou clientes do seletor correspondente ao tipo"""
+        getattr(self, f"combo_fechamento_{tipo}").atualizar()
 
 
     def gerar_resumo_fechamento(self, tipo):
         """Gera um resumo dos valores a receber"""
         try:
-            combo = getattr(self, f"combo_fechamento_{tipo}")
-            entry_inicio = getattr(self, f"entry_data_inicio_{tipo}")
-            entry_fim = getattr(self, f"entry_data_fim_{tipo}")
-            label_resumo = getattr(self, f"label_resumo_{tipo}")
-
-            item = combo.get()
-            if not item:
-                raise ValueError("Selecione um item")
-                    
-            item_id = item.split(" - ")[0]
-            data_inicio = entry_inicio.get_date()
-            data_fim = entry_fim.get_date()
-                        
-            if data_inicio > data_fim:
-                    raise ValueError("Data inicial deve ser anterior à data final")
-                    
-            conn = sqlite3.connect("sistema.db")
-            cursor = conn.cursor()
-                
-                # Calcula totais
+            item, item_id, data_inicio, data_fim, periodo = self._ler_form_fechamento(tipo)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        
+        label_resumo = getattr(self, f"label_resumo_{tipo}")
+        
+        def exibir(faturamento):
             if tipo == "imovel":
-                    # Limpezas
-                    cursor.execute("""
-                        SELECT COALESCE(SUM(valor_total), 0) 
-                        FROM limpezas 
-                        WHERE imovel_id = ? AND date(data) BETWEEN ? AND ?
-                    """, (item_id, data_inicio, data_fim))
-                    total_limpezas = cursor.fetchone()[0]
-                    
-                    # Enxoval
-                    cursor.execute("""
-                        SELECT COALESCE(SUM(t.preco_unitario * c.quantidade), 0)
-                        FROM consumo_enxoval c
-                        JOIN tipos_enxoval t ON c.item_id = t.id
-                        WHERE c.imovel_id = ? AND date(c.data) BETWEEN ? AND ?
-                    """, (item_id, data_inicio, data_fim))
-                    total_enxoval = cursor.fetchone()[0]
-                    
-                    # Suprimentos
-                    cursor.execute("""
-                        SELECT COALESCE(SUM(valor_gasto), 0)
-                        FROM reposicao_suprimentos
-                        WHERE imovel_id = ? AND date(data) BETWEEN ? AND ?
-                    """, (item_id, data_inicio, data_fim))
-                    total_suprimentos = cursor.fetchone()[0]
-                    
-                    # Valor fixo por gestão (considerando 1 imóvel)
-                    valor_gestao = 50.0
-                    
-                    resumo = f"""
-                        RESUMO PARA O IMÓVEL: {item}
-                        Período: {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}
-
-                        - Limpezas: {formatar_moeda(total_limpezas)}
-                        - Enxoval: {formatar_moeda(total_enxoval)}
-                        - Suprimentos: {formatar_moeda(total_suprimentos)}
-                        - Gestão: {formatar_moeda(valor_gestao)}
-                        ---------------------------
-                        TOTAL: {formatar_moeda(total_limpezas + total_enxoval + total_suprimentos + valor_gestao)}
-                        """
+                resumo = f"""
+                    RESUMO PARA O IMÓVEL: {item}
+                    Período: {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}
+
+                    - Limpezas: {formatar_moeda(faturamento.limpezas)}
+                    - Enxoval: {formatar_moeda(faturamento.enxoval)}
+                    - Suprimentos: {formatar_moeda(faturamento.suprimentos)}
+                    - Gestão: {formatar_moeda(faturamento.gestao)}
+                    ---------------------------
+                    TOTAL: {formatar_moeda(faturamento.total)}
+                    """
             else:
-                    # Para cliente, somamos todos os imóveis dele
-                    cursor.execute("SELECT id FROM imoveis WHERE cliente_id = ?", (item_id,))
-                    imoveis_ids = [row[0] for row in cursor.fetchall()]
-                    
-                    if not imoveis_ids:
-                        raise ValueError("Este cliente não possui imóveis cadastrados")
-                        
-                    # Limpezas
-                    cursor.execute(f"""
-                        SELECT COALESCE(SUM(valor_total), 0) 
-                        FROM limpezas 
-                        WHERE imovel_id IN ({','.join(['?']*len(imoveis_ids))}) 
-                        AND date(data) BETWEEN ? AND ?
-                    """, (*imoveis_ids, data_inicio, data_fim))
-                    total_limpezas = cursor.fetchone()[0]
-                    
-                    # Enxoval
-                    cursor.execute(f"""
-                        SELECT COALESCE(SUM(t.preco_unitario * c.quantidade), 0)
-                        FROM consumo_enxoval c
-                        JOIN tipos_enxoval t ON c.item_id = t.id
-                        WHERE c.imovel_id IN ({','.join(['?']*len(imoveis_ids))})
-                        AND date(c.data) BETWEEN ? AND ?
-                    """, (*imoveis_ids, data_inicio, data_fim))
-                    total_enxoval = cursor.fetchone()[0]
-                    
-                    # Suprimentos
-                    cursor.execute(f"""
-                        SELECT COALESCE(SUM(valor_gasto), 0)
-                        FROM reposicao_suprimentos
-                        WHERE imovel_id IN ({','.join(['?']*len(imoveis_ids))})
-                        AND date(data) BETWEEN ? AND ?
-                    """, (*imoveis_ids, data_inicio, data_fim))
-                    total_suprimentos = cursor.fetchone()[0]
-                    
-                    # Valor fixo por gestão (por imóvel)
-                    valor_gestao = 50.0 * len(imoveis_ids)
-                    
-                    resumo = f"""
+                resumo = f"""
                     RESUMO PARA O CLIENTE: {item}
                     Período: {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}
-                    Imóveis: {len(imoveis_ids)}
+                    Imóveis: {faturamento.imoveis}
 
-                    - Limpezas: {formatar_moeda(total_limpezas)}
-                    - Enxoval: {formatar_moeda(total_enxoval)}
-                    - Suprimentos: {formatar_moeda(total_suprimentos)}
-                    - Gestão: {formatar_moeda(valor_gestao)}
+                    - Limpezas: {formatar_moeda(faturamento.limpezas)}
+                    - Enxoval: {formatar_moeda(faturamento.enxoval)}
+                    - Suprimentos: {formatar_moeda(faturamento.suprimentos)}
+                    - Gestão: {formatar_moeda(faturamento.gestao)}
                     ---------------------------
-                    TOTAL: {formatar_moeda(total_limpezas + total_enxoval + total_suprimentos + valor_gestao)}
+                    TOTAL: {formatar_moeda(faturamento.total)}
                     """
-                
-            self.label_resumo.config(text=resumo)
-            conn.close()
-                
-        except ValueError as e:
-                messagebox.showerror("Erro", str(e))
-        except Exception as e:
-                messagebox.showerror("Erro", f"Ocorreu um erro ao gerar o resumo:\n{str(e)}")     
-
+            label_resumo.config(text=resumo)
+        
+        self.executor.executar(
+            f"resumo_{tipo}",
+            lambda: calcular_faturamento_fechamento(tipo, item_id, *periodo),
+            exibir,
+            lambda e: self._erro_fechamento(e, "Ocorreu um erro ao gerar o resumo")
+        )
 
-    def gerar_fechamento(self, tipo):
-        """Registra o fechamento no banco de dados"""
+    def exportar_fechamento_pdf(self, tipo):
+        """Gera o extrato do fechamento do imóvel ou cliente em PDF, num processo separado"""
         try:
-            # Widgets dinâmicos conforme o tipo (imovel ou cliente)
-            combo = getattr(self, f"combo_fechamento_{tipo}")
-            entry_inicio = getattr(self, f"entry_data_inicio_{tipo}")
-            entry_fim = getattr(self, f"entry_data_fim_{tipo}")
-            label_resumo = getattr(self, f"label_resumo_{tipo}")
-
-            item = combo.get()
-            if not item:
-                raise ValueError("Selecione um item")
-            
-            item_id = item.split(" - ")[0]
-            data_inicio = entry_inicio.get_date()
-            data_fim = entry_fim.get_date()
-            
-            if data_inicio > data_fim:
-                raise ValueError("Data inicial deve ser anterior à data final")
-            
-            # Confirmação do usuário
-            confirmacao = messagebox.askyesno(
-                "Confirmar Fechamento",
-                f"Tem certeza que deseja fechar as contas deste {'imóvel' if tipo == 'imovel' else 'cliente'} "
-                f"no período de {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}?"
+            item, item_id, data_inicio, data_fim, periodo = self._ler_form_fechamento(tipo)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        
+        caminho = self._escolher_arquivo_pdf(f"Fechamento_{tipo}_{item_id}_{periodo[0]}_{periodo[1]}.pdf")
+        if caminho:
+            self._gravar_em_processo(
+                f"Extrato {item}", escrever_pdf_fechamento, (tipo, item_id, *periodo, caminho),
+                lambda caminho: messagebox.showinfo("Sucesso", f"Extrato gerado em:\n{caminho}"),
+                "Erro ao gerar o extrato"
             )
-            if not confirmacao:
-                return
-
-            conn = sqlite3.connect("sistema.db")
-            cursor = conn.cursor()
-
-            if tipo == "imovel":
-                # Limpezas
-                cursor.execute("""
-                    SELECT COALESCE(SUM(valor_total), 0) 
-                    FROM limpezas 
-                    WHERE imovel_id = ? AND date(data) BETWEEN ? AND ?
-                """, (item_id, data_inicio, data_fim))
-                total_limpezas = cursor.fetchone()[0]
-
-                # Enxoval
-                cursor.execute("""
-                    SELECT COALESCE(SUM(t.preco_unitario * c.quantidade), 0)
-                    FROM consumo_enxoval c
-                    JOIN tipos_enxoval t ON c.item_id = t.id
-                    WHERE c.imovel_id = ? AND date(c.data) BETWEEN ? AND ?
-                """, (item_id, data_inicio, data_fim))
-                total_enxoval = cursor.fetchone()[0]
-
-                # Suprimentos
-                cursor.execute("""
-                    SELECT COALESCE(SUM(valor_gasto), 0)
-                    FROM reposicao_suprimentos
-                    WHERE imovel_id = ? AND date(data) BETWEEN ? AND ?
-                """, (item_id, data_inicio, data_fim))
-                total_suprimentos = cursor.fetchone()[0]
 
-                valor_gestao = 50.0
-                valor_total = total_limpezas + total_enxoval + total_suprimentos + valor_gestao
+    def _ler_form_fechamento(self, tipo):
+        """Lê e valida o item e o período informados no formulário de fechamento"""
+        combo = getattr(self, f"combo_fechamento_{tipo}")
+        entry_inicio = getattr(self, f"entry_data_inicio_{tipo}")
+        entry_fim = getattr(self, f"entry_data_fim_{tipo}")
 
-            else:  # cliente
-                cursor.execute("SELECT id FROM imoveis WHERE cliente_id = ?", (item_id,))
-                imoveis_ids = [row[0] for row in cursor.fetchall()]
+        item = combo.get()
+        item_id = combo.selecionado.get()
+        if not item_id:
+            raise ValueError("Selecione um item")
 
-                if not imoveis_ids:
-                    raise ValueError("Este cliente não possui imóveis cadastrados")
+        data_inicio = entry_inicio.get_date()
+        data_fim = entry_fim.get_date()
+        
+        if data_inicio > data_fim:
+            raise ValueError("Data inicial deve ser anterior à data final")
+        
+        # Datas em ISO, mesmo formato gravado nas tabelas
+        periodo = (data_inicio.isoformat(), data_fim.isoformat())
+        return item, item_id, data_inicio, data_fim, periodo
 
-                q_marks = ','.join(['?'] * len(imoveis_ids))
+    def _erro_fechamento(self, erro, mensagem):
+        """Exibe um erro ocorrido no cálculo ou registro de fechamento"""
+        if isinstance(erro, ValueError):
+            messagebox.showerror("Erro", str(erro))
+        else:
+            messagebox.showerror("Erro", f"{mensagem}:\n{str(erro)}")     
 
-                # Limpezas
-                cursor.execute(f"""
-                    SELECT COALESCE(SUM(valor_total), 0) 
-                    FROM limpezas 
-                    WHERE imovel_id IN ({q_marks}) AND date(data) BETWEEN ? AND ?
-                """, (*imoveis_ids, data_inicio, data_fim))
-                total_limpezas = cursor.fetchone()[0]
 
-                # Enxoval
-                cursor.execute(f"""
-                    SELECT COALESCE(SUM(t.preco_unitario * c.quantidade), 0)
-                    FROM consumo_enxoval c
-                    JOIN tipos_enxoval t ON c.item_id = t.id
-                    WHERE c.imovel_id IN ({q_marks}) AND date(c.data) BETWEEN ? AND ?
-                """, (*imoveis_ids, data_inicio, data_fim))
-                total_enxoval = cursor.fetchone()[0]
-
-                # Suprimentos
-                cursor.execute(f"""
-                    SELECT COALESCE(SUM(valor_gasto), 0)
-                    FROM reposicao_suprimentos
-                    WHERE imovel_id IN ({q_marks}) AND date(data) BETWEEN ? AND ?
-                """, (*imoveis_ids, data_inicio, data_fim))
-                total_suprimentos = cursor.fetchone()[0]
-
-                valor_gestao = 50.0 * len(imoveis_ids)
-                valor_total = total_limpezas + total_enxoval + total_suprimentos + valor_gestao
-
-            # Pergunta sobre comprovante
-            comprovante = None
-            if messagebox.askyesno("Comprovante", "Deseja anexar um comprovante de pagamento?"):
-                caminho = filedialog.askopenfilename()
-                if caminho:
-                    nome_arquivo = os.path.basename(caminho)
-                    destino = os.path.join("comprovantes", nome_arquivo)
-                    os.makedirs("comprovantes", exist_ok=True)  # garante que a pasta existe
-                    os.replace(caminho, destino)
-                    comprovante = destino
-
-            # Salva o fechamento
-            cursor.execute("""
-                INSERT INTO fechamentos 
-                (tipo, referencia_id, data_inicio, data_fim, valor_total, comprovante_path)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (tipo, item_id, data_inicio, data_fim, valor_total, comprovante))
+    def gerar_fechamento(self, tipo):
+        """Registra o fechamento no banco de dados"""
+        try:
+            item, item_id, data_inicio, data_fim, periodo = self._ler_form_fechamento(tipo)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        
+        # Confirmação do usuário
+        confirmacao = messagebox.askyesno(
+            "Confirmar Fechamento",
+            f"Tem certeza que deseja fechar as contas deste {'imóvel' if tipo == 'imovel' else 'cliente'} "
+            f"no período de {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}?"
+        )
+        if not confirmacao:
+            return
 
-            conn.commit()
-            conn.close()
+        def registrar(faturamento):
+            valor_total = faturamento.total
+            try:
+                # Pergunta sobre comprovante
+                comprovante = None
+                if messagebox.askyesno("Comprovante", "Deseja anexar um comprovante de pagamento?"):
+                    caminho = filedialog.askopenfilename()
+                    if caminho:
+                        comprovante = guardar_comprovante(caminho)
+
+                # Salva o fechamento
+                with transacao() as cursor:
+                    cursor.execute("""
+                        INSERT INTO fechamentos 
+                        (tipo, referencia_id, data_inicio, data_fim, valor_total_centavos, comprovante_path)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (tipo, item_id, *periodo, valor_total, comprovante))
 
-            messagebox.showinfo("Sucesso", f"Fechamento registrado com sucesso!\nTotal: {formatar_moeda(valor_total)}")
-            self.limpar_form_fechamento(tipo)
+                messagebox.showinfo("Sucesso", f"Fechamento registrado com sucesso!\nTotal: {formatar_moeda(valor_total)}")
+                self.limpar_form_fechamento(tipo)
+            except Exception as e:
+                self._erro_fechamento(e, "Ocorreu um erro ao registrar o fechamento")
 
-        except ValueError as e:
-            messagebox.showerror("Erro", str(e))
-        except Exception as e:
-            messagebox.showerror("Erro", f"Ocorreu um erro ao registrar o fechamento:\n{str(e)}")
+        self.executor.executar(
+            f"fechamento_{tipo}_registro",
+            lambda: calcular_faturamento_fechamento(tipo, item_id, *periodo, usar_cache=False),
+            registrar,
+            lambda e: self._erro_fechamento(e, "Ocorreu um erro ao registrar o fechamento")
+        )
 
             
 
@@ -2718,8 +5116,8 @@ class SistemaGestaoApp:
         entry_fim = getattr(self, f"entry_data_fim_{tipo}")
         label_resumo = getattr(self, f"label_resumo_{tipo}")
 
-        # Limpa o combobox
-        combo.set('')
+        # Limpa o seletor e a seleção guardada
+        combo.limpar()
 
         # Define datas padrão: últimos 30 dias
         hoje = datetime.now().date()
@@ -2747,6 +5145,11 @@ class SistemaGestaoApp:
                                         yscrollcommand=scrollbar.set)
         self.tree_fechamentos.pack(fill=BOTH, expand=True)
         scrollbar.config(command=self.tree_fechamentos.yview)
+        self.sinc_fechamentos = SincronizadorTreeview(
+            self.tree_fechamentos,
+            lambda row: (row[0], "Imóvel" if row[1] == "imovel" else "Cliente",
+                         row[2], row[3], formatar_moeda(row[4]), row[5])
+        )
         
         self.tree_fechamentos.heading('#0', text='ID')
         self.tree_fechamentos.heading('#1', text='Tipo')
@@ -2767,9 +5170,12 @@ class SistemaGestaoApp:
 
 
     def carregar_fechamentos(self):
-        """Carrega os fechamentos no TreeView"""
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
+        """Carrega os fechamentos no TreeView em segundo plano"""
+        self.executor.executar("fechamentos", self._consultar_fechamentos, self._exibir_fechamentos)
+
+    def _consultar_fechamentos(self):
+        """Consulta o histórico de fechamentos (executado fora da thread do Tk)"""
+        cursor = obter_conexao().cursor()
         
         cursor.execute("""
             SELECT f.id, f.tipo, 
@@ -2778,29 +5184,17 @@ class SistemaGestaoApp:
                     ELSE c.nome
                 END as referencia,
                 f.data_inicio || ' a ' || f.data_fim as periodo,
-                f.valor_total, f.data_fechamento
+                f.valor_total_centavos, f.data_fechamento
             FROM fechamentos f
             LEFT JOIN imoveis i ON f.tipo = 'imovel' AND f.referencia_id = i.id
             LEFT JOIN clientes c ON f.tipo = 'cliente' AND f.referencia_id = c.id
             ORDER BY f.data_fechamento DESC
         """)
-        
-        # Limpar treeview
-        for item in self.tree_fechamentos.get_children():
-            self.tree_fechamentos.delete(item)
-        
-        # Adicionar novos itens formatados
-        for row in cursor.fetchall():
-            self.tree_fechamentos.insert('', 'end', values=(
-                row[0], 
-                "Imóvel" if row[1] == "imovel" else "Cliente",
-                row[2], 
-                row[3], 
-                formatar_moeda(row[4]), 
-                row[5]
-            ))
-        
-        conn.close()
+        return cursor.fetchall()
+
+    def _exibir_fechamentos(self, fechamentos):
+        """Preenche o TreeView de fechamentos"""
+        self.sinc_fechamentos.aplicar(fechamentos)
 
 
     def criar_fechamento_contas(self):
@@ -2809,12 +5203,174 @@ class SistemaGestaoApp:
         abas = ttk.Notebook(self.frame_fechamento)
         frame_imovel = Frame(abas, bg=COR_FUNDO)
         frame_cliente = Frame(abas, bg=COR_FUNDO)
+        frame_lote = Frame(abas, bg=COR_FUNDO)
         abas.add(frame_imovel, text="Por Imóvel")
         abas.add(frame_cliente, text="Por Cliente")
+        abas.add(frame_lote, text="Em Lote")
         abas.pack(fill=BOTH, expand=True)
         # Constrói as abas usando seu método auxiliar
         self._construir_aba_fechamento(frame_imovel, "imovel")
         self._construir_aba_fechamento(frame_cliente, "cliente")
+        self._construir_aba_fechamento_lote(frame_lote)
+
+    # =============================================
+    # FECHAMENTO EM LOTE
+    # =============================================
+
+    def _construir_aba_fechamento_lote(self, parent_frame):
+        """Constrói a aba que fecha as contas de todos os clientes ou imóveis de uma vez"""
+        from tkcalendar import DateEntry
+
+        # Tipo e período
+        frame_selecao = Frame(parent_frame, bg=COR_CARD, padx=10, pady=10)
+        frame_selecao.pack(fill=X)
+        
+        Label(frame_selecao, text="Fechar por:", bg=COR_CARD).pack(side=LEFT, padx=5)
+        self.combo_tipo_lote = ttk.Combobox(frame_selecao, values=["Cliente", "Imóvel"], state="readonly", width=10)
+        self.combo_tipo_lote.current(0)
+        self.combo_tipo_lote.pack(side=LEFT, padx=5)
+        
+        # Padrão: o mês anterior completo
+        fim_mes_anterior = date.today().replace(day=1) - timedelta(days=1)
+        Label(frame_selecao, text="De:", bg=COR_CARD).pack(side=LEFT, padx=5)
+        self.entry_data_inicio_lote = DateEntry(frame_selecao, date_pattern='dd/mm/yyyy')
+        self.entry_data_inicio_lote.set_date(fim_mes_anterior.replace(day=1))
+        self.entry_data_inicio_lote.pack(side=LEFT, padx=5)
+        Label(frame_selecao, text="Até:", bg=COR_CARD).pack(side=LEFT, padx=5)
+        self.entry_data_fim_lote = DateEntry(frame_selecao, date_pattern='dd/mm/yyyy')
+        self.entry_data_fim_lote.set_date(fim_mes_anterior)
+        self.entry_data_fim_lote.pack(side=LEFT, padx=5)
+        
+        Button(frame_selecao, text="Calcular", command=self.calcular_fechamento_lote,
+            bg=COR_DESTAQUE, fg="white").pack(side=LEFT, padx=10)
+        
+        # Grade para revisão
+        frame_tree = Frame(parent_frame, bg=COR_FUNDO)
+        frame_tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        
+        scrollbar = Scrollbar(frame_tree)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        
+        colunas = [
+            ('referencia', 'Referência', 200, 'w'),
+            ('imoveis', 'Imóveis', 60, 'center'),
+            ('limpezas', 'Limpezas', 100, 'e'),
+            ('enxoval', 'Enxoval', 100, 'e'),
+            ('suprimentos', 'Suprimentos', 100, 'e'),
+            ('gestao', 'Gestão', 90, 'e'),
+            ('total', 'Total', 110, 'e'),
+            ('situacao', 'Situação', 90, 'center'),
+        ]
+        self.tree_fechamento_lote = ttk.Treeview(frame_tree, columns=[c[0] for c in colunas], show='headings',
+                                                 yscrollcommand=scrollbar.set, selectmode='extended')
+        self.tree_fechamento_lote.pack(fill=BOTH, expand=True)
+        scrollbar.config(command=self.tree_fechamento_lote.yview)
+        
+        for coluna, texto, largura, ancora in colunas:
+            self.tree_fechamento_lote.heading(coluna, text=texto)
+            self.tree_fechamento_lote.column(coluna, width=largura, anchor=ancora)
+        
+        self.sinc_fechamento_lote = SincronizadorTreeview(self.tree_fechamento_lote, lambda row: row[1:])
+        self.tree_fechamento_lote.bind("<<TreeviewSelect>>", self._atualizar_resumo_lote)
+        self._fechamento_lote = {}  # iid -> (tipo, referencia_id, data_inicio, data_fim, valor em centavos, já fechado)
+        
+        # Resumo da seleção e confirmação
+        frame_botoes = Frame(parent_frame, bg=COR_CARD, padx=10, pady=10)
+        frame_botoes.pack(fill=X)
+        
+        self.label_resumo_lote = Label(frame_botoes, text="Escolha o tipo e o período e clique em Calcular",
+                                       bg=COR_CARD, anchor=W)
+        self.label_resumo_lote.pack(side=LEFT, fill=X, expand=True, padx=5)
+        
+        Button(frame_botoes, text="Fechar Selecionados", command=self.registrar_fechamento_lote,
+            bg=COR_SUCESSO, fg="white").pack(side=RIGHT, padx=5)
+
+    def calcular_fechamento_lote(self):
+        """Calcula em segundo plano o fechamento de todos os clientes ou imóveis do período"""
+        tipo = "cliente" if self.combo_tipo_lote.get() == "Cliente" else "imovel"
+        data_inicio = self.entry_data_inicio_lote.get_date()
+        data_fim = self.entry_data_fim_lote.get_date()
+        
+        if data_inicio > data_fim:
+            messagebox.showerror("Erro", "Data inicial deve ser anterior à data final")
+            return
+        
+        periodo = (data_inicio.isoformat(), data_fim.isoformat())
+        self.executor.executar(
+            "fechamento_lote",
+            lambda: self._consultar_fechamento_lote(tipo, periodo),
+            self._exibir_fechamento_lote,
+            lambda e: messagebox.showerror("Erro", f"Ocorreu um erro ao calcular o fechamento em lote:\n{str(e)}")
+        )
+
+    def _consultar_fechamento_lote(self, tipo, periodo):
+        """Calcula o lote e verifica quais referências já foram fechadas no período (executado fora da thread do Tk)"""
+        lote = calcular_faturamentos_em_lote(tipo, *periodo)
+        
+        fechados = {row[0] for row in obter_conexao().execute("""
+            SELECT referencia_id FROM fechamentos
+            WHERE tipo = ? AND data_inicio = ? AND data_fim = ?
+        """, (tipo, *periodo))}
+        
+        return tipo, periodo, [(referencia, nome, faturamento, referencia in fechados)
+                               for referencia, nome, faturamento in lote]
+
+    def _exibir_fechamento_lote(self, dados):
+        """Preenche a grade de revisão e seleciona o que ainda não foi fechado"""
+        tipo, periodo, lote = dados
+        
+        linhas = []
+        self._fechamento_lote = {}
+        for referencia, nome, faturamento, fechado in lote:
+            linhas.append((
+                referencia, nome, faturamento.imoveis,
+                formatar_moeda(faturamento.limpezas), formatar_moeda(faturamento.enxoval),
+                formatar_moeda(faturamento.suprimentos), formatar_moeda(faturamento.gestao),
+                formatar_moeda(faturamento.total), "Já fechado" if fechado else "Pendente"
+            ))
+            self._fechamento_lote[str(referencia)] = (tipo, referencia, *periodo, faturamento.total, fechado)
+        
+        self.sinc_fechamento_lote.aplicar(linhas)
+        self.tree_fechamento_lote.selection_set(
+            [iid for iid, item in self._fechamento_lote.items() if not item[-1]])
+        self._atualizar_resumo_lote()
+
+    def _atualizar_resumo_lote(self, event=None):
+        """Mostra a quantidade e o valor total das linhas selecionadas"""
+        selecionados = [self._fechamento_lote[iid] for iid in self.tree_fechamento_lote.selection()]
+        total = sum(item[4] for item in selecionados)
+        self.label_resumo_lote.config(
+            text=f"{len(selecionados)} de {len(self._fechamento_lote)} selecionados — Total: {formatar_moeda(total)}")
+
+    def registrar_fechamento_lote(self):
+        """Registra, numa única transação, os fechamentos das linhas selecionadas"""
+        selecionados = [self._fechamento_lote[iid] for iid in self.tree_fechamento_lote.selection()]
+        if not selecionados:
+            messagebox.showerror("Erro", "Selecione ao menos uma linha")
+            return
+        
+        ja_fechados = sum(1 for item in selecionados if item[-1])
+        aviso = f"\n\n{ja_fechados} deles já possuem fechamento neste período." if ja_fechados else ""
+        total = sum(item[4] for item in selecionados)
+        if not messagebox.askyesno(
+            "Confirmar Fechamento em Lote",
+            f"Registrar {len(selecionados)} fechamentos, no total de {formatar_moeda(total)}?{aviso}"
+        ):
+            return
+        
+        try:
+            with transacao() as cursor:
+                cursor.executemany("""
+                    INSERT INTO fechamentos 
+                    (tipo, referencia_id, data_inicio, data_fim, valor_total_centavos, comprovante_path)
+                    VALUES (?, ?, ?, ?, ?, NULL)
+                """, [item[:5] for item in selecionados])
+        except Exception as e:
+            messagebox.showerror("Erro", f"Ocorreu um erro ao registrar os fechamentos:\n{str(e)}")
+            return
+        
+        messagebox.showinfo("Sucesso", f"{len(selecionados)} fechamentos registrados com sucesso!")
+        self.calcular_fechamento_lote()
 
 
 
@@ -2823,8 +5379,8 @@ class SistemaGestaoApp:
 # =============================================
 
 if __name__ == "__main__":
-    from datetime import timedelta  # Import necessário para o timedelta
-    
+    # Necessário para os processos de relatório em executáveis empacotados
+    multiprocessing.freeze_support()
     root = Tk()
     app = SistemaGestaoApp(root)
     root.mainloop()